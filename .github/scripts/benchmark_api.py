@@ -0,0 +1,240 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import random
+import subprocess
+import threading
+import time
+import requests
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from app import create_app
+from app.models.base import db
+from app.models import User, Space, Booking, Testimonial
+from app.models.user import UserRole
+from config import Config
+
+DEFAULT_PASSWORD = 'password'
+
+
+class TestClient:
+    """Requests through the Flask test client, in process"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None, headers=None):
+        response = self.client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.get_json(silent=True)
+
+
+class HttpClient:
+    """Requests against a running server over HTTP, one keep-alive session per worker"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def request(self, method, path, body=None, headers=None):
+        response = self.session.request(method, self.base_url + path, json=body, headers=headers, timeout=30)
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, None
+
+
+def _future_window(rng, hours):
+    start = datetime.utcnow().replace(minute=0, second=0, microsecond=0) + \
+        timedelta(days=rng.randint(1, 60), hours=rng.randint(7, 18))
+    return start, start + timedelta(hours=hours)
+
+
+def browse(context, rng):
+    if rng.random() < 0.5:
+        return 'GET', f'/api/spaces/?page={rng.randint(1, 50)}&per_page=20', None, None, (200,)
+    return 'GET', f'/api/spaces/{rng.choice(context["space_ids"])}', None, None, (200,)
+
+
+def search(context, rng):
+    start, end = _future_window(rng, rng.choice([1, 2, 4]))
+    path = f'/api/spaces/search?city={rng.choice(context["cities"])}&start={start.isoformat()}&end={end.isoformat()}'
+    return 'GET', path, None, None, (200,)
+
+
+def book(context, rng):
+    start, end = _future_window(rng, rng.randint(1, 3))
+    body = {'space_id': rng.choice(context['space_ids']), 'start_time': start.isoformat(), 'end_time': end.isoformat()}
+    return 'POST', '/api/bookings/', body, rng.choice(context['client_headers']), (201, 409)
+
+
+def login(context, rng):
+    body = {'email': rng.choice(context['client_emails']), 'password': context['password']}
+    return 'POST', '/api/auth/login', body, None, (200,)
+
+
+def admin_stats(context, rng):
+    return 'GET', '/api/admin/stats', None, context['admin_headers'], (200,)
+
+
+SCENARIOS = {
+    'browse': browse,
+    'search': search,
+    'book': book,
+    'login': login,
+    'admin_stats': admin_stats,
+}
+
+
+def discover(app, password, clients):
+    """Pick the spaces, cities and accounts the scenarios draw from"""
+    with app.app_context():
+        space_ids = [row.id for row in db.session.query(Space.id).filter_by(is_active=True).limit(5000)]
+        cities = [row.city for row in db.session.query(Space.city).distinct().limit(50)]
+        client_emails = [row.email for row in db.session.query(User.email)
+                         .filter(User.role == UserRole.CLIENT).order_by(User.id).limit(clients)]
+        admin = db.session.query(User.email).filter(User.role == UserRole.ADMIN).order_by(User.id).first()
+        dataset = {
+            'users': User.query.count(),
+            'spaces': Space.query.count(),
+            'bookings': db.session.query(func.count(Booking.id)).scalar(),
+            'testimonials': db.session.query(func.count(Testimonial.id)).scalar()
+        }
+    if not space_ids or not client_emails or not admin:
+        raise SystemExit('No data to benchmark; run generate_data.py first')
+    return {'space_ids': space_ids, 'cities': cities, 'client_emails': client_emails,
+            'admin_email': admin.email, 'password': password}, dataset
+
+
+def authenticate(client, context):
+    """Log in the admin and the sampled clients once; scenarios reuse the tokens"""
+    def headers(email):
+        status, body = client.request('POST', '/api/auth/login', {'email': email, 'password': context['password']})
+        if status != 200:
+            raise SystemExit(f'Login failed for {email} ({status}); pass the dataset password with --password')
+        return {'Authorization': f'Bearer {body["access_token"]}'}
+
+    context['admin_headers'] = headers(context['admin_email'])
+    context['client_headers'] = [headers(email) for email in context['client_emails'][:20]]
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_scenario(make_client, scenario, context, count, concurrency, seed):
+    """Issue requests from concurrency workers; return throughput, latency percentiles and status counts"""
+    latencies = []
+    statuses = Counter()
+    errors = Counter()
+    lock = threading.Lock()
+
+    def worker(index, share):
+        client = make_client()
+        rng = random.Random(seed * 1000 + index)
+        local = []
+        for _ in range(share):
+            method, path, body, headers, expected = scenario(context, rng)
+            started = time.perf_counter()
+            status, _ = client.request(method, path, body, headers)
+            local.append(time.perf_counter() - started)
+            with lock:
+                statuses[status] += 1
+                if status not in expected:
+                    errors[status] += 1
+        with lock:
+            latencies.extend(local)
+
+    shares = [count // concurrency + (1 if i < count % concurrency else 0) for i in range(concurrency)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker, i, share) for i, share in enumerate(shares)]:
+            future.result()
+    seconds = time.perf_counter() - started
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'concurrency': concurrency,
+        'seconds': round(seconds, 3),
+        'requests_per_second': round(len(ordered) / seconds, 1),
+        'latency_ms': {
+            'mean': round(1000 * sum(ordered) / len(ordered), 2),
+            'p50': round(1000 * _percentile(ordered, 0.5), 2),
+            'p90': round(1000 * _percentile(ordered, 0.9), 2),
+            'p99': round(1000 * _percentile(ordered, 0.99), 2),
+            'max': round(1000 * ordered[-1], 2)
+        },
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'unexpected': sum(errors.values())
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(app, url=None, scenarios=tuple(SCENARIOS), count=200, concurrency=None, warmup=20,
+                  password=DEFAULT_PASSWORD, seed=42):
+    context, dataset = discover(app, password, clients=200)
+    if url:
+        make_client = lambda: HttpClient(url)
+        concurrency = concurrency or 16
+    else:
+        make_client = lambda: TestClient(app)
+        concurrency = concurrency or 1
+    authenticate(make_client(), context)
+
+    results = {}
+    for name in scenarios:
+        if warmup:
+            run_scenario(make_client, SCENARIOS[name], context, warmup, 1, seed + 1)
+        results[name] = run_scenario(make_client, SCENARIOS[name], context, count, concurrency, seed)
+    return {
+        'revision': git_revision(),
+        'started_at': datetime.utcnow().isoformat(),
+        'mode': 'http' if url else 'test_client',
+        'target': url,
+        'database': app.config['SQLALCHEMY_DATABASE_URI'].split('@')[-1],
+        'dataset': dataset,
+        'scenarios': results
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the browse/search/book/login/admin scenarios and report JSON')
+    parser.add_argument('--url', help='benchmark a running server (e.g. http://localhost:5000) instead of the test client')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='comma separated subset of ' + ', '.join(SCENARIOS))
+    parser.add_argument('--requests', type=int, default=200, help='requests per scenario')
+    parser.add_argument('--concurrency', type=int, help='workers per scenario (default 16 over HTTP, 1 in process)')
+    parser.add_argument('--warmup', type=int, default=20, help='unmeasured requests before each scenario')
+    parser.add_argument('--password', default=DEFAULT_PASSWORD, help='password of the generated accounts')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write the JSON report here as well as to stdout')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL', Config.SQLALCHEMY_DATABASE_URI))
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios.split(',')) - set(SCENARIOS)
+    if unknown:
+        parser.error(f'unknown scenarios: {", ".join(sorted(unknown))}')
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database_url
+        SCHEDULER_ENABLED = False
+        RATELIMIT_ENABLED = False
+
+    report = run_benchmark(create_app(BenchmarkConfig), url=args.url, scenarios=args.scenarios.split(','),
+                           count=args.requests, concurrency=args.concurrency, warmup=args.warmup,
+                           password=args.password, seed=args.seed)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
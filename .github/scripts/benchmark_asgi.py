@@ -0,0 +1,131 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import subprocess
+import time
+import requests
+from datetime import datetime
+from app import create_app
+from app.asgi import create_asgi_app
+from config import Config
+from benchmark_api import SCENARIOS, HttpClient, discover, authenticate, run_scenario, git_revision, DEFAULT_PASSWORD
+
+SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(os.path.dirname(SCRIPTS))
+
+
+def benchmark_config():
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', Config.SQLALCHEMY_DATABASE_URI)
+        SCHEDULER_ENABLED = False
+        RATELIMIT_ENABLED = False
+    return BenchmarkConfig
+
+
+def wsgi_app():
+    """Factory for gunicorn: the Flask app with rate limits and jobs off"""
+    return create_app(benchmark_config())
+
+
+def asgi_app():
+    """Factory for uvicorn: the same app behind the ASGI entry point"""
+    return create_asgi_app(wsgi_app())
+
+
+def server_command(server, port, workers, threads):
+    if server == 'wsgi':
+        return ['gunicorn', '--workers', str(workers), '--threads', str(threads), '--bind', f'127.0.0.1:{port}',
+                '--log-level', 'warning', 'benchmark_asgi:wsgi_app()']
+    return ['uvicorn', '--factory', 'benchmark_asgi:asgi_app', '--workers', str(workers), '--host', '127.0.0.1',
+            '--port', str(port), '--log-level', 'warning']
+
+
+def wait_ready(url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url + '/api/spaces/?per_page=1', timeout=5).status_code == 200:
+                return
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.25)
+    raise SystemExit(f'Server at {url} did not start within {timeout}s')
+
+
+def run_server(server, port, workers, threads, database_url, context, scenarios, levels, count, warmup, seed):
+    """Start one server, run every scenario at every concurrency level against it, then stop it"""
+    url = f'http://127.0.0.1:{port}'
+    # The servers import the factories below from this directory and the app from the repository root
+    env = dict(os.environ, DATABASE_URL=database_url,
+               PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    process = subprocess.Popen(server_command(server, port, workers, threads), cwd=SCRIPTS, env=env,
+                               stdout=subprocess.DEVNULL)
+    try:
+        wait_ready(url)
+        make_client = lambda: HttpClient(url)
+        if 'admin_headers' not in context:
+            authenticate(make_client(), context)
+        results = {}
+        for name in scenarios:
+            if warmup:
+                run_scenario(make_client, SCENARIOS[name], context, warmup, 1, seed + 1)
+            results[name] = {str(level): run_scenario(make_client, SCENARIOS[name], context, count, level, seed)
+                             for level in levels}
+        return results
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def compare(results):
+    """ASGI over WSGI throughput ratio per scenario and concurrency level"""
+    return {name: {level: round(result['requests_per_second'] / results['wsgi'][name][level]['requests_per_second'], 2)
+                   for level, result in levels.items()}
+            for name, levels in results['asgi'].items()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare gunicorn (WSGI) and uvicorn (ASGI) throughput on the same scenarios')
+    parser.add_argument('--scenarios', default='search,browse', help='comma separated subset of ' + ', '.join(SCENARIOS))
+    parser.add_argument('--concurrency', default='8,32,128', help='comma separated client concurrency levels')
+    parser.add_argument('--requests', type=int, default=1000, help='requests per scenario and concurrency level')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='server processes for both servers')
+    parser.add_argument('--threads', type=int, default=1, help='threads per gunicorn worker')
+    parser.add_argument('--warmup', type=int, default=20, help='unmeasured requests before each scenario')
+    parser.add_argument('--port', type=int, default=5100, help='WSGI server port; the ASGI server uses the next one')
+    parser.add_argument('--password', default=DEFAULT_PASSWORD, help='password of the generated accounts')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write the JSON report here as well as to stdout')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL', Config.SQLALCHEMY_DATABASE_URI))
+    args = parser.parse_args()
+
+    scenarios = args.scenarios.split(',')
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f'unknown scenarios: {", ".join(sorted(unknown))}')
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    os.environ['DATABASE_URL'] = args.database_url
+    context, dataset = discover(wsgi_app(), args.password, clients=200)
+    results = {}
+    for offset, server in enumerate(('wsgi', 'asgi')):
+        results[server] = run_server(server, args.port + offset, args.workers, args.threads, args.database_url,
+                                     context, scenarios, levels, args.requests, args.warmup, args.seed)
+    report = {
+        'revision': git_revision(),
+        'started_at': datetime.utcnow().isoformat(),
+        'database': args.database_url.split('@')[-1],
+        'dataset': dataset,
+        'workers': args.workers,
+        'threads': args.threads,
+        'servers': results,
+        'asgi_speedup': compare(results)
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
@@ -0,0 +1,99 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import time
+from flask import Flask, jsonify
+from app.utils.compression import Compression, available_encodings
+
+def make_listing(count):
+    """Build a listing payload shaped like GET /spaces"""
+    return {
+        'spaces': [{
+            'id': i,
+            'name': f'Space {i}',
+            'description': 'A bright, quiet room with plenty of natural light, ' * 6,
+            'address': f'{i} Main St',
+            'city': 'Nairobi',
+            'state': 'Nairobi County',
+            'country': 'Kenya',
+            'postal_code': '00100',
+            'type': 'meeting_room',
+            'status': 'available',
+            'capacity': 12,
+            'price_per_hour': 45.0,
+            'price_per_day': 320.0,
+            'amenities': json.dumps(['High-speed WiFi', 'Projector', 'Whiteboards', 'Coffee/Tea']),
+            'images': [{
+                'id': i * 10 + n,
+                'url': f'https://res.cloudinary.com/spacer/image/upload/v1/spaces/{i}/{n}.jpg',
+                'is_primary': n == 0
+            } for n in range(4)],
+            'created_at': '2025-05-01T10:00:00',
+            'updated_at': '2025-05-01T10:00:00'
+        } for i in range(count)],
+        'total': count,
+        'pages': 1,
+        'current_page': 1
+    }
+
+def build_app(payload):
+    app = Flask(__name__)
+    Compression(app)
+
+    @app.route('/listing')
+    def listing():
+        return jsonify(payload)
+
+    @app.route('/listing-cached')
+    def listing_cached():
+        response = jsonify(payload)
+        response.set_etag('listing-v1', weak=True)
+        return response
+
+    @app.route('/listing-stream')
+    def listing_stream():
+        def generate():
+            yield '['
+            for i, space in enumerate(payload['spaces']):
+                yield (',' if i else '') + json.dumps(space)
+            yield ']'
+        return app.response_class(generate(), mimetype='application/json')
+
+    return app
+
+def measure(client, path, encoding, requests):
+    headers = {'Accept-Encoding': encoding} if encoding else {}
+    size = 0
+    start_cpu = time.process_time()
+    start_wall = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(path, headers=headers)
+        size = len(response.get_data())
+    cpu = time.process_time() - start_cpu
+    wall = time.perf_counter() - start_wall
+    return {
+        'path': path,
+        'encoding': encoding or 'identity',
+        'bytes_per_request': size,
+        'cpu_ms_per_request': round(cpu * 1000 / requests, 3),
+        'wall_ms_per_request': round(wall * 1000 / requests, 3)
+    }
+
+def run_benchmark(spaces=50, requests=200):
+    app = build_app(make_listing(spaces))
+    client = app.test_client()
+    results = []
+    for path in ('/listing', '/listing-cached', '/listing-stream'):
+        for encoding in [None] + available_encodings():
+            results.append(measure(client, path, encoding, requests))
+    return {'spaces_per_response': spaces, 'requests': requests, 'results': results}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Report bytes and CPU per request for each response encoding')
+    parser.add_argument('--spaces', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.spaces, args.requests), indent=2))
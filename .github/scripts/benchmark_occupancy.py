@@ -0,0 +1,89 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from app.models.occupancy import OccupancyIndex, day_masks, SLOT_BYTES
+
+def make_bookings(spaces, days, bookings_per_space, seed):
+    """Random 1-8 hour bookings on 15-minute boundaries, {space_id: [(start, end)]}"""
+    rng = random.Random(seed)
+    first = datetime(2026, 1, 1)
+    bookings = {}
+    for space_id in range(1, spaces + 1):
+        intervals = []
+        for _ in range(bookings_per_space):
+            start = first + timedelta(days=rng.randrange(days), hours=rng.randrange(7, 20),
+                                      minutes=rng.choice([0, 15, 30, 45]))
+            intervals.append((start, start + timedelta(minutes=15 * rng.randrange(4, 33))))
+        bookings[space_id] = intervals
+    return first, bookings
+
+def build_index(first, bookings):
+    index = OccupancyIndex(first.date())
+    stored_rows = 0
+    for space_id, intervals in bookings.items():
+        masks = {}
+        for start, end in intervals:
+            for day, mask in day_masks(start, end).items():
+                masks[day] = masks.get(day, 0) | mask
+        index.add_days(space_id, masks)
+        stored_rows += len(masks)
+    return index, stored_rows
+
+def naive_available(bookings, start, end):
+    """Baseline: scan every booking interval of every space"""
+    return [space_id for space_id, intervals in bookings.items()
+            if not any(s < end and e > start for s, e in intervals)]
+
+def run_benchmark(spaces=10000, days=365, bookings_per_space=150, queries=50, seed=42):
+    first, bookings = make_bookings(spaces, days, bookings_per_space, seed)
+
+    started = time.perf_counter()
+    index, rows = build_index(first, bookings)
+    build_seconds = time.perf_counter() - started
+
+    rng = random.Random(seed + 1)
+    windows = []
+    for _ in range(queries):
+        start = first + timedelta(days=rng.randrange(days - 1), hours=rng.randrange(6, 20))
+        windows.append((start, start + timedelta(hours=rng.choice([1, 2, 4, 8, 24]))))
+    space_ids = list(bookings)
+
+    started = time.perf_counter()
+    bitmap_results = [index.available(space_ids, start, end) for start, end in windows]
+    bitmap_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    naive_results = [naive_available(bookings, start, end) for start, end in windows[:max(1, queries // 10)]]
+    naive_seconds = (time.perf_counter() - started) / len(naive_results)
+
+    # Slot rounding can only hide availability, never report an occupied space as free
+    for bitmap, naive in zip(bitmap_results, naive_results):
+        assert set(bitmap) <= set(naive)
+
+    return {
+        'spaces': spaces,
+        'days': days,
+        'bookings': spaces * bookings_per_space,
+        'occupancy_rows': rows,
+        'occupancy_bytes_on_disk': rows * SLOT_BYTES,
+        'bitmap_bytes_in_memory': sum(sys.getsizeof(bitmap) for bitmap in index.bitmaps.values()),
+        'build_seconds': round(build_seconds, 3),
+        'query_ms_bitmap': round(bitmap_seconds * 1000 / queries, 3),
+        'query_ms_interval_scan': round(naive_seconds * 1000, 3),
+        'mean_available_spaces': round(sum(len(r) for r in bitmap_results) / queries, 1)
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time availability lookups over the occupancy bitmaps')
+    parser.add_argument('--spaces', type=int, default=10000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--bookings-per-space', type=int, default=150)
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.spaces, args.days, args.bookings_per_space, args.queries), indent=2))
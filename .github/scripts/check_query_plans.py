@@ -0,0 +1,132 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from app import create_app
+from app.models.base import db, exclude_deleted
+from app.models import Space, SpaceImage, Booking, Testimonial, UserToken, TokenPurpose
+from app.models.space import SpaceType, SpaceStatus
+from app.models.booking import BookingStatus, ACTIVE_STATUSES
+from app.utils.archive import ARCHIVABLE_STATUSES
+from config import Config
+
+# Tables whose scans are checked; anything else in a plan (subqueries, constant rows) is ignored
+TABLES = ('users', 'spaces', 'space_images', 'bookings', 'testimonials', 'user_tokens')
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN a statement with its parameters bound the way the application binds them"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, 'postgresql')
+def _explain_postgresql(element, compiler, **kw):
+    return 'EXPLAIN (FORMAT JSON) ' + compiler.process(element.statement, **kw)
+
+
+@compiles(Explain, 'sqlite')
+def _explain_sqlite(element, compiler, **kw):
+    return 'EXPLAIN QUERY PLAN ' + compiler.process(element.statement, **kw)
+
+
+def endpoint_queries(now):
+    """(name, statement) for the filter/sort shape of every listed endpoint query"""
+    window = (now + timedelta(days=7), now + timedelta(days=7, hours=2))
+    search = Space.query.filter_by(is_active=True).filter(Space.status != SpaceStatus.MAINTENANCE) \
+        .filter(Space.city == 'Nairobi', Space.type == SpaceType.MEETING_ROOM, Space.capacity >= 4)
+    return [
+        ('GET /spaces/search', Space.free_between(search, *window)
+            .order_by(Space.price_per_hour, Space.id).limit(10)),
+        ('GET /spaces/search (no city)', Space.free_between(Space.query.filter_by(is_active=True), *window)
+            .order_by(Space.price_per_hour, Space.id).limit(10)),
+        ('GET /spaces/amenities', Space.query.filter_by(is_active=True, city='Nairobi')),
+        ('GET /spaces/?status=', Space.query.filter(Space.status == SpaceStatus.MAINTENANCE).limit(10)),
+        ('GET /owner/dashboard spaces', Space.query.filter(Space.owner_id == 1).order_by(Space.id)),
+        ('space images', SpaceImage.query.filter(SpaceImage.space_id == 1)),
+        ('GET /bookings/', Booking.query.filter_by(client_id=1).order_by(Booking.start_time.desc()).limit(10)),
+        ('GET /bookings/?series_id=', Booking.query.filter_by(client_id=1, series_id='series')),
+        ('POST /bookings/ overlap check', Booking.overlapping(1, *window)),
+        ('lifecycle: complete past bookings', select(Booking.id).where(
+            Booking.status == BookingStatus.CONFIRMED, Booking.end_time <= now).limit(500)),
+        ('lifecycle: expire pending holds', select(Booking.id).where(
+            Booking.status == BookingStatus.PENDING, Booking.created_at < now - timedelta(days=1)).limit(500)),
+        ('archive candidates', select(Booking.id).where(
+            Booking.status.in_(ARCHIVABLE_STATUSES), Booking.end_time < now - timedelta(days=180))),
+        ('owner dashboard upcoming', Booking.query.filter(
+            Booking.space_id.in_([1, 2, 3]), Booking.status.in_(ACTIVE_STATUSES), Booking.start_time >= now)),
+        ('GET /testimonials/?space_id=', Testimonial.query.filter_by(space_id=1, status='approved')
+            .order_by(Testimonial.created_at.desc(), Testimonial.id.desc()).limit(10)),
+        ('GET /admin/testimonials/queue', Testimonial.query.filter(Testimonial.status == 'pending')
+            .filter(tuple_(Testimonial.created_at, Testimonial.id) > (now - timedelta(days=30), 0))
+            .order_by(Testimonial.created_at, Testimonial.id).limit(51)),
+        ('author snapshot refresh', Testimonial.query.filter(Testimonial.user_id == 1)),
+        ('POST /auth/verify-email', UserToken.query.filter_by(token_hash=UserToken.hash_token('token'),
+                                                              purpose=TokenPurpose.VERIFY_EMAIL)),
+        ('purge expired user tokens', select(UserToken.id).where(UserToken.expires_at < now)
+            .order_by(UserToken.expires_at).limit(1000)),
+        ('purge soft-deleted spaces', select(Space.__table__.c.id).where(Space.__table__.c.deleted_at < now)
+            .order_by(Space.__table__.c.deleted_at).limit(500)),
+    ]
+
+
+def _statement(query):
+    # EXPLAIN is not a SELECT, so add the soft-delete filter the session would have added itself
+    return exclude_deleted(query.statement if hasattr(query, 'statement') else query)
+
+
+def sequential_scans(statement):
+    """Names of the checked tables that the plan reads with a full sequential scan"""
+    dialect = db.engine.dialect.name
+    rows = db.session.execute(Explain(_statement(statement))).fetchall()
+    if dialect == 'postgresql':
+        scans = []
+        pending = [rows[0][0][0]['Plan']]
+        while pending:
+            node = pending.pop()
+            if node['Node Type'] == 'Seq Scan' and node.get('Relation Name') in TABLES:
+                scans.append(node['Relation Name'])
+            pending.extend(node.get('Plans', []))
+        return scans
+    # sqlite: 'SCAN bookings' is a full scan, 'SEARCH ...' and 'SCAN ... USING INDEX' are not
+    scans = []
+    for row in rows:
+        words = row[-1].split()
+        if words[0] == 'SCAN' and len(words) > 1 and words[1] in TABLES and 'USING' not in words:
+            scans.append(words[1])
+    return scans
+
+
+def check_query_plans(app):
+    """{name: [tables read with a seq scan]} for every endpoint query"""
+    with app.app_context():
+        if db.engine.dialect.name == 'postgresql':
+            # Small seeded tables make a seq scan the cheapest plan; forbid it so only missing indexes show up
+            db.session.execute(text('ANALYZE'))
+            db.session.execute(text('SET LOCAL enable_seqscan = off'))
+        results = {name: sequential_scans(query) for name, query in endpoint_queries(datetime.utcnow())}
+        db.session.rollback()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fail when an endpoint query falls back to a sequential scan')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL', Config.SQLALCHEMY_DATABASE_URI))
+    args = parser.parse_args()
+
+    class PlanConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database_url
+        SCHEDULER_ENABLED = False
+
+    results = check_query_plans(create_app(PlanConfig))
+    failures = {name: tables for name, tables in results.items() if tables}
+    print(json.dumps({'checked': len(results), 'seq_scans': failures}, indent=2))
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,254 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from app import create_app
+from app.models.base import db
+from app.models import Amenity
+from app.models.occupancy import day_masks, OCCUPYING_STATUSES, SLOT_BYTES
+from app.utils.cache import bump_generation
+from app.utils.seeding import TableLoad, load_tables, password_hash
+from config import Config
+
+BENCH_PASSWORD = 'password'
+CITIES = ['Nairobi', 'Mombasa', 'Kisumu', 'Nakuru', 'Eldoret', 'Thika', 'Malindi', 'Naivasha']
+FIRST_NAMES = ['Amina', 'Brian', 'Chloe', 'David', 'Esther', 'Felix', 'Grace', 'Hassan', 'Irene', 'James']
+LAST_NAMES = ['Otieno', 'Wanjiru', 'Kamau', 'Achieng', 'Mwangi', 'Njeri', 'Kiprop', 'Mutua', 'Odhiambo']
+AMENITIES = ['High-speed WiFi', 'Projector', 'Whiteboards', 'Coffee/Tea', 'Parking', 'Air Conditioning',
+             'Video Conferencing', 'Kitchen', 'Sound System', 'Wheelchair Access']
+SPACE_TYPES = ['MEETING_ROOM', 'EVENT_SPACE', 'COWORKING', 'STUDIO', 'OTHER']
+OCCUPYING = {status.name for status in OCCUPYING_STATUSES}
+
+
+def first_name(user_id):
+    return FIRST_NAMES[user_id % len(FIRST_NAMES)]
+
+
+def last_name(user_id):
+    return LAST_NAMES[user_id // len(FIRST_NAMES) % len(LAST_NAMES)]
+
+
+class Plan:
+    """Row counts and id ranges of one generated dataset; every row is derived from (seed, id)"""
+
+    def __init__(self, bases, users, spaces, images_per_space, bookings, testimonials, seed, now):
+        self.bases = bases
+        self.users = max(2, users)
+        self.spaces = max(1, spaces)
+        self.images_per_space = images_per_space
+        self.bookings = bookings
+        self.testimonials = testimonials
+        self.seed = seed
+        self.now = now.replace(minute=0, second=0, microsecond=0)
+        self.owners = max(1, self.users // 10)
+        self.first_user = bases['users'] + 1
+        self.first_owner = self.first_user + 1
+        self.first_client = self.first_owner + self.owners
+        self.last_user = bases['users'] + self.users
+        self.first_space = bases['spaces'] + 1
+        self.password_hash = password_hash(BENCH_PASSWORD)
+        self.amenity_ids = []
+
+    def client_id(self, rng):
+        return rng.randint(self.first_client, self.last_user)
+
+    def per_space(self, total, space_id):
+        """Spread total rows over the spaces, the first ones taking the remainder"""
+        index = space_id - self.first_space
+        return total // self.spaces + (1 if index < total % self.spaces else 0)
+
+    def rng(self, table, key):
+        return random.Random(f'{self.seed}:{table}:{key}')
+
+    def space_amenities(self, space_id):
+        """Indexes into AMENITIES of one space's amenities"""
+        rng = self.rng('amenities', space_id)
+        return sorted(rng.sample(range(len(AMENITIES)), rng.randint(2, 5)))
+
+    def space_bookings(self, space_id):
+        """Non-overlapping bookings of one space, laid out from a year ago to two months ahead"""
+        count = self.per_space(self.bookings, space_id)
+        if not count:
+            return []
+        rng = self.rng('bookings', space_id)
+        origin = self.now - timedelta(days=365)
+        step_minutes = max(60, int(425 * 24 * 60 / count))
+        cursor = origin + timedelta(minutes=15 * rng.randrange(96))
+        bookings = []
+        for _ in range(count):
+            hours = rng.randint(1, 8)
+            start = cursor
+            end = start + timedelta(hours=hours)
+            if end <= self.now:
+                status = 'COMPLETED' if rng.random() < 0.85 else 'CANCELLED'
+            elif start > self.now:
+                status = 'CONFIRMED' if rng.random() < 0.7 else 'PENDING'
+            else:
+                status = 'CONFIRMED'
+            bookings.append((start, end, status, self.client_id(rng), rng.randint(10, 120) * hours))
+            gap = rng.randrange(step_minutes // 15, 2 * step_minutes // 15 + 1)
+            cursor = end + timedelta(minutes=15 * gap)
+        return bookings
+
+    def space_testimonials(self, space_id):
+        """(user_id, rating, status, created_at) of one space's testimonials"""
+        rng = self.rng('testimonials', space_id)
+        rows = []
+        for _ in range(self.per_space(self.testimonials, space_id)):
+            status = rng.choices(['approved', 'pending', 'rejected'], [80, 15, 5])[0]
+            rating = rng.choices([1, 2, 3, 4, 5], [3, 5, 15, 37, 40])[0]
+            rows.append((self.client_id(rng), rating, status, self.now - timedelta(minutes=rng.randrange(525600))))
+        return rows
+
+
+def user_rows(plan):
+    rng = random.Random(plan.seed)
+    for user_id in range(plan.first_user, plan.last_user + 1):
+        role = 'ADMIN' if user_id == plan.first_user else 'SPACE_OWNER' if user_id < plan.first_client else 'CLIENT'
+        created = plan.now - timedelta(minutes=rng.randrange(2 * 525600))
+        yield (user_id, f'user{user_id}@bench.spacer.test', plan.password_hash, first_name(user_id),
+               last_name(user_id), role, True, None, f'+2547{user_id % 100000000:08d}', created, created)
+
+
+def space_rows(plan):
+    rng = random.Random(plan.seed + 1)
+    for space_id in range(plan.first_space, plan.first_space + plan.spaces):
+        city = CITIES[rng.randrange(len(CITIES))]
+        capacity = rng.choice([2, 4, 6, 8, 12, 20, 50, 100])
+        price = rng.randint(10, 200)
+        amenities = [AMENITIES[index] for index in plan.space_amenities(space_id)]
+        created = plan.now - timedelta(minutes=rng.randrange(2 * 525600))
+        yield (space_id, f'Space {space_id}', f'A {capacity}-person space in {city}. ' * 4, f'{space_id} Main St',
+               city, f'{city} County', 'Kenya', f'{rng.randint(100, 999)}00', rng.choice(SPACE_TYPES),
+               'MAINTENANCE' if rng.random() < 0.02 else 'AVAILABLE', capacity, float(price), float(price * 7),
+               None, json.dumps(amenities), None, rng.randint(plan.first_owner, plan.first_client - 1),
+               rng.random() < 0.95, created, created)
+
+
+def space_amenity_rows(plan):
+    for space_id in range(plan.first_space, plan.first_space + plan.spaces):
+        for index in plan.space_amenities(space_id):
+            yield (space_id, plan.amenity_ids[index])
+
+
+def image_rows(plan):
+    image_id = plan.bases['space_images']
+    for space_id in range(plan.first_space, plan.first_space + plan.spaces):
+        for n in range(plan.images_per_space):
+            image_id += 1
+            yield (image_id, space_id, f'https://res.cloudinary.com/spacer/image/upload/v1/spaces/{space_id}/{n}.jpg',
+                   f'spaces/{space_id}/{n}', n == 0, plan.now)
+
+
+def booking_rows(plan):
+    booking_id = plan.bases['bookings']
+    for space_id in range(plan.first_space, plan.first_space + plan.spaces):
+        for start, end, status, client_id, amount in plan.space_bookings(space_id):
+            booking_id += 1
+            paid = status in ('CONFIRMED', 'COMPLETED')
+            created = min(start - timedelta(days=3), plan.now)
+            yield (booking_id, space_id, client_id, start, end, status, float(amount), paid,
+                   f'PAY-{booking_id}' if paid else None, None,
+                   'Client cancelled' if status == 'CANCELLED' else None, None, created, created)
+
+
+def occupancy_rows(plan):
+    for space_id in range(plan.first_space, plan.first_space + plan.spaces):
+        masks = {}
+        for start, end, status, _, _ in plan.space_bookings(space_id):
+            if status in OCCUPYING:
+                for day, mask in day_masks(start, end).items():
+                    masks[day] = masks.get(day, 0) | mask
+        for day in sorted(masks):
+            yield (space_id, day, masks[day].to_bytes(SLOT_BYTES, 'little'))
+
+
+def testimonial_rows(plan):
+    testimonial_id = plan.bases['testimonials']
+    for space_id in range(plan.first_space, plan.first_space + plan.spaces):
+        for user_id, rating, status, created in plan.space_testimonials(space_id):
+            testimonial_id += 1
+            yield (testimonial_id, user_id, space_id, rating, f'Rated {rating}/5. ' * 3, status,
+                   first_name(user_id), last_name(user_id), None, created, created)
+
+
+def rating_rows(plan):
+    for space_id in range(plan.first_space, plan.first_space + plan.spaces):
+        stars = [0] * 6
+        for _, rating, status, _ in plan.space_testimonials(space_id):
+            if status == 'approved':
+                stars[rating] += 1
+        if sum(stars):
+            yield (space_id, sum(stars), sum(rating * n for rating, n in enumerate(stars))) + tuple(stars[1:])
+
+
+# (table, columns, row generator); load_tables orders them by foreign key
+TABLES = [
+    ('users', ('id', 'email', 'password_hash', 'first_name', 'last_name', 'role', 'is_verified',
+               'profile_picture', 'phone_number', 'created_at', 'updated_at'), user_rows),
+    ('spaces', ('id', 'name', 'description', 'address', 'city', 'state', 'country', 'postal_code', 'type',
+                'status', 'capacity', 'price_per_hour', 'price_per_day', 'images', 'amenities', 'rules',
+                'owner_id', 'is_active', 'created_at', 'updated_at'), space_rows),
+    ('space_amenities', ('space_id', 'amenity_id'), space_amenity_rows),
+    ('space_images', ('id', 'space_id', 'image_url', 'public_id', 'is_primary', 'created_at'), image_rows),
+    ('bookings', ('id', 'space_id', 'client_id', 'start_time', 'end_time', 'status', 'total_amount',
+                  'payment_status', 'payment_reference', 'special_requests', 'cancellation_reason',
+                  'series_id', 'created_at', 'updated_at'), booking_rows),
+    ('space_occupancy', ('space_id', 'day', 'slots'), occupancy_rows),
+    ('testimonials', ('id', 'user_id', 'space_id', 'rating', 'comment', 'status', 'author_first_name',
+                      'author_last_name', 'author_profile_picture', 'created_at', 'updated_at'), testimonial_rows),
+    ('space_ratings', ('space_id', 'count', 'total', 'stars_1', 'stars_2', 'stars_3', 'stars_4', 'stars_5'),
+     rating_rows),
+]
+
+
+def generate(app, users=100000, spaces=50000, images_per_space=3, bookings=5000000, testimonials=250000,
+             seed=42, workers=None, batch_size=10000):
+    """Append a synthetic dataset to the configured database; return per-table timings"""
+    with app.app_context():
+        bases = {name: db.session.execute(select(func.coalesce(func.max(db.metadata.tables[name].c.id), 0))).scalar()
+                 for name, columns, _ in TABLES if columns[0] == 'id'}
+        plan = Plan(bases, users, spaces, images_per_space, bookings, testimonials, seed, datetime.utcnow())
+        amenities = Amenity.get_or_create_many(AMENITIES)
+        db.session.commit()
+        plan.amenity_ids = [amenity.id for amenity in amenities]
+
+        report = load_tables(app.config['SQLALCHEMY_DATABASE_URI'],
+                             [TableLoad(name, columns, rows, plan) for name, columns, rows in TABLES],
+                             workers=workers, batch_size=batch_size)
+        bump_generation('search')
+    report.update(admin_email=f'user{plan.first_user}@bench.spacer.test', password=BENCH_PASSWORD)
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bulk load a synthetic dataset for benchmarks')
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--spaces', type=int, default=50000)
+    parser.add_argument('--images-per-space', type=int, default=3)
+    parser.add_argument('--bookings', type=int, default=5000000)
+    parser.add_argument('--testimonials', type=int, default=250000)
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply every row count, e.g. 0.01 for a smoke run')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, help='parallel table loads on Postgres (default: up to 4)')
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL', Config.SQLALCHEMY_DATABASE_URI))
+    args = parser.parse_args()
+
+    class GenerateConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database_url
+        SCHEDULER_ENABLED = False
+
+    def scaled(count):
+        return int(count * args.scale)
+
+    result = generate(create_app(GenerateConfig), users=scaled(args.users), spaces=scaled(args.spaces),
+                      images_per_space=args.images_per_space, bookings=scaled(args.bookings),
+                      testimonials=scaled(args.testimonials), seed=args.seed, workers=args.workers,
+                      batch_size=args.batch_size)
+    print(json.dumps(result, indent=2))
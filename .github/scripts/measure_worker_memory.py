@@ -0,0 +1,93 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import subprocess
+import time
+import requests
+from config import Config
+from benchmark_asgi import SCRIPTS, ROOT, wait_ready
+
+MODES = {
+    # What the procfile used to run: no config file, so no preload, sync workers
+    'before': [],
+    'after': ['--config', os.path.join(ROOT, 'gunicorn.conf.py')],
+}
+FIELDS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty')
+
+
+def memory_kb(pid):
+    """Memory counters of a process from /proc/<pid>/smaps_rollup (Linux), in kB"""
+    counters = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if name in FIELDS:
+                counters[name] = int(value.split()[0])
+    counters['Uss'] = counters['Private_Clean'] + counters['Private_Dirty']
+    return counters
+
+
+def children(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(child) for child in f.read().split()]
+
+
+def _mb(kb):
+    return round(kb / 1024, 1)
+
+
+def measure(mode, port, workers, warmup, settle):
+    """Start gunicorn in the given mode, warm every worker, then read master and worker memory"""
+    url = f'http://127.0.0.1:{port}'
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers),
+               PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    command = ['gunicorn', *MODES[mode], '--workers', str(workers), '--bind', f'127.0.0.1:{port}',
+               '--log-level', 'warning', 'benchmark_asgi:wsgi_app()']
+    process = subprocess.Popen(command, cwd=SCRIPTS, env=env, stdout=subprocess.DEVNULL)
+    try:
+        wait_ready(url)
+        session = requests.Session()
+        for i in range(warmup):
+            session.get(f'{url}/api/spaces/?page={i % 20 + 1}&per_page=20', timeout=30)
+        time.sleep(settle)
+        worker_pids = children(process.pid)
+        per_worker = [memory_kb(pid) for pid in worker_pids]
+        master = memory_kb(process.pid)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    totals = {field: sum(worker[field] for worker in per_worker) for field in per_worker[0]}
+    return {
+        'workers': len(per_worker),
+        'master_mb': {field.lower(): _mb(value) for field, value in master.items()},
+        'per_worker_mb': [{field.lower(): _mb(value) for field, value in worker.items()} for worker in per_worker],
+        'mean_worker_mb': {field.lower(): _mb(value / len(per_worker)) for field, value in totals.items()},
+        # Pss splits shared pages between the processes sharing them, so it adds up to real usage
+        'total_pss_mb': _mb(totals['Pss'] + master['Pss'])
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Report gunicorn worker memory without (before) and with (after) gunicorn.conf.py')
+    parser.add_argument('--workers', type=int, default=4, help='workers in both modes')
+    parser.add_argument('--warmup', type=int, default=200, help='requests spread over the workers before measuring')
+    parser.add_argument('--settle', type=float, default=2, help='seconds to wait after warming up')
+    parser.add_argument('--port', type=int, default=5200)
+    parser.add_argument('--output', help='write the JSON report here as well as to stdout')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL', Config.SQLALCHEMY_DATABASE_URI))
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = args.database_url
+    report = {mode: measure(mode, args.port, args.workers, args.warmup, args.settle) for mode in MODES}
+    report['saving_mb'] = {
+        'mean_worker_uss': round(report['before']['mean_worker_mb']['uss'] - report['after']['mean_worker_mb']['uss'], 1),
+        'total_pss': round(report['before']['total_pss_mb'] - report['after']['total_pss_mb'], 1)
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
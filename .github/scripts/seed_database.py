@@ -2,155 +2,156 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from flask import Flask
+import argparse
+import json
+from datetime import datetime, timedelta
 from config import Config
-from app.models.base import db, init_db
-from app.models import User, Space, SpaceImage, Booking, Testimonial
+from app import create_app
+from app.models.base import db
+from app.models import Amenity
+from app.models.amenity import slugify
 from app.models.user import UserRole
 from app.models.space import SpaceType, SpaceStatus
 from app.models.booking import BookingStatus
-from datetime import datetime, timedelta
-import json
+from app.models.occupancy import day_masks, SLOT_BYTES
+from app.utils.cache import bump_generation
+from app.utils.seeding import TableLoad, load_tables, clear_tables, password_hash
+from generate_data import TABLES, generate
 
-def seed_database():
-    app = Flask(__name__)
-    app.config.from_object(Config)
-    init_db(app)
-    
-    with app.app_context():
-        # Clear existing data
-        db.session.query(Booking).delete()
-        db.session.query(SpaceImage).delete()
-        db.session.query(Space).delete()
-        db.session.query(User).delete()
-        db.session.commit()
+COLUMNS = {name: columns for name, columns, _ in TABLES}
+SEED_PASSWORD = 'hashed_password'
 
-        # Create users
-        users = [
-            User(
-                email='admin@spacer.com',
-                password='hashed_password',  # In production, use proper password hashing
-                first_name='Admin',
-                last_name='User',
-                role=UserRole.ADMIN
-            ),
-            User(
-                email='user@spacer.com',
-                password='hashed_password',
-                first_name='Regular',
-                last_name='User',
-                role=UserRole.CLIENT
-            )
-        ]
-        for user in users:
-            user.is_verified = True
-        db.session.add_all(users)
-        db.session.commit()
+USERS = [
+    (1, 'admin@spacer.com', 'Admin', 'User', UserRole.ADMIN),
+    (2, 'user@spacer.com', 'Regular', 'User', UserRole.CLIENT),
+]
 
-        # Create spaces
-        spaces = [
-            Space(
-                name='Modern Downtown Office',
-                description='A sleek, modern office space in the heart of downtown, perfect for meetings and collaborative work.',
-                address='123 Main St',
-                city='New York',
-                state='NY',
-                country='USA',
-                postal_code='10001',
-                type=SpaceType.MEETING_ROOM,
-                status=SpaceStatus.AVAILABLE,
-                capacity=12,
-                price_per_hour=45,
-                price_per_day=320,
-                amenities=json.dumps([
-                    'High-speed WiFi',
-                    'Conference room',
-                    'Kitchen',
-                    'Projector',
-                    'Whiteboards',
-                    'Parking',
-                    'Coffee/Tea',
-                    'Air conditioning'
-                ]),
-                owner_id=1
-            ),
-            Space(
-                name='Cozy Art Studio',
-                description='A bright and spacious art studio with natural lighting, perfect for photography or artistic work.',
-                address='456 Williamsburg Ave',
-                city='Brooklyn',
-                state='NY',
-                country='USA',
-                postal_code='11211',
-                type=SpaceType.STUDIO,
-                status=SpaceStatus.AVAILABLE,
-                capacity=6,
-                price_per_hour=35,
-                price_per_day=250,
-                amenities=json.dumps([
-                    'Natural lighting',
-                    'Storage space',
-                    'Sink/water access',
-                    'WiFi',
-                    'Restroom',
-                    'Climate control',
-                    'Sound system'
-                ]),
-                owner_id=1
-            )
+SPACES = [
+    {
+        'id': 1,
+        'name': 'Modern Downtown Office',
+        'description': 'A sleek, modern office space in the heart of downtown, perfect for meetings and collaborative work.',
+        'address': '123 Main St',
+        'city': 'New York',
+        'state': 'NY',
+        'country': 'USA',
+        'postal_code': '10001',
+        'type': SpaceType.MEETING_ROOM,
+        'capacity': 12,
+        'price_per_hour': 45,
+        'price_per_day': 320,
+        'amenities': ['High-speed WiFi', 'Conference room', 'Kitchen', 'Projector', 'Whiteboards', 'Parking',
+                      'Coffee/Tea', 'Air conditioning'],
+        'images': [
+            'https://images.pexels.com/photos/1170412/pexels-photo-1170412.jpeg',
+            'https://images.pexels.com/photos/260931/pexels-photo-260931.jpeg',
+            'https://images.pexels.com/photos/380768/pexels-photo-380768.jpeg'
         ]
-        db.session.add_all(spaces)
-        db.session.commit()
+    },
+    {
+        'id': 2,
+        'name': 'Cozy Art Studio',
+        'description': 'A bright and spacious art studio with natural lighting, perfect for photography or artistic work.',
+        'address': '456 Williamsburg Ave',
+        'city': 'Brooklyn',
+        'state': 'NY',
+        'country': 'USA',
+        'postal_code': '11211',
+        'type': SpaceType.STUDIO,
+        'capacity': 6,
+        'price_per_hour': 35,
+        'price_per_day': 250,
+        'amenities': ['Natural lighting', 'Storage space', 'Sink/water access', 'WiFi', 'Restroom',
+                      'Climate control', 'Sound system'],
+        'images': [
+            'https://images.pexels.com/photos/6306387/pexels-photo-6306387.jpeg',
+            'https://images.pexels.com/photos/4039921/pexels-photo-4039921.jpeg',
+            'https://images.pexels.com/photos/5083407/pexels-photo-5083407.jpeg'
+        ]
+    }
+]
+
+def booking_fixtures(now):
+    """(id, space_id, client_id, start, end, total_amount) of the confirmed sample bookings"""
+    return [
+        (1, 1, 2, now + timedelta(days=1), now + timedelta(days=1, hours=4), 180),
+        (2, 2, 1, now + timedelta(days=2), now + timedelta(days=2, hours=4), 140),
+    ]
 
-        # Create space images
-        space_images = []
-        for space in spaces:
-            if space.name == 'Modern Downtown Office':
-                images = [
-                    'https://images.pexels.com/photos/1170412/pexels-photo-1170412.jpeg',
-                    'https://images.pexels.com/photos/260931/pexels-photo-260931.jpeg',
-                    'https://images.pexels.com/photos/380768/pexels-photo-380768.jpeg'
-                ]
-            else:
-                images = [
-                    'https://images.pexels.com/photos/6306387/pexels-photo-6306387.jpeg',
-                    'https://images.pexels.com/photos/4039921/pexels-photo-4039921.jpeg',
-                    'https://images.pexels.com/photos/5083407/pexels-photo-5083407.jpeg'
-                ]
-            
-            for i, image_url in enumerate(images):
-                space_images.append(SpaceImage(
-                    space_id=space.id,
-                    image_url=image_url,
-                    is_primary=(i == 0)
-                ))
-        
-        db.session.add_all(space_images)
+def user_rows(now):
+    for user_id, email, first_name, last_name, role in USERS:
+        yield (user_id, email, password_hash(SEED_PASSWORD), first_name, last_name, role, True,
+               None, None, now, now)
+
+def space_rows(now):
+    for space in SPACES:
+        yield (space['id'], space['name'], space['description'], space['address'], space['city'], space['state'],
+               space['country'], space['postal_code'], space['type'], SpaceStatus.AVAILABLE, space['capacity'],
+               space['price_per_hour'], space['price_per_day'], None, json.dumps(space['amenities']), None,
+               1, True, now, now)
+
+def space_amenity_rows(amenity_ids):
+    for space in SPACES:
+        for name in space['amenities']:
+            yield (space['id'], amenity_ids[slugify(name)])
+
+def image_rows(now):
+    image_id = 0
+    for space in SPACES:
+        for i, image_url in enumerate(space['images']):
+            image_id += 1
+            yield (image_id, space['id'], image_url, None, i == 0, now)
+
+def booking_rows(now):
+    for booking_id, space_id, client_id, start, end, amount in booking_fixtures(now):
+        yield (booking_id, space_id, client_id, start, end, BookingStatus.CONFIRMED, amount, False,
+               None, None, None, None, now, now)
+
+def occupancy_rows(now):
+    masks = {}
+    for _, space_id, _, start, end, _ in booking_fixtures(now):
+        for day, mask in day_masks(start, end).items():
+            masks[space_id, day] = masks.get((space_id, day), 0) | mask
+    for (space_id, day), mask in sorted(masks.items()):
+        yield (space_id, day, mask.to_bytes(SLOT_BYTES, 'little'))
+
+def seed_database(app, scale=0, workers=None):
+    """Reset the database to the sample fixtures, plus a synthetic dataset when scale > 0"""
+    now = datetime.now()
+    with app.app_context():
+        clear_tables(db.engine, [table.name for table in db.metadata.sorted_tables])
+        amenities = Amenity.get_or_create_many({name for space in SPACES for name in space['amenities']})
         db.session.commit()
+        amenity_ids = {amenity.slug: amenity.id for amenity in amenities}
 
-        # Create bookings
-        bookings = [
-            Booking(
-                space_id=1,
-                client_id=2,
-                start_time=datetime.now() + timedelta(days=1),
-                end_time=datetime.now() + timedelta(days=1, hours=4),
-                status=BookingStatus.CONFIRMED,
-                total_amount=180
-            ),
-            Booking(
-                space_id=2,
-                client_id=1,
-                start_time=datetime.now() + timedelta(days=2),
-                end_time=datetime.now() + timedelta(days=2, hours=4),
-                status=BookingStatus.CONFIRMED,
-                total_amount=140
-            )
+        loads = [
+            TableLoad('users', COLUMNS['users'], user_rows, now),
+            TableLoad('spaces', COLUMNS['spaces'], space_rows, now),
+            TableLoad('space_amenities', COLUMNS['space_amenities'], space_amenity_rows, amenity_ids),
+            TableLoad('space_images', COLUMNS['space_images'], image_rows, now),
+            TableLoad('bookings', COLUMNS['bookings'], booking_rows, now),
+            TableLoad('space_occupancy', COLUMNS['space_occupancy'], occupancy_rows, now),
         ]
-        db.session.add_all(bookings)
-        db.session.commit()
+        report = {'fixtures': load_tables(app.config['SQLALCHEMY_DATABASE_URI'], loads, workers=workers)}
+        bump_generation('search')
 
-        print("Database seeded successfully!")
+    if scale > 0:
+        report['generated'] = generate(app, users=int(100000 * scale), spaces=int(50000 * scale),
+                                       bookings=int(5000000 * scale), testimonials=int(250000 * scale),
+                                       workers=workers)
+    return report
 
 if __name__ == '__main__':
-    seed_database() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Reset the database to the sample data')
+    parser.add_argument('--scale', type=float, default=0,
+                        help='also generate this fraction of the benchmark dataset (1.0 = 100k users, 5M bookings)')
+    parser.add_argument('--workers', type=int, help='parallel table loads on Postgres (default: up to 4)')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL', Config.SQLALCHEMY_DATABASE_URI))
+    args = parser.parse_args()
+
+    class SeedConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database_url
+        SCHEDULER_ENABLED = False
+
+    print(json.dumps(seed_database(create_app(SeedConfig), scale=args.scale, workers=args.workers), indent=2))
+    print("Database seeded successfully!")
@@ -0,0 +1,132 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from sqlalchemy import text
+from app import create_app
+from app.models.base import db
+from app.models import User, Space
+from app.models.user import UserRole
+from app.models.space import SpaceType
+from config import Config
+
+def setup(app):
+    """Create one owner, one space and a pool of clients; return (space_id, tokens)"""
+    suffix = uuid.uuid4().hex[:8]
+    with app.app_context():
+        owner = User(f'stress-owner-{suffix}@spacer.com', 'password', 'Stress', 'Owner', UserRole.SPACE_OWNER)
+        db.session.add(owner)
+        db.session.flush()
+        space = Space(
+            name=f'Stress Room {suffix}', description='Concurrency test space', address='1 Test St',
+            city='Nairobi', state='Nairobi', country='Kenya', postal_code='00100',
+            type=SpaceType.MEETING_ROOM, capacity=10, price_per_hour=10, price_per_day=80,
+            owner_id=owner.id
+        )
+        db.session.add(space)
+        clients = [User(f'stress-client-{suffix}-{i}@spacer.com', 'password', 'Stress', f'Client{i}', UserRole.CLIENT)
+                   for i in range(8)]
+        db.session.add_all(clients)
+        db.session.commit()
+        tokens = [create_access_token(identity=client.id) for client in clients]
+        return space.id, tokens
+
+def run(app, space_id, tokens, threads, requests_per_thread, slots):
+    """Fire overlapping booking requests from many threads at once"""
+    base = datetime.utcnow().replace(minute=0, second=0, microsecond=0) + timedelta(days=30)
+    barrier = threading.Barrier(threads)
+    shared_keys = [str(uuid.uuid4()) for _ in range(slots)]
+
+    def worker(index):
+        client = app.test_client()
+        rng = random.Random(index)
+        token = tokens[index % len(tokens)]
+        outcomes = []
+        barrier.wait()
+        for _ in range(requests_per_thread):
+            slot = rng.randrange(slots)
+            # Windows shifted by 0-45 minutes so neighbouring requests overlap
+            start = base + timedelta(hours=slot, minutes=rng.choice([0, 15, 30, 45]))
+            payload = {
+                'space_id': space_id,
+                'start_time': start.isoformat(),
+                'end_time': (start + timedelta(hours=1)).isoformat()
+            }
+            headers = {'Authorization': f'Bearer {token}'}
+            key = None
+            if rng.random() < 0.25:
+                # Retried request: same token, key and body as other retries of this slot
+                token = tokens[0]
+                key = shared_keys[slot]
+                payload['start_time'] = (base + timedelta(hours=slot)).isoformat()
+                payload['end_time'] = (base + timedelta(hours=slot + 1)).isoformat()
+                headers = {'Authorization': f'Bearer {token}', 'Idempotency-Key': key}
+            response = client.post('/api/bookings/', json=payload, headers=headers)
+            body = response.get_json(silent=True) or {}
+            outcomes.append((response.status_code, key, body.get('id')))
+        return outcomes
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = [outcome for outcomes in pool.map(worker, range(threads)) for outcome in outcomes]
+    elapsed = time.perf_counter() - started
+    return results, elapsed
+
+def verify(app, space_id, results):
+    """Count overlapping active bookings and keys that produced more than one booking"""
+    with app.app_context():
+        overlaps = db.session.execute(text("""
+            SELECT count(*) FROM bookings a
+            JOIN bookings b ON a.space_id = b.space_id AND a.id < b.id
+            WHERE a.space_id = :space_id
+              AND a.status IN ('PENDING', 'CONFIRMED') AND b.status IN ('PENDING', 'CONFIRMED')
+              AND a.start_time < b.end_time AND a.end_time > b.start_time
+        """), {'space_id': space_id}).scalar()
+    ids_per_key = defaultdict(set)
+    for status, key, booking_id in results:
+        if key and status == 201:
+            ids_per_key[key].add(booking_id)
+    duplicated_keys = sum(1 for ids in ids_per_key.values() if len(ids) > 1)
+    return overlaps, duplicated_keys
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Hammer POST /bookings concurrently and check for double bookings')
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=25, help='requests per thread')
+    parser.add_argument('--slots', type=int, default=12, help='distinct hour slots competed for')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL', Config.SQLALCHEMY_DATABASE_URI))
+    args = parser.parse_args()
+    if args.database_url.startswith('sqlite'):
+        # SQLite ignores SELECT ... FOR UPDATE, so the result would say nothing about the locking
+        parser.error('run this against PostgreSQL')
+
+    class StressConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database_url
+        SQLALCHEMY_ENGINE_OPTIONS = {'pool_size': args.threads, 'max_overflow': 0}
+        RATELIMIT_ENABLED = False
+
+    app = create_app(StressConfig)
+    space_id, tokens = setup(app)
+    results, elapsed = run(app, space_id, tokens, args.threads, args.requests, args.slots)
+    overlaps, duplicated_keys = verify(app, space_id, results)
+    report = {
+        'threads': args.threads,
+        'requests': len(results),
+        'elapsed_seconds': round(elapsed, 3),
+        'requests_per_second': round(len(results) / elapsed, 1),
+        'status_codes': dict(Counter(status for status, _, _ in results)),
+        'double_bookings': overlaps,
+        'duplicated_idempotency_keys': duplicated_keys
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if overlaps or duplicated_keys else 0)
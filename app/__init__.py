@@ -7,6 +7,16 @@ from flask_limiter.util import get_remote_address
 from flask_jwt_extended import JWTManager
 from config import Config
 from .models.base import db, init_db
+from .utils.http_cache import apply_cache_policy
+from .utils.compression import Compression
+from .utils.cache import cache
+from .utils.scheduler import scheduler
+from .utils.lifecycle import sweep_bookings_command
+from .utils.archive import archive_bookings_command
+from .utils.featured import rank_spaces_command
+from .utils.tokens import purge_tokens_command
+from .utils.soft_delete import purge_tombstones_command
+from .utils.revocation import is_token_revoked
 #from .routes import init_routes
 from .api import api_bp
 
@@ -16,6 +26,8 @@ limiter = Limiter(
     default_limits=["200 per day", "50 per hour"]
 )
 jwt = JWTManager()
+jwt.token_in_blocklist_loader(is_token_revoked)
+compression = Compression()
 
 def create_app(config_class=Config):
     app = Flask(__name__)
@@ -27,6 +39,8 @@ def create_app(config_class=Config):
     CORS(app)
     limiter.init_app(app)
     jwt.init_app(app)
+    compression.init_app(app)
+    cache.init_app(app)
 
     # Exempt OPTIONS requests from rate limiting
     @app.before_request
@@ -36,6 +50,16 @@ def create_app(config_class=Config):
             # Disable rate limiting for OPTIONS requests
             setattr(request, 'limiter_exempt', True)
 
+    app.after_request(apply_cache_policy)
+
+    # Background jobs (SCHEDULER_ENABLED) and their CLI equivalents
+    app.cli.add_command(sweep_bookings_command)
+    app.cli.add_command(archive_bookings_command)
+    app.cli.add_command(rank_spaces_command)
+    app.cli.add_command(purge_tokens_command)
+    app.cli.add_command(purge_tombstones_command)
+    scheduler.init_app(app)
+
     # Register API blueprint only
     app.register_blueprint(api_bp, url_prefix='/api')
     # init_routes(app)  # Removed to avoid redundant blueprint registrations
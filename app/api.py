@@ -4,8 +4,12 @@ from app.api_namespaces.spaces import spaces_ns
 from app.api_namespaces.bookings import bookings_ns
 from app.api_namespaces.testimonials import testimonials_ns
 from app.api_namespaces.admin import admin_ns
+from app.api_namespaces.quotes import quotes_ns
+from app.api_namespaces.owner import owner_ns
 from flask_restx import Api, Resource
 from flask_jwt_extended import jwt_required
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
 
 api_bp = Blueprint('api', __name__)
 
@@ -26,6 +30,12 @@ api = Api(api_bp,
           authorizations=authorizations,
           security='bearerAuth')
 
+# flask_restx answers exceptions before flask_jwt_extended's app handlers see them, so map them here
+@api.errorhandler(JWTExtendedException)
+@api.errorhandler(PyJWTError)
+def handle_auth_error(error):
+    return {'message': str(error)}, 401
+
 from app.api_namespaces.admin import user_model
 
 api.add_namespace(auth_ns)
@@ -33,6 +43,8 @@ api.add_namespace(spaces_ns)
 api.add_namespace(bookings_ns)
 api.add_namespace(testimonials_ns)
 api.add_namespace(admin_ns)
+api.add_namespace(quotes_ns)
+api.add_namespace(owner_ns)
 
 # Admin Routes
 @admin_ns.route('/users')
@@ -1,7 +1,15 @@
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, marshal
+from flask import request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import User
+from datetime import datetime
+from app.models import User, BookingArchive
 from app.models.user import UserRole
+from app.models.booking import BookingStatus
+from app.models.base import db
+from app.utils.streaming import stream_query
+from app.utils.moderation import pending_queue, moderate, MODERATION_STATUSES
+from app.utils.accounts import bulk_update_users, USER_ACTIONS
+from app.utils.dashboard import platform_stats
 
 admin_ns = Namespace('admin', description='Admin operations')
 
@@ -13,40 +21,213 @@ user_model = admin_ns.model('User', {
     'role': fields.String(required=True),
     'is_verified': fields.Boolean(default=False),
     'profile_picture': fields.String,
-    'phone_number': fields.String
+    'phone_number': fields.String,
+    'is_active': fields.Boolean(readonly=True),
+    'deleted_at': fields.DateTime(readonly=True)
 })
 
+user_batch_model = admin_ns.model('UserBatch', {
+    'ids': fields.List(fields.Integer, required=True),
+    'action': fields.String(required=True, description=', '.join(USER_ACTIONS)),
+    'role': fields.String(description='New role for set_role: admin, space_owner or client')
+})
+
+user_export_model = admin_ns.model('UserExport', {
+    'ids': fields.List(fields.Integer, required=True)
+})
+
+def _batch_ids(data):
+    """Validated ids of a batch request, or an error response"""
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not ids or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+        return None, ({'message': 'ids must be a non-empty list of integers'}, 400)
+    limit = current_app.config.get('USER_BATCH_LIMIT', 1000)
+    if len(ids) > limit:
+        return None, ({'message': f'At most {limit} ids per request'}, 400)
+    return ids, None
+
 @admin_ns.route('/users')
 class UserList(Resource):
     @jwt_required()
-    @admin_ns.marshal_list_with(user_model)
+    @admin_ns.response(200, 'Success', [user_model])
+    @admin_ns.doc(params={'include_deleted': 'true to list soft-deleted users too'})
     def get(self):
-        """Get all users (admin only)"""
+        """Get all users (admin only), streamed as JSON or NDJSON (?format=ndjson)"""
+        current_user_id = get_jwt_identity()
+        current_user = User.query.get(current_user_id)
+        if current_user.role != UserRole.ADMIN:
+            return {'message': 'Unauthorized'}, 403
+        query = User.query.execution_options(include_deleted=request.args.get('include_deleted', '').lower() == 'true')
+        return stream_query(query.order_by(User.id), lambda user: marshal(user, user_model))
+
+    @jwt_required()
+    @admin_ns.expect(user_batch_model)
+    def patch(self):
+        """Change the role of, verify, soft-delete or restore many users in one statement (admin only)"""
+        current_user_id = get_jwt_identity()
+        current_user = User.query.get(current_user_id)
+        if current_user.role != UserRole.ADMIN:
+            return {'message': 'Unauthorized'}, 403
+        data = request.get_json() or {}
+        action = data.get('action')
+        if action not in USER_ACTIONS:
+            return {'message': f'action must be one of {", ".join(USER_ACTIONS)}'}, 400
+        role = None
+        if action == 'set_role':
+            try:
+                role = UserRole(data.get('role'))
+            except ValueError:
+                return {'message': 'Invalid role'}, 400
+        ids, error = _batch_ids(data)
+        if error:
+            return error
+        result = bulk_update_users(ids, action, role=role, actor_id=current_user.id)
+        db.session.commit()
+        return result
+
+@admin_ns.route('/users/export')
+class UserExport(Resource):
+    @jwt_required()
+    @admin_ns.expect(user_export_model)
+    def post(self):
+        """Export many users by id, soft-deleted ones included (admin only)"""
         current_user_id = get_jwt_identity()
         current_user = User.query.get(current_user_id)
         if current_user.role != UserRole.ADMIN:
             return {'message': 'Unauthorized'}, 403
-        return User.query.all()
+        ids, error = _batch_ids(request.get_json() or {})
+        if error:
+            return error
+        users = User.query.execution_options(include_deleted=True).filter(User.id.in_(set(ids))).order_by(User.id).all()
+        found = {user.id for user in users}
+        return {
+            'users': marshal(users, user_model),
+            'not_found': sorted({user_id for user_id in ids if user_id not in found})
+        }
 
 @admin_ns.route('/users/<int:user_id>')
 class UserDetail(Resource):
     @jwt_required()
     @admin_ns.marshal_with(user_model)
     def get(self, user_id):
-        """Get user details (admin only)"""
+        """Get user details, soft-deleted users included (admin only)"""
         current_user_id = get_jwt_identity()
         current_user = User.query.get(current_user_id)
         if current_user.role != UserRole.ADMIN:
             return {'message': 'Unauthorized'}, 403
-        return User.query.get_or_404(user_id)
+        return User.query.execution_options(include_deleted=True).get_or_404(user_id)
 
     @jwt_required()
     def delete(self, user_id):
-        """Delete a user (admin only)"""
+        """Soft-delete a user (admin only)"""
         current_user_id = get_jwt_identity()
         current_user = User.query.get(current_user_id)
         if current_user.role != UserRole.ADMIN:
             return {'message': 'Unauthorized'}, 403
-        user = User.query.get_or_404(user_id)
-        user.delete()
+        result = bulk_update_users([user_id], 'soft_delete', actor_id=current_user.id)
+        if result['not_found']:
+            return {'message': 'User not found'}, 404
+        if result['skipped']:
+            return {'message': 'You cannot delete your own account'}, 400
+        db.session.commit()
         return {'message': 'User deleted successfully'}
+
+@admin_ns.route('/stats')
+class PlatformStats(Resource):
+    @jwt_required()
+    def get(self):
+        """Platform statistics (admin only)"""
+        current_user_id = get_jwt_identity()
+        current_user = User.query.get(current_user_id)
+        if current_user.role != UserRole.ADMIN:
+            return {'message': 'Unauthorized'}, 403
+        return platform_stats()
+
+@admin_ns.route('/bookings/archive')
+class BookingArchiveList(Resource):
+    @jwt_required()
+    @admin_ns.doc(params={
+        'space_id': 'Filter by space',
+        'client_id': 'Filter by client',
+        'start': 'ISO 8601; bookings starting at or after',
+        'end': 'ISO 8601; bookings starting before',
+        'status': 'completed or cancelled'
+    })
+    def get(self):
+        """Query archived booking history (admin only)"""
+        current_user_id = get_jwt_identity()
+        current_user = User.query.get(current_user_id)
+        if current_user.role != UserRole.ADMIN:
+            return {'message': 'Unauthorized'}, 403
+        page = request.args.get('page', default=1, type=int)
+        per_page = min(request.args.get('per_page', default=50, type=int), 500)
+
+        query = BookingArchive.query
+        for name in ('space_id', 'client_id'):
+            value = request.args.get(name, type=int)
+            if value is not None:
+                query = query.filter(getattr(BookingArchive, name) == value)
+        try:
+            if request.args.get('start'):
+                query = query.filter(BookingArchive.start_time >= datetime.fromisoformat(request.args['start']))
+            if request.args.get('end'):
+                query = query.filter(BookingArchive.start_time < datetime.fromisoformat(request.args['end']))
+            if request.args.get('status'):
+                query = query.filter(BookingArchive.status == BookingStatus(request.args['status']))
+        except ValueError:
+            return {'message': 'Invalid start, end or status filter'}, 400
+
+        pagination = query.order_by(BookingArchive.start_time.desc(), BookingArchive.id.desc()) \
+            .paginate(page=page, per_page=per_page, error_out=False)
+        return {
+            'bookings': [booking.to_dict() for booking in pagination.items],
+            'total': pagination.total,
+            'pages': pagination.pages,
+            'current_page': pagination.page
+        }
+
+moderation_model = admin_ns.model('ModerationBatch', {
+    'ids': fields.List(fields.Integer, required=True),
+    'status': fields.String(required=True, description='approved, rejected or pending')
+})
+
+@admin_ns.route('/testimonials/queue')
+class ModerationQueue(Resource):
+    @jwt_required()
+    @admin_ns.doc(params={'after': 'next_cursor of the previous page', 'limit': 'Page size (max 200)'})
+    def get(self):
+        """Pending testimonials, oldest first, keyset paginated (admin only)"""
+        current_user_id = get_jwt_identity()
+        current_user = User.query.get(current_user_id)
+        if current_user.role != UserRole.ADMIN:
+            return {'message': 'Unauthorized'}, 403
+        limit = max(1, min(request.args.get('limit', default=50, type=int), 200))
+        try:
+            items, next_cursor = pending_queue(request.args.get('after'), limit)
+        except ValueError as e:
+            return {'message': str(e)}, 400
+        return {'testimonials': [testimonial.to_dict() for testimonial in items], 'next_cursor': next_cursor}
+
+@admin_ns.route('/testimonials')
+class ModerationBatch(Resource):
+    @jwt_required()
+    @admin_ns.expect(moderation_model)
+    def patch(self):
+        """Approve or reject many testimonials in one statement (admin only)"""
+        current_user_id = get_jwt_identity()
+        current_user = User.query.get(current_user_id)
+        if current_user.role != UserRole.ADMIN:
+            return {'message': 'Unauthorized'}, 403
+        data = request.get_json() or {}
+        ids = data.get('ids')
+        status = data.get('status')
+        if status not in MODERATION_STATUSES:
+            return {'message': 'status must be approved, rejected or pending'}, 400
+        if not isinstance(ids, list) or not ids or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+            return {'message': 'ids must be a non-empty list of integers'}, 400
+        limit = current_app.config.get('MODERATION_BATCH_LIMIT', 500)
+        if len(ids) > limit:
+            return {'message': f'At most {limit} ids per request'}, 400
+        result = moderate(ids, status)
+        db.session.commit()
+        return result
@@ -1,8 +1,9 @@
 from flask_restx import Namespace, Resource, fields
 from flask import request
-from flask_jwt_extended import create_access_token
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt, get_jwt_identity
 from app.models import User
 from app.models.user import UserRole
+from app.utils.revocation import revoke_token, revoke_all_tokens, token_claims
 from sqlalchemy.exc import IntegrityError
 
 auth_ns = Namespace('auth', description='Authentication operations')
@@ -52,12 +53,34 @@ class Login(Resource):
     @auth_ns.expect(user_login_model)
     @auth_ns.response(200, 'Login successful')
     @auth_ns.response(401, 'Invalid credentials')
+    @auth_ns.response(403, 'Account deactivated')
     def post(self):
         """Login user and return JWT token"""
         data = request.get_json()
         user = User.query.filter_by(email=data['email']).first()
         if user and user.check_password(data['password']):
-            additional_claims = {'role': user.role.value}
+            if not user.is_active:
+                return {'message': 'Account is deactivated'}, 403
+            additional_claims = {'role': user.role.value, **token_claims(user)}
             access_token = create_access_token(identity=user.id, additional_claims=additional_claims)
             return {'access_token': access_token}, 200
         return {'message': 'Invalid credentials'}, 401
+
+@auth_ns.route('/logout')
+class Logout(Resource):
+    @jwt_required()
+    @auth_ns.response(200, 'Logged out')
+    def post(self):
+        """Revoke the token sent with this request"""
+        revoke_token(get_jwt())
+        return {'message': 'Successfully logged out'}, 200
+
+@auth_ns.route('/logout-all')
+class LogoutAll(Resource):
+    @jwt_required()
+    @auth_ns.response(200, 'Logged out everywhere')
+    def post(self):
+        """Revoke every token issued to the current user"""
+        user = User.query.get_or_404(get_jwt_identity())
+        revoke_all_tokens(user)
+        return {'message': 'Logged out of all sessions'}, 200
@@ -0,0 +1,252 @@
+from flask_restx import Namespace, Resource, fields
+from flask import request, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+import json
+import uuid
+from app.models import Booking, Space, User, IdempotencyKey
+from app.models.booking import BookingStatus
+from app.models.user import UserRole
+from app.models.base import db
+from app.utils.recurrence import expand_rule, match_conflicts
+
+bookings_ns = Namespace('bookings', description='Booking operations')
+
+booking_model = bookings_ns.model('Booking', {
+    'id': fields.Integer(readonly=True),
+    'space_id': fields.Integer(required=True),
+    'start_time': fields.DateTime(required=True, description='ISO 8601 start'),
+    'end_time': fields.DateTime(required=True, description='ISO 8601 end'),
+    'special_requests': fields.String
+})
+
+recurring_booking_model = bookings_ns.inherit('RecurringBooking', booking_model, {
+    'rrule': fields.String(required=True, description="RFC 5545 rule, e.g. 'FREQ=WEEKLY;BYDAY=MO;COUNT=52'"),
+    'on_conflict': fields.String(description="'skip' books the free occurrences (default), 'abort' books none")
+})
+
+idempotency_parser = bookings_ns.parser()
+idempotency_parser.add_argument('Idempotency-Key', location='headers', required=False,
+                                help='Retries with the same key return the original result')
+
+def parse_booking_window(data):
+    """Return (start, end) from a request body or raise ValueError"""
+    try:
+        start = datetime.fromisoformat(data['start_time'])
+        end = datetime.fromisoformat(data['end_time'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError('start_time and end_time must be ISO 8601 datetimes')
+    # Bookings are stored as naive UTC; an offset would also make the comparison below raise TypeError
+    if start.tzinfo is not None or end.tzinfo is not None:
+        raise ValueError('start_time and end_time must not carry a UTC offset')
+    if end <= start:
+        raise ValueError('end_time must be after start_time')
+    return start, end
+
+def replay_stored(stored, request_hash):
+    """Replay a stored result, refusing keys reused for a different request"""
+    if stored.request_hash != request_hash:
+        return {'message': 'Idempotency-Key was already used for a different request'}, 422
+    return stored.replay()
+
+def load_idempotent(user_id, key, data):
+    """Return (request_hash, replayed result or None) for a request carrying an Idempotency-Key"""
+    request_hash = IdempotencyKey.hash_request(request.method, request.path, data)
+    stored = IdempotencyKey.lookup(user_id, key)
+    if stored and stored.is_expired(current_app.config.get('IDEMPOTENCY_KEY_TTL', 86400)):
+        db.session.delete(stored)
+        db.session.flush()
+        stored = None
+    if stored:
+        return request_hash, replay_stored(stored, request_hash)
+    return request_hash, None
+
+def commit_idempotent(user_id, key, request_hash, body, status_code):
+    """Commit the pending writes, storing the result under the Idempotency-Key if one was sent"""
+    if key:
+        db.session.add(IdempotencyKey(
+            user_id=user_id,
+            key=key,
+            request_hash=request_hash,
+            status_code=status_code,
+            response=json.dumps(body)
+        ))
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent retry with the same key committed first
+        db.session.rollback()
+        stored = IdempotencyKey.lookup(user_id, key) if key else None
+        if not stored:
+            raise
+        return replay_stored(stored, request_hash)
+    return body, status_code
+
+@bookings_ns.route('/')
+class BookingList(Resource):
+    @jwt_required()
+    def get(self):
+        """Get the current user's bookings"""
+        page = request.args.get('page', default=1, type=int)
+        per_page = request.args.get('per_page', default=10, type=int)
+        current_user_id = get_jwt_identity()
+        query = Booking.query.filter_by(client_id=current_user_id)
+        series_id = request.args.get('series_id')
+        if series_id:
+            query = query.filter_by(series_id=series_id)
+        pagination = query.order_by(Booking.start_time.desc()) \
+            .paginate(page=page, per_page=per_page, error_out=False)
+        return {
+            'bookings': [booking.to_dict() for booking in pagination.items],
+            'total': pagination.total,
+            'pages': pagination.pages,
+            'current_page': pagination.page
+        }
+
+    @jwt_required()
+    @bookings_ns.expect(booking_model, idempotency_parser)
+    @bookings_ns.response(201, 'Booking created successfully')
+    @bookings_ns.response(409, 'The space is already booked for that time')
+    @bookings_ns.response(422, 'Idempotency-Key reused with a different request')
+    def post(self):
+        """Create a booking; the space row is locked so overlapping bookings cannot both succeed"""
+        data = request.get_json() or {}
+        current_user_id = get_jwt_identity()
+        key = request.headers.get('Idempotency-Key')
+        try:
+            space_id = int(data['space_id'])
+        except (KeyError, TypeError, ValueError):
+            return {'message': 'space_id is required'}, 400
+        try:
+            start, end = parse_booking_window(data)
+        except ValueError as e:
+            return {'message': str(e)}, 400
+
+        # Holds the space row lock until commit/rollback
+        space = Space.lock(space_id)
+        if not space or not space.is_active:
+            db.session.rollback()
+            return {'message': 'Space not found'}, 404
+
+        request_hash = None
+        if key:
+            request_hash, replayed = load_idempotent(current_user_id, key, data)
+            if replayed:
+                db.session.rollback()
+                return replayed
+
+        if Booking.overlapping(space_id, start, end).first():
+            db.session.rollback()
+            return {'message': 'The space is already booked for that time'}, 409
+
+        booking = Booking(
+            space_id=space_id,
+            client_id=current_user_id,
+            start_time=start,
+            end_time=end,
+            status=BookingStatus.PENDING,
+            special_requests=data.get('special_requests')
+        )
+        booking.total_amount = booking.calculate_total_amount(space)
+        db.session.add(booking)
+        db.session.flush()
+        return commit_idempotent(current_user_id, key, request_hash, booking.to_dict(), 201)
+
+@bookings_ns.route('/recurring')
+class RecurringBookingList(Resource):
+    @jwt_required()
+    @bookings_ns.expect(recurring_booking_model, idempotency_parser)
+    @bookings_ns.response(201, 'Series created; the report lists each occurrence')
+    @bookings_ns.response(409, 'No occurrence could be booked')
+    def post(self):
+        """Book a space on a recurrence rule; start_time/end_time describe the first occurrence"""
+        data = request.get_json() or {}
+        current_user_id = get_jwt_identity()
+        key = request.headers.get('Idempotency-Key')
+        on_conflict = data.get('on_conflict', 'skip')
+        if on_conflict not in ('skip', 'abort'):
+            return {'message': "on_conflict must be 'skip' or 'abort'"}, 400
+        try:
+            space_id = int(data['space_id'])
+        except (KeyError, TypeError, ValueError):
+            return {'message': 'space_id is required'}, 400
+        try:
+            start, end = parse_booking_window(data)
+            occurrences = expand_rule(data.get('rrule') or '', start, end,
+                                      current_app.config.get('RECURRING_MAX_OCCURRENCES', 366))
+        except ValueError as e:
+            return {'message': str(e)}, 400
+
+        space = Space.lock(space_id)
+        if not space or not space.is_active:
+            db.session.rollback()
+            return {'message': 'Space not found'}, 404
+
+        request_hash = None
+        if key:
+            request_hash, replayed = load_idempotent(current_user_id, key, data)
+            if replayed:
+                db.session.rollback()
+                return replayed
+
+        # One range query for the whole series, matched against the occurrences in a single pass
+        existing = Booking.overlapping(space_id, occurrences[0][0], occurrences[-1][1]) \
+            .with_entities(Booking.start_time, Booking.end_time, Booking.id) \
+            .order_by(Booking.start_time).all()
+        conflicts = match_conflicts(occurrences, existing)
+
+        series_id = str(uuid.uuid4())
+        bookings = []
+        report = []
+        for (occurrence_start, occurrence_end), conflict_id in zip(occurrences, conflicts):
+            entry = {
+                'start_time': occurrence_start.isoformat(),
+                'end_time': occurrence_end.isoformat(),
+                'status': 'conflict' if conflict_id else 'created',
+                'conflicts_with': conflict_id,
+                'booking_id': None
+            }
+            report.append(entry)
+            if conflict_id:
+                continue
+            booking = Booking(
+                space_id=space_id,
+                client_id=current_user_id,
+                start_time=occurrence_start,
+                end_time=occurrence_end,
+                status=BookingStatus.PENDING,
+                special_requests=data.get('special_requests'),
+                series_id=series_id
+            )
+            booking.total_amount = booking.calculate_total_amount(space)
+            bookings.append((booking, entry))
+
+        created = len(bookings)
+        if not created or (on_conflict == 'abort' and created < len(occurrences)):
+            db.session.rollback()
+            for _, entry in bookings:
+                entry['status'] = 'skipped'
+            return {'series_id': None, 'created': 0, 'conflicts': len(occurrences) - created,
+                    'occurrences': report}, 409
+
+        db.session.add_all([booking for booking, _ in bookings])
+        db.session.flush()
+        for booking, entry in bookings:
+            entry['booking_id'] = booking.id
+        body = {'series_id': series_id, 'created': created, 'conflicts': len(occurrences) - created,
+                'occurrences': report}
+        return commit_idempotent(current_user_id, key, request_hash, body, 201)
+
+@bookings_ns.route('/<int:booking_id>')
+class BookingDetail(Resource):
+    @jwt_required()
+    def get(self, booking_id):
+        """Get booking details (client, space owner or admin)"""
+        booking = Booking.query.get_or_404(booking_id)
+        current_user_id = get_jwt_identity()
+        if booking.client_id != current_user_id and booking.space.owner_id != current_user_id:
+            current_user = User.query.get(current_user_id)
+            if current_user.role != UserRole.ADMIN:
+                return {'message': 'Unauthorized'}, 403
+        return booking.to_dict()
@@ -0,0 +1,38 @@
+from flask_restx import Namespace, Resource
+from flask import request, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.models import User
+from app.models.user import UserRole
+from app.utils.cache import cache, make_key, owner_namespace
+from app.utils.dashboard import owner_dashboard, PERIODS
+
+owner_ns = Namespace('owner', description='Space owner operations')
+
+@owner_ns.route('/dashboard')
+class OwnerDashboard(Resource):
+    @jwt_required()
+    @owner_ns.doc(params={
+        'period': 'Revenue grouping: day, week or month (default)',
+        'periods': 'Number of revenue periods (default 6)',
+        'utilization_days': 'Days of history used for utilization (default 30)',
+        'upcoming': 'Upcoming bookings per space (default 5)'
+    })
+    def get(self):
+        """Utilization, upcoming bookings, revenue and rating for each of the owner's spaces"""
+        current_user_id = get_jwt_identity()
+        current_user = User.query.get(current_user_id)
+        if current_user.role not in [UserRole.SPACE_OWNER, UserRole.ADMIN]:
+            return {'message': 'Unauthorized'}, 403
+        period = request.args.get('period', 'month')
+        if period not in PERIODS:
+            return {'message': 'period must be day, week or month'}, 400
+        periods = max(1, min(request.args.get('periods', default=6, type=int), 36))
+        utilization_days = max(1, min(request.args.get('utilization_days', default=30, type=int), 366))
+        upcoming = max(0, min(request.args.get('upcoming', default=5, type=int), 50))
+
+        key = make_key(owner_namespace(current_user_id), 'dashboard', period, periods, utilization_days, upcoming)
+        result = cache.get(key)
+        if result is None:
+            result = owner_dashboard(current_user_id, period, periods, utilization_days, upcoming)
+            cache.set(key, result, timeout=current_app.config.get('OWNER_DASHBOARD_TTL', 300))
+        return result
@@ -0,0 +1,77 @@
+from flask_restx import Namespace, Resource, fields
+from flask import request, current_app
+from datetime import datetime, timedelta
+from app.models import Space
+from app.utils.pricing import quote_many
+
+quotes_ns = Namespace('quotes', description='Price quote operations')
+
+quote_item_model = quotes_ns.model('QuoteItem', {
+    'space_id': fields.Integer(required=True),
+    'start_time': fields.DateTime(required=True, description='ISO 8601 start'),
+    'end_time': fields.DateTime(required=True, description='ISO 8601 end')
+})
+
+quote_request_model = quotes_ns.model('QuoteRequest', {
+    'items': fields.List(fields.Nested(quote_item_model), required=True)
+})
+
+def parse_interval(item):
+    """Return (space_id, start, end) or raise ValueError"""
+    try:
+        space_id = int(item['space_id'])
+        start = datetime.fromisoformat(item['start_time'])
+        end = datetime.fromisoformat(item['end_time'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError('space_id, start_time and end_time are required ISO 8601 values')
+    # Bookings are stored as naive UTC; an offset would also make the comparison below raise TypeError
+    if start.tzinfo is not None or end.tzinfo is not None:
+        raise ValueError('start_time and end_time must not carry a UTC offset')
+    if end <= start:
+        raise ValueError('end_time must be after start_time')
+    # Pricing walks the interval a day or an hour at a time, one step past end at most
+    max_days = current_app.config.get('QUOTE_MAX_DAYS', 366)
+    if end - start > timedelta(days=max_days):
+        raise ValueError(f'An interval may span at most {max_days} days')
+    if end > datetime.max - timedelta(days=1):
+        raise ValueError('end_time is out of range')
+    return space_id, start, end
+
+@quotes_ns.route('/')
+class QuoteList(Resource):
+    @quotes_ns.expect(quote_request_model)
+    def post(self):
+        """Price many candidate intervals across spaces in one call"""
+        data = request.get_json() or {}
+        items = data.get('items')
+        if not isinstance(items, list) or not items:
+            return {'message': 'items must be a non-empty list'}, 400
+        limit = current_app.config.get('QUOTE_BATCH_LIMIT', 500)
+        if len(items) > limit:
+            return {'message': f'At most {limit} items per request'}, 400
+
+        results = [None] * len(items)
+        intervals = []
+        positions = []
+        for index, item in enumerate(items):
+            try:
+                intervals.append(parse_interval(item))
+                positions.append(index)
+            except ValueError as e:
+                results[index] = {'error': str(e)}
+
+        space_ids = {space_id for space_id, _, _ in intervals}
+        spaces = {space.id: space for space in
+                  Space.query.filter_by(is_active=True).filter(Space.id.in_(space_ids)).all()} if space_ids else {}
+
+        priced = []
+        for index, interval in zip(positions, intervals):
+            if interval[0] in spaces:
+                priced.append((index, interval))
+            else:
+                results[index] = {'space_id': interval[0], 'error': 'Space not found'}
+        quotes = quote_many(spaces, [interval for _, interval in priced])
+        for (index, _), result in zip(priced, quotes):
+            results[index] = result
+
+        return {'quotes': results}, 200
@@ -1,12 +1,21 @@
 from flask_restx import Namespace, Resource, fields, reqparse
-from flask import request
+from flask import request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import Space, User
 from app.models.user import UserRole
 from app.models.space import SpaceType, SpaceStatus
+from app.models.pricing import PriceRule, PriceRuleType
+from app.models.occupancy import find_available
 from app.models.base import db
 from app.utils.cloudinary import upload_image
+from app.utils.http_cache import compute_validators, not_modified, validator_headers
+from app.utils.cache import cache, space_details
+from app.utils.search import parse_search_args, search_key, search_spaces
+from app.utils.featured import featured
+from sqlalchemy.orm import selectinload
 from werkzeug.datastructures import FileStorage
+from datetime import datetime
+import math
 
 spaces_ns = Namespace('spaces', description='Space operations')
 
@@ -35,6 +44,29 @@ space_model = spaces_ns.model('Space', {
     'images': fields.List(fields.Nested(image_model))
 })
 
+def apply_amenity_filter(query):
+    """Apply ?amenities=wifi,projector&amenities_match=all|any to a space query"""
+    amenities = request.args.get('amenities')
+    if not amenities:
+        return query, None
+    match = request.args.get('amenities_match', 'all')
+    if match not in ('all', 'any'):
+        return query, ({'message': 'Invalid amenities_match, use all or any'}, 400)
+    return Space.filter_by_amenities(query, amenities.split(','), match_all=match == 'all'), None
+
+price_rule_model = spaces_ns.model('PriceRule', {
+    'id': fields.Integer(readonly=True),
+    'type': fields.String(required=True, description='time_of_day, weekday, season or long_stay'),
+    'multiplier': fields.Float(description='Applied to the hourly/daily rate (time_of_day, weekday, season)'),
+    'discount': fields.Float(description='Fraction taken off the total (long_stay)'),
+    'start_hour': fields.Integer(description='time_of_day start hour, 0-23'),
+    'end_hour': fields.Integer(description='time_of_day end hour (exclusive), 1-24'),
+    'weekdays': fields.List(fields.Integer, description='weekday: 0=Monday .. 6=Sunday'),
+    'start_date': fields.String(description="season start, 'MM-DD'"),
+    'end_date': fields.String(description="season end, 'MM-DD'"),
+    'min_hours': fields.Float(description='long_stay minimum booking length in hours')
+})
+
 image_upload_parser = reqparse.RequestParser()
 image_upload_parser.add_argument('image', type=FileStorage, location='files', required=True, help='Image file')
 image_upload_parser.add_argument('is_primary', type=bool, location='form', required=False, default=False)
@@ -53,10 +85,18 @@ class SpaceList(Resource):
                 query = query.filter(Space.status == SpaceStatus(status))
             except ValueError:
                 return {'message': 'Invalid status filter'}, 400
+        query, error = apply_amenity_filter(query)
+        if error:
+            return error
+
+        etag, last_modified = compute_validators(query, Space.updated_at, page, per_page)
+        cached = not_modified(etag, last_modified)
+        if cached:
+            return cached
 
         pagination = query.paginate(page=page, per_page=per_page, error_out=False)
         spaces = pagination.items
-        return [space.to_dict() for space in spaces]
+        return [space.to_dict() for space in spaces], 200, validator_headers(etag, last_modified)
 
     @jwt_required()
     @spaces_ns.expect(space_model)
@@ -78,15 +118,128 @@ class SpaceList(Resource):
                 data['status'] = SpaceStatus(data['status'])
             except ValueError:
                 return {'message': 'Invalid space status'}, 400
+        amenities = data.pop('amenities', None)
         space = Space(owner_id=current_user_id, **data)
+        space.set_amenities(amenities)
         space.save()
         return {'message': 'Space created successfully'}, 201
 
+@spaces_ns.route('/amenities')
+class SpaceAmenityFacets(Resource):
+    def get(self):
+        """Count active spaces per amenity, optionally narrowed by city, type and amenities"""
+        query = Space.query.filter_by(is_active=True)
+        city = request.args.get('city')
+        if city:
+            query = query.filter_by(city=city)
+        space_type = request.args.get('type')
+        if space_type:
+            try:
+                query = query.filter_by(type=SpaceType(space_type))
+            except ValueError:
+                return {'message': 'Invalid space type'}, 400
+        query, error = apply_amenity_filter(query)
+        if error:
+            return error
+        return {'amenities': Space.amenity_facets(query)}
+
+@spaces_ns.route('/search')
+class SpaceSearch(Resource):
+    @spaces_ns.doc(params={
+        'start': 'ISO 8601 window start',
+        'end': 'ISO 8601 window end',
+        'city': 'City',
+        'type': 'Space type',
+        'min_capacity': 'Minimum capacity',
+        'max_price': 'Maximum price per hour',
+        'amenities': 'Comma separated amenities',
+        'amenities_match': 'all or any'
+    })
+    def get(self):
+        """Find active spaces matching the filters that have no booking in the window"""
+        params, error = parse_search_args(request.args)
+        if error:
+            return error
+        key = search_key(params)
+        result = cache.get(key)
+        if result is None:
+            result = search_spaces(db.session, params)
+            cache.set(key, result, timeout=current_app.config.get('SEARCH_CACHE_TTL', 60))
+        return result, 200, {'Cache-Control': 'no-cache'}
+
+@spaces_ns.route('/availability')
+class SpaceAvailability(Resource):
+    @spaces_ns.doc(params={
+        'space_ids': 'Comma separated space ids',
+        'start': 'ISO 8601 window start',
+        'end': 'ISO 8601 window end'
+    })
+    def get(self):
+        """Split the given spaces into free and occupied for a time window"""
+        try:
+            space_ids = [int(value) for value in request.args.get('space_ids', '').split(',') if value.strip()]
+            start = datetime.fromisoformat(request.args['start'])
+            end = datetime.fromisoformat(request.args['end'])
+        except (KeyError, ValueError):
+            return {'message': 'space_ids, start and end are required'}, 400
+        if not space_ids:
+            return {'message': 'space_ids, start and end are required'}, 400
+        if start.tzinfo is not None or end.tzinfo is not None:
+            return {'message': 'start and end must not carry a UTC offset'}, 400
+        if end <= start:
+            return {'message': 'end must be after start'}, 400
+        limit = current_app.config.get('AVAILABILITY_BATCH_LIMIT', 1000)
+        if len(space_ids) > limit:
+            return {'message': f'At most {limit} space_ids per request'}, 400
+
+        available = set(find_available(space_ids, start, end))
+        return {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'available': [space_id for space_id in space_ids if space_id in available],
+            'unavailable': [space_id for space_id in space_ids if space_id not in available]
+        }, 200, {'Cache-Control': 'no-cache'}
+
+@spaces_ns.route('/featured')
+class FeaturedSpaces(Resource):
+    @spaces_ns.doc(params={
+        'city': 'Rank only the spaces in this city',
+        'limit': 'Number of spaces (default 10)'
+    })
+    def get(self):
+        """Top spaces by rating and recent bookings, read from the precomputed ranking"""
+        city = request.args.get('city')
+        limit = min(max(request.args.get('limit', default=10, type=int), 1),
+                    current_app.config.get('FEATURED_SIZE', 100))
+        ranked = featured(city, limit)
+        spaces = Space.query.options(selectinload(Space.space_images)) \
+            .filter(Space.id.in_([space_id for space_id, _ in ranked])).filter_by(is_active=True)
+        spaces = {space.id: space for space in spaces}
+        return {
+            'city': city,
+            'spaces': [dict(spaces[space_id].to_dict(), score=score) for space_id, score in ranked if space_id in spaces]
+        }
+
+def load_space_detail(space_id):
+    """Serialized space with its validators, or None if it does not exist"""
+    query = Space.query.filter_by(id=space_id)
+    etag, last_modified = compute_validators(query, Space.updated_at)
+    if last_modified is None:
+        return None
+    space = query.first()
+    return {'space': space.to_dict(), 'etag': etag, 'last_modified': last_modified}
+
 @spaces_ns.route('/<int:space_id>')
 class SpaceDetail(Resource):
     def get(self, space_id):
         """Get space details"""
-        return Space.query.get_or_404(space_id)
+        detail = space_details.get(space_id, lambda: load_space_detail(space_id))
+        if detail is None:
+            return {'message': 'Space not found'}, 404
+        cached = not_modified(detail['etag'], detail['last_modified'])
+        if cached:
+            return cached
+        return detail['space'], 200, validator_headers(detail['etag'], detail['last_modified'])
 
     @jwt_required()
     @spaces_ns.expect(space_model)
@@ -107,6 +260,8 @@ class SpaceDetail(Resource):
                 data['status'] = SpaceStatus(data['status'])
             except ValueError:
                 return {'message': 'Invalid space status'}, 400
+        if 'amenities' in data:
+            space.set_amenities(data.pop('amenities'))
         for key, value in data.items():
             setattr(space, key, value)
         space.save()
@@ -114,7 +269,7 @@ class SpaceDetail(Resource):
 
     @jwt_required()
     def delete(self, space_id):
-        """Delete a space"""
+        """Soft-delete a space; it disappears from every listing and is purged later"""
         space = Space.query.get_or_404(space_id)
         current_user_id = get_jwt_identity()
         if space.owner_id != current_user_id:
@@ -122,6 +277,105 @@ class SpaceDetail(Resource):
         space.delete()
         return {'message': 'Space deleted successfully'}
 
+@spaces_ns.route('/<int:space_id>/price-rules')
+class SpacePriceRuleList(Resource):
+    def get(self, space_id):
+        """List the price rules of a space"""
+        Space.query.get_or_404(space_id)
+        rules = PriceRule.query.filter_by(space_id=space_id).order_by(PriceRule.id).all()
+        return [rule.to_dict() for rule in rules]
+
+    @jwt_required()
+    @spaces_ns.expect(price_rule_model)
+    def post(self, space_id):
+        """Add a price rule to a space"""
+        space = Space.query.get_or_404(space_id)
+        current_user_id = get_jwt_identity()
+        if space.owner_id != current_user_id:
+            return {'message': 'Unauthorized'}, 403
+        data = request.get_json() or {}
+        try:
+            rule_type = PriceRuleType(data.get('type'))
+        except ValueError:
+            return {'message': 'Invalid price rule type'}, 400
+        try:
+            numbers = {name: parse_number(data.get(name, default), kind)
+                       for name, (kind, default) in PRICE_RULE_NUMBERS.items()}
+        except ValueError:
+            return {'message': 'multiplier, discount and min_hours must be numbers, start_hour and end_hour whole'}, 400
+        weekdays = data.get('weekdays')
+        if weekdays is not None and not (isinstance(weekdays, list)
+                                         and all(isinstance(day, int) and not isinstance(day, bool) for day in weekdays)):
+            return {'message': 'weekdays must be a list of 0-6'}, 400
+        rule = PriceRule(
+            space_id=space_id,
+            type=rule_type,
+            weekdays=','.join(str(day) for day in weekdays) if weekdays else None,
+            start_date=data.get('start_date'),
+            end_date=data.get('end_date'),
+            **numbers
+        )
+        error = validate_price_rule(rule)
+        if error:
+            return {'message': error}, 400
+        rule.save()
+        return rule.to_dict(), 201
+
+@spaces_ns.route('/<int:space_id>/price-rules/<int:rule_id>')
+class SpacePriceRuleDetail(Resource):
+    @jwt_required()
+    def delete(self, space_id, rule_id):
+        """Remove a price rule from a space"""
+        rule = PriceRule.query.filter_by(id=rule_id, space_id=space_id).first_or_404()
+        current_user_id = get_jwt_identity()
+        if rule.space.owner_id != current_user_id:
+            return {'message': 'Unauthorized'}, 403
+        rule.delete()
+        return {'message': 'Price rule deleted successfully'}
+
+# Numeric price rule fields: (type, default when absent)
+PRICE_RULE_NUMBERS = {
+    'multiplier': (float, 1.0),
+    'discount': (float, None),
+    'start_hour': (int, None),
+    'end_hour': (int, None),
+    'min_hours': (float, None),
+}
+
+def parse_number(value, kind):
+    """value as a finite int or float (numeric strings accepted), None if absent; ValueError otherwise"""
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError('not a number')
+    number = float(value)
+    if not math.isfinite(number) or (kind is int and not number.is_integer()):
+        raise ValueError('not a finite number of the right kind')
+    return kind(number)
+
+def validate_price_rule(rule):
+    """Return an error message for an invalid rule, or None"""
+    if rule.type == PriceRuleType.TIME_OF_DAY:
+        if rule.start_hour is None or rule.end_hour is None:
+            return 'start_hour and end_hour are required'
+        if not (0 <= rule.start_hour <= 23 and 1 <= rule.end_hour <= 24):
+            return 'Hours must be within 0-24'
+    elif rule.type == PriceRuleType.WEEKDAY:
+        if not rule.weekdays or any(int(day) not in range(7) for day in rule.weekdays.split(',')):
+            return 'weekdays must be a list of 0-6'
+    elif rule.type == PriceRuleType.SEASON:
+        try:
+            datetime.strptime('2000-' + rule.start_date, '%Y-%m-%d')
+            datetime.strptime('2000-' + rule.end_date, '%Y-%m-%d')
+        except (TypeError, ValueError):
+            return "start_date and end_date must be 'MM-DD'"
+    elif rule.type == PriceRuleType.LONG_STAY:
+        if rule.min_hours is None or rule.discount is None or not 0 <= rule.discount < 1:
+            return 'min_hours and a discount between 0 and 1 are required'
+    if rule.multiplier is None or rule.multiplier <= 0:
+        return 'multiplier must be positive'
+    return None
+
 @spaces_ns.route('/<int:space_id>/images')
 class SpaceImageList(Resource):
     @jwt_required()
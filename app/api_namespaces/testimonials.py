@@ -1,7 +1,9 @@
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, marshal
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask import request
 from app.models import Testimonial
+from app.utils.streaming import stream_query, wants_ndjson
+from app.utils.http_cache import compute_validators, not_modified, validator_headers
 
 testimonials_ns = Namespace('testimonials', description='Testimonial operations')
 
@@ -10,24 +12,59 @@ testimonial_model = testimonials_ns.model('Testimonial', {
     'user_id': fields.Integer(required=True),
     'space_id': fields.Integer(required=True),
     'rating': fields.Integer(required=True),
-    'comment': fields.String(required=True)
+    'comment': fields.String(required=True),
+    'status': fields.String(readonly=True),
+    'author_first_name': fields.String(readonly=True),
+    'author_last_name': fields.String(readonly=True),
+    'author_profile_picture': fields.String(readonly=True),
+    'created_at': fields.DateTime(readonly=True)
 })
 
 @testimonials_ns.route('/')
 class TestimonialList(Resource):
-    @testimonials_ns.marshal_list_with(testimonial_model)
+    @testimonials_ns.response(200, 'Success', [testimonial_model])
+    @testimonials_ns.doc(params={'space_id': 'Only this space, newest first', 'status': 'pending, approved or rejected'})
     def get(self):
-        """Get all testimonials"""
-        return Testimonial.query.all()
+        """Get all testimonials, streamed as JSON or NDJSON (?format=ndjson)"""
+        query = Testimonial.query
+        space_id = request.args.get('space_id', type=int)
+        status = request.args.get('status')
+        if space_id is not None:
+            query = query.filter(Testimonial.space_id == space_id)
+        if status:
+            query = query.filter(Testimonial.status == status)
+        # ?format=ndjson or the Accept header picks the representation, so it is part of the validators
+        ndjson = wants_ndjson()
+        etag, last_modified = compute_validators(query, Testimonial.updated_at, space_id, status, ndjson)
+        cached = not_modified(etag, last_modified)
+        if cached:
+            cached.vary.add('Accept')
+            return cached
+        if space_id is not None:
+            # Served by ix_testimonials_space_id_status_created_at
+            query = query.order_by(Testimonial.created_at.desc(), Testimonial.id.desc())
+        else:
+            query = query.order_by(Testimonial.id)
+        response = stream_query(query, lambda testimonial: marshal(testimonial, testimonial_model), ndjson=ndjson)
+        response.headers.update(validator_headers(etag, last_modified))
+        response.vary.add('Accept')
+        return response
 
     @jwt_required()
     @testimonials_ns.expect(testimonial_model)
     @testimonials_ns.response(201, 'Testimonial created successfully')
     def post(self):
         """Create a new testimonial"""
-        data = request.get_json()
+        data = request.get_json() or {}
         current_user_id = get_jwt_identity()
-        testimonial = Testimonial(user_id=current_user_id, **data)
+        if data.get('rating') not in range(1, 6):
+            return {'message': 'rating must be an integer from 1 to 5'}, 400
+        testimonial = Testimonial(
+            user_id=current_user_id,
+            space_id=data.get('space_id'),
+            rating=data['rating'],
+            comment=data.get('comment')
+        )
         testimonial.save()
         return {'message': 'Testimonial created successfully'}, 201
 
@@ -0,0 +1,242 @@
+import asyncio
+import importlib.util
+import io
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, request
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from werkzeug.exceptions import RequestEntityTooLarge
+from .models import Space
+from .utils.cache import cache
+from .utils.cloudinary import upload_image
+from .utils.search import parse_search_args, search_key, search_spaces
+
+ASYNC_DRIVERS = {'postgresql': ('asyncpg', 'asyncpg'), 'sqlite': ('aiosqlite', 'aiosqlite')}
+
+
+def async_database_url(url):
+    """The asyncio driver URL for a sync database URL, or None when the driver is not installed"""
+    url = make_url(url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None or importlib.util.find_spec(driver[1]) is None:
+        return None
+    return url.set(drivername=f'{url.get_backend_name()}+{driver[0]}')
+
+
+async def search(session):
+    """GET /api/spaces/search on the event loop"""
+    params, error = parse_search_args(request.args)
+    if error:
+        return error
+    key = search_key(params)
+    result = cache.get(key)
+    if result is None:
+        result = await session.run_sync(search_spaces, params)
+        cache.set(key, result, timeout=current_app.config.get('SEARCH_CACHE_TTL', 60))
+    return result, 200, {'Cache-Control': 'no-cache'}
+
+
+async def add_image(session, space_id):
+    """POST /api/spaces/<id>/images; the Cloudinary upload runs in a thread while the loop serves others"""
+    verify_jwt_in_request()
+    image_file = request.files.get('image')
+    is_primary = bool(request.form.get('is_primary'))
+    if not image_file:
+        return {'message': 'Image file is required'}, 400
+    space = await session.get(Space, space_id)
+    if space is None:
+        return {'message': 'Space not found'}, 404
+    if space.owner_id != get_jwt_identity():
+        return {'message': 'Unauthorized'}, 403
+    image_data = image_file.read()
+    upload_result = await asyncio.get_running_loop().run_in_executor(None, upload_image, image_data)
+    if not upload_result:
+        return {'message': 'Failed to upload image'}, 500
+    image = await session.run_sync(lambda _: space.add_image(image_url=upload_result['url'],
+                                                             public_id=upload_result['public_id'],
+                                                             is_primary=is_primary))
+    await session.commit()
+    return {'message': 'Image added successfully', 'image_id': image.id}, 201
+
+
+async def too_large(session, **kwargs):
+    raise RequestEntityTooLarge()
+
+
+ROUTES = [
+    ('GET', re.compile(r'^/api/spaces/search/?$'), search),
+    ('POST', re.compile(r'^/api/spaces/(?P<space_id>\d+)/images/?$'), add_image),
+]
+
+
+def wsgi_environ(scope, body):
+    """The WSGI environ Flask expects for an ASGI HTTP scope"""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf8').decode('latin1'),
+        'PATH_INFO': scope['path'].encode('utf8').decode('latin1'),
+        'QUERY_STRING': scope['query_string'].decode('latin1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'REMOTE_ADDR': scope['client'][0] if scope.get('client') else '127.0.0.1',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin1')
+        if name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        elif name == 'content-type':
+            key = 'CONTENT_TYPE'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+def response_start(status, headers):
+    return {'type': 'http.response.start', 'status': status,
+            'headers': [(name.lower().encode('latin1'), value.encode('latin1')) for name, value in headers]}
+
+
+async def read_body(receive, limit):
+    body = bytearray()
+    more = True
+    while more:
+        message = await receive()
+        body.extend(message.get('body', b''))
+        more = message.get('more_body', False)
+        if limit is not None and len(body) > limit:
+            raise RequestEntityTooLarge()
+    return bytes(body)
+
+
+class AsyncApp:
+    """ASGI application: async handlers for the I/O-bound endpoints, the Flask app on threads for the rest
+
+    Handlers get an AsyncSession per request and must not touch db.session, whose scope is the
+    thread and so would be shared by every request on the loop.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        config = flask_app.config
+        self.executor = ThreadPoolExecutor(max_workers=config.get('ASGI_WSGI_THREADS', 8),
+                                           thread_name_prefix='wsgi')
+        url = config.get('ASYNC_DATABASE_URI') or async_database_url(config['SQLALCHEMY_DATABASE_URI'])
+        self.engine = None
+        self.sessions = None
+        if url is not None:
+            options = {}
+            if make_url(url).get_backend_name() == 'postgresql':
+                options = {'pool_size': config.get('ASYNC_DB_POOL_SIZE', 10),
+                           'max_overflow': config.get('ASYNC_DB_MAX_OVERFLOW', 10),
+                           'pool_pre_ping': True}
+            self.engine = create_async_engine(url, **options)
+            self.sessions = sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        else:
+            flask_app.logger.warning('No asyncio database driver installed; serving every route through the Flask app')
+
+    def match(self, method, path):
+        if self.sessions is None:
+            return None, None
+        for route_method, pattern, handler in ROUTES:
+            found = pattern.match(path)
+            if found and method == route_method:
+                return handler, {name: int(value) for name, value in found.groupdict().items()}
+        return None, None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] != 'http':
+            return
+        handler, kwargs = self.match(scope['method'], scope['path'])
+        if handler is not None:
+            return await self.dispatch(handler, kwargs, scope, receive, send)
+        return await self.call_wsgi(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.engine is not None:
+                    await self.engine.dispose()
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def dispatch(self, handler, kwargs, scope, receive, send):
+        """Run handler inside a Flask request context so limits, JWT, CORS and caching hooks still apply"""
+        app = self.flask_app
+        try:
+            body = await read_body(receive, app.config.get('MAX_CONTENT_LENGTH'))
+        except RequestEntityTooLarge:
+            body, handler, kwargs = b'', too_large, {}
+        with app.request_context(wsgi_environ(scope, body)):
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    async with self.sessions() as session:
+                        rv = await handler(session, **kwargs)
+                response = app.make_response(rv)
+            except Exception as e:
+                try:
+                    response = app.make_response(app.handle_user_exception(e))
+                except Exception as unhandled:
+                    response = app.make_response(app.handle_exception(unhandled))
+            response = app.process_response(response)
+            await send(response_start(response.status_code, response.headers.items()))
+            await send({'type': 'http.response.body', 'body': response.get_data()})
+
+    async def call_wsgi(self, scope, receive, send):
+        """Serve a request through the Flask app on a worker thread, streaming its body back to the loop"""
+        try:
+            body = await read_body(receive, self.flask_app.config.get('MAX_CONTENT_LENGTH'))
+        except RequestEntityTooLarge as e:
+            await send(response_start(e.code, [('Content-Type', 'text/plain')]))
+            await send({'type': 'http.response.body', 'body': e.description.encode()})
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.run_wsgi, wsgi_environ(scope, body), send, loop)
+
+    def run_wsgi(self, environ, send, loop):
+        pending = []
+
+        def emit(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        def start_response(status, headers, exc_info=None):
+            pending[:] = [response_start(int(status.split(' ', 1)[0]), headers)]
+
+        result = self.flask_app(environ, start_response)
+        try:
+            for chunk in result:
+                if chunk:
+                    if pending:
+                        emit(pending.pop())
+                    emit({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            if pending:
+                emit(pending.pop())
+            emit({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+
+def create_asgi_app(flask_app):
+    return AsyncApp(flask_app)
@@ -1,5 +1,14 @@
 from .base import BaseModel, db
 from .user import User
 from .space import Space, SpaceImage
+from .amenity import Amenity
 from .booking import Booking
-from .testimonial import Testimonial 
\ No newline at end of file
+from .occupancy import SpaceOccupancy
+from .archive import BookingArchive
+from .testimonial import Testimonial
+from .rating import SpaceRating
+from .pricing import PriceRule
+from .idempotency import IdempotencyKey
+from .token import UserToken, TokenPurpose
+from .revocation import TokenRevocation
+from .scheduled_job import ScheduledJob
@@ -0,0 +1,75 @@
+from sqlalchemy import Column, String
+import json
+import re
+from .base import BaseModel, db
+
+space_amenities = db.Table(
+    'space_amenities',
+    db.Column('space_id', db.Integer, db.ForeignKey('spaces.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('amenity_id', db.Integer, db.ForeignKey('amenities.id', ondelete='CASCADE'), primary_key=True),
+    # The primary key serves lookups by space; this one serves filtering by amenity
+    db.Index('ix_space_amenities_amenity_id_space_id', 'amenity_id', 'space_id')
+)
+
+def slugify(name):
+    """Normalize an amenity name into its lookup key ('High-speed WiFi' -> 'high-speed-wifi')"""
+    return re.sub(r'[^a-z0-9]+', '-', name.strip().lower()).strip('-')
+
+def parse_amenities(value):
+    """Accept a list, a JSON list string or a comma-separated string of amenity names"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = value.split(',')
+    if isinstance(value, str):
+        value = [value]
+    names = []
+    seen = set()
+    for name in value:
+        name = str(name).strip()
+        slug = slugify(name)
+        if slug and slug not in seen:
+            seen.add(slug)
+            names.append(name)
+    return names
+
+class Amenity(BaseModel):
+    """Amenity that can be attached to many spaces"""
+    __tablename__ = 'amenities'
+
+    name = Column(String(100), nullable=False)
+    slug = Column(String(100), unique=True, nullable=False)
+
+    @classmethod
+    def get_or_create_many(cls, names):
+        """Return Amenity rows for the given names, creating the missing ones"""
+        by_slug = {slugify(name): name for name in names}
+        if not by_slug:
+            return []
+        existing = {a.slug: a for a in cls.query.filter(cls.slug.in_(list(by_slug))).all()}
+        amenities = []
+        for slug, name in by_slug.items():
+            amenity = existing.get(slug)
+            if amenity is None:
+                amenity = cls(name=name, slug=slug)
+                db.session.add(amenity)
+            amenities.append(amenity)
+        return amenities
+
+    @classmethod
+    def ids_for_slugs(cls, slugs, session=None):
+        """Map slugs to amenity ids with one lookup on the unique slug index"""
+        if not slugs:
+            return []
+        return [row.id for row in (session or db.session).query(cls.id).filter(cls.slug.in_(list(slugs)))]
+
+    def to_dict(self):
+        """Convert amenity object to dictionary"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'slug': self.slug
+        }
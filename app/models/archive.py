@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, Float, DateTime, Enum, Text, Boolean, String, Index
+from datetime import datetime
+from .base import db
+from .booking import BookingStatus
+
+class BookingArchive(db.Model):
+    """Finished bookings moved out of the hot bookings table; ids are kept"""
+    __tablename__ = 'bookings_archive'
+    __table_args__ = (
+        Index('ix_bookings_archive_start_time', 'start_time'),
+        Index('ix_bookings_archive_space_id_start_time', 'space_id', 'start_time'),
+        Index('ix_bookings_archive_client_id_start_time', 'client_id', 'start_time'),
+    )
+
+    # Same columns as bookings, without foreign keys so history outlives deleted spaces and users
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    space_id = Column(Integer, nullable=False)
+    client_id = Column(Integer, nullable=False)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    status = Column(Enum(BookingStatus))
+    total_amount = Column(Float, nullable=False)
+    payment_status = Column(Boolean, default=False)
+    payment_reference = Column(String(100), nullable=True)
+    special_requests = Column(Text, nullable=True)
+    cancellation_reason = Column(Text, nullable=True)
+    series_id = Column(String(36), nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def to_dict(self):
+        """Convert archived booking to the same shape as Booking.to_dict"""
+        return {
+            'id': self.id,
+            'space_id': self.space_id,
+            'client_id': self.client_id,
+            'start_time': self.start_time.isoformat(),
+            'end_time': self.end_time.isoformat(),
+            'status': self.status.value,
+            'total_amount': self.total_amount,
+            'payment_status': self.payment_status,
+            'payment_reference': self.payment_reference,
+            'special_requests': self.special_requests,
+            'cancellation_reason': self.cancellation_reason,
+            'series_id': self.series_id,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat(),
+            'archived_at': self.archived_at.isoformat()
+        }
@@ -1,6 +1,7 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import Column, DateTime, Integer
+from sqlalchemy import Column, DateTime, Integer, event
+from sqlalchemy.orm import Session, with_loader_criteria
 
 db = SQLAlchemy()
 
@@ -9,6 +10,23 @@ def init_db(app):
     with app.app_context():
         db.create_all()
 
+def after_commit(session, callback, key=None):
+    """Run callback once the session's current transaction commits (dropped on rollback)
+
+    Callbacks registered with the same key run only once per transaction.
+    """
+    callbacks = session.info.setdefault('after_commit', {})
+    callbacks.setdefault(key if key is not None else object(), callback)
+
+@event.listens_for(Session, 'after_commit')
+def _run_after_commit(session):
+    for callback in session.info.pop('after_commit', {}).values():
+        callback()
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_commit(session):
+    session.info.pop('after_commit', None)
+
 class BaseModel(db.Model):
     """Base model class that includes common functionality"""
     __abstract__ = True
@@ -30,4 +48,45 @@ class BaseModel(db.Model):
     @classmethod
     def get_by_id(cls, id):
         """Get a model instance by its ID"""
-        return cls.query.get(id) 
\ No newline at end of file
+        return cls.query.get(id) 
+
+class SoftDeleteMixin:
+    """Rows are tombstoned with deleted_at instead of being removed
+
+    ORM queries skip tombstones unless run with execution_options(include_deleted=True).
+    Relationships still reach them, so a booking keeps its deleted space. Old tombstones
+    are hard-deleted in batches by the purge_tombstones job.
+    """
+    deleted_at = Column(DateTime, nullable=True)
+    # Tables whose rows are purged along with a tombstone (their foreign key has no ON DELETE CASCADE)
+    purge_dependents = ()
+
+    @property
+    def is_deleted(self):
+        return self.deleted_at is not None
+
+    def delete(self):
+        """Soft-delete the model instance"""
+        self.deleted_at = datetime.utcnow()
+        db.session.commit()
+
+    def restore(self):
+        """Bring a soft-deleted instance back"""
+        self.deleted_at = None
+        db.session.commit()
+
+    def hard_delete(self):
+        """Remove the row for good"""
+        super().delete()
+
+def exclude_deleted(statement):
+    """Add the tombstone filter the session puts on every ORM query to a statement"""
+    return statement.options(with_loader_criteria(
+        SoftDeleteMixin, lambda cls: cls.deleted_at.is_(None), include_aliases=True, propagate_to_loaders=False
+    ))
+
+@event.listens_for(Session, 'do_orm_execute')
+def _skip_soft_deleted(state):
+    if state.is_select and not state.is_column_load and not state.is_relationship_load \
+            and not state.execution_options.get('include_deleted', False):
+        state.statement = exclude_deleted(state.statement)
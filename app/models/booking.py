@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, DateTime, Enum, ForeignKey, Text, Boolean, String
+from sqlalchemy import Column, Integer, Float, DateTime, Enum, ForeignKey, Text, Boolean, String, Index
 from sqlalchemy.orm import relationship
 import enum
 from .base import BaseModel, db
@@ -9,9 +9,21 @@ class BookingStatus(enum.Enum):
     CANCELLED = "cancelled"
     COMPLETED = "completed"
 
+# Bookings in these states hold their time slot
+ACTIVE_STATUSES = (BookingStatus.PENDING, BookingStatus.CONFIRMED)
+
 class Booking(BaseModel):
     """Booking model for managing space bookings"""
     __tablename__ = 'bookings'
+    __table_args__ = (
+        # Serves overlap checks and the availability anti-join
+        Index('ix_bookings_space_id_start_time_end_time', 'space_id', 'start_time', 'end_time'),
+        # Lifecycle sweeper: past confirmed bookings and stale pending holds
+        Index('ix_bookings_status_end_time', 'status', 'end_time'),
+        Index('ix_bookings_status_created_at', 'status', 'created_at'),
+        # A client's bookings, newest first
+        Index('ix_bookings_client_id_start_time', 'client_id', 'start_time'),
+    )
 
     space_id = Column(Integer, ForeignKey('spaces.id'), nullable=False)
     client_id = Column(Integer, ForeignKey('users.id'), nullable=False)
@@ -23,15 +35,27 @@ class Booking(BaseModel):
     payment_reference = Column(String(100), nullable=True)
     special_requests = Column(Text, nullable=True)
     cancellation_reason = Column(Text, nullable=True)
+    series_id = Column(String(36), nullable=True, index=True)  # shared by the occurrences of a recurring booking
+
+    @classmethod
+    def overlapping(cls, space_id, start_time, end_time, statuses=ACTIVE_STATUSES):
+        """Bookings of a space that overlap [start_time, end_time)"""
+        return cls.query.filter(
+            cls.space_id == space_id,
+            cls.status.in_(statuses),
+            cls.start_time < end_time,
+            cls.end_time > start_time
+        )
+
+    def conflicts(self, statuses=ACTIVE_STATUSES):
+        """Other bookings of the same space that overlap this one"""
+        return Booking.overlapping(self.space_id, self.start_time, self.end_time, statuses) \
+            .filter(Booking.id != self.id)
 
     def calculate_total_amount(self, space):
-        """Calculate the total amount for the booking"""
-        duration_hours = (self.end_time - self.start_time).total_seconds() / 3600
-        if duration_hours <= 24:
-            return duration_hours * space.price_per_hour
-        else:
-            days = duration_hours / 24
-            return days * space.price_per_day
+        """Calculate the total amount for the booking using the space's price rules"""
+        from ..utils.pricing import quote
+        return quote(space, self.start_time, self.end_time)['total_amount']
 
     def to_dict(self):
         """Convert booking object to dictionary"""
@@ -47,6 +71,7 @@ class Booking(BaseModel):
             'payment_reference': self.payment_reference,
             'special_requests': self.special_requests,
             'cancellation_reason': self.cancellation_reason,
+            'series_id': self.series_id,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         } 
\ No newline at end of file
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, UniqueConstraint
+from datetime import datetime, timedelta
+import hashlib
+import json
+from .base import BaseModel
+
+class IdempotencyKey(BaseModel):
+    """Stored result of a request made with an Idempotency-Key header"""
+    __tablename__ = 'idempotency_keys'
+    __table_args__ = (UniqueConstraint('user_id', 'key', name='uq_idempotency_keys_user_id_key'),)
+
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=False)
+    response = Column(Text, nullable=False)  # JSON body returned the first time
+
+    @staticmethod
+    def hash_request(method, path, payload):
+        """Fingerprint a request so a reused key with a different body can be rejected"""
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(f'{method} {path} {canonical}'.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def lookup(cls, user_id, key):
+        """Find the stored result for this user's key"""
+        return cls.query.filter_by(user_id=user_id, key=key).first()
+
+    def is_expired(self, ttl):
+        return self.created_at < datetime.utcnow() - timedelta(seconds=ttl)
+
+    def replay(self):
+        """Return the stored (body, status) pair"""
+        return json.loads(self.response), self.status_code
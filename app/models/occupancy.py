@@ -0,0 +1,175 @@
+from sqlalchemy import Column, Integer, Date, LargeBinary, ForeignKey, event, select, delete, insert
+from sqlalchemy.orm import Session, attributes, object_session
+from datetime import datetime, timedelta, timezone, time as dt_time
+from .base import db
+from .booking import Booking, BookingStatus
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOT_BYTES = SLOTS_PER_DAY // 8
+
+# Bookings in these states take up their slots; completed ones still count towards utilization
+OCCUPYING_STATUSES = (BookingStatus.PENDING, BookingStatus.CONFIRMED, BookingStatus.COMPLETED)
+
+class SpaceOccupancy(db.Model):
+    """One row per space and day: a bitmap with one bit per 15-minute slot (bit 0 = 00:00-00:15)"""
+    __tablename__ = 'space_occupancy'
+
+    space_id = Column(Integer, ForeignKey('spaces.id', ondelete='CASCADE'), primary_key=True)
+    day = Column(Date, primary_key=True)
+    slots = Column(LargeBinary(SLOT_BYTES), nullable=False)
+
+    @property
+    def mask(self):
+        return int.from_bytes(self.slots, 'little')
+
+def _slot_index(moment, round_up=False):
+    minutes = moment.hour * 60 + moment.minute + moment.second / 60 + moment.microsecond / 60_000_000
+    index = int(minutes // SLOT_MINUTES)
+    if round_up and minutes % SLOT_MINUTES:
+        index += 1
+    return index
+
+def _naive_utc(moment):
+    # Bookings are stored as naive UTC; an aware value would make the comparisons below raise TypeError
+    return moment.astimezone(timezone.utc).replace(tzinfo=None) if moment.tzinfo is not None else moment
+
+def day_masks(start, end):
+    """Split [start, end) into {date: slot bitmask}, widening partial slots to whole ones"""
+    start, end = _naive_utc(start), _naive_utc(end)
+    masks = {}
+    day = start.date()
+    while datetime.combine(day, dt_time.min) < end:
+        day_start = datetime.combine(day, dt_time.min)
+        first = _slot_index(start) if start > day_start else 0
+        next_day = day_start + timedelta(days=1)
+        last = _slot_index(end, round_up=True) if end < next_day else SLOTS_PER_DAY
+        if last > first:
+            masks[day] = ((1 << (last - first)) - 1) << first
+        day += timedelta(days=1)
+    return masks
+
+class OccupancyIndex:
+    """Occupancy of many spaces over a date range, one big int bitmap per space"""
+
+    def __init__(self, first_day):
+        self.first_day = first_day
+        self.bitmaps = {}
+
+    def _offset(self, day):
+        return (day - self.first_day).days * SLOTS_PER_DAY
+
+    def add_day(self, space_id, day, mask):
+        self.bitmaps[space_id] = self.bitmaps.get(space_id, 0) | (mask << self._offset(day))
+
+    def add_days(self, space_id, masks):
+        """OR in a whole {day: mask} mapping, assembling the bitmap bytewise"""
+        if not masks:
+            return
+        buffer = bytearray(((max(masks) - self.first_day).days + 1) * SLOT_BYTES)
+        for day, mask in masks.items():
+            offset = (day - self.first_day).days * SLOT_BYTES
+            current = int.from_bytes(buffer[offset:offset + SLOT_BYTES], 'little')
+            buffer[offset:offset + SLOT_BYTES] = (current | mask).to_bytes(SLOT_BYTES, 'little')
+        self.bitmaps[space_id] = self.bitmaps.get(space_id, 0) | int.from_bytes(buffer, 'little')
+
+    def add_interval(self, space_id, start, end):
+        for day, mask in day_masks(start, end).items():
+            self.add_day(space_id, day, mask)
+
+    def window_mask(self, start, end):
+        window = 0
+        for day, mask in day_masks(start, end).items():
+            window |= mask << self._offset(day)
+        return window
+
+    def available(self, space_ids, start, end):
+        """Space ids with no occupied slot in [start, end): one AND per space"""
+        window = self.window_mask(start, end)
+        bitmaps = self.bitmaps
+        return [space_id for space_id in space_ids if not bitmaps.get(space_id, 0) & window]
+
+    def occupied_slots(self, space_id, start, end):
+        return bin(self.bitmaps.get(space_id, 0) & self.window_mask(start, end)).count('1')
+
+def load_index(space_ids, start, end):
+    """Build an OccupancyIndex for the given spaces and window with a single query"""
+    index = OccupancyIndex(start.date())
+    last_day = (end - timedelta(microseconds=1)).date()
+    rows = db.session.query(SpaceOccupancy.space_id, SpaceOccupancy.day, SpaceOccupancy.slots).filter(
+        SpaceOccupancy.space_id.in_(list(space_ids)),
+        SpaceOccupancy.day >= start.date(),
+        SpaceOccupancy.day <= last_day
+    )
+    per_space = {}
+    for space_id, day, slots in rows:
+        per_space.setdefault(space_id, {})[day] = int.from_bytes(slots, 'little')
+    for space_id, masks in per_space.items():
+        index.add_days(space_id, masks)
+    return index
+
+def find_available(space_ids, start, end):
+    """Return the subset of space_ids that are free for the whole window"""
+    space_ids = list(space_ids)
+    if not space_ids:
+        return []
+    return load_index(space_ids, start, end).available(space_ids, start, end)
+
+def rebuild_days(connection, space_id, days):
+    """Recompute the bitmaps of one space for the given days from its bookings"""
+    if not days:
+        return
+    first, last = min(days), max(days)
+    window_start = datetime.combine(first, dt_time.min)
+    window_end = datetime.combine(last + timedelta(days=1), dt_time.min)
+    bookings = Booking.__table__
+    rows = connection.execute(
+        select(bookings.c.start_time, bookings.c.end_time).where(
+            bookings.c.space_id == space_id,
+            bookings.c.status.in_(OCCUPYING_STATUSES),
+            bookings.c.start_time < window_end,
+            bookings.c.end_time > window_start
+        )
+    )
+    masks = dict.fromkeys(days, 0)
+    for start_time, end_time in rows:
+        for day, mask in day_masks(start_time, end_time).items():
+            if day in masks:
+                masks[day] |= mask
+
+    table = SpaceOccupancy.__table__
+    connection.execute(delete(table).where(table.c.space_id == space_id, table.c.day.in_(list(days))))
+    values = [{'space_id': space_id, 'day': day, 'slots': mask.to_bytes(SLOT_BYTES, 'little')}
+              for day, mask in masks.items() if mask]
+    if values:
+        connection.execute(insert(table), values)
+
+def _old_value(target, name):
+    history = attributes.get_history(target, name)
+    return history.deleted[0] if history.deleted else getattr(target, name)
+
+def _mark_dirty(target, space_id, start, end):
+    """Queue days of a space for a rebuild at the end of the flush"""
+    dirty = object_session(target).info.setdefault('occupancy_dirty', {})
+    dirty.setdefault(space_id, set()).update(day_masks(start, end))
+
+@event.listens_for(Booking, 'after_insert')
+@event.listens_for(Booking, 'after_delete')
+def _booking_written(mapper, connection, target):
+    _mark_dirty(target, target.space_id, target.start_time, target.end_time)
+
+@event.listens_for(Booking, 'after_update')
+def _booking_updated(mapper, connection, target):
+    if not any(attributes.get_history(target, name).has_changes()
+               for name in ('status', 'start_time', 'end_time', 'space_id')):
+        return
+    _mark_dirty(target, _old_value(target, 'space_id'), _old_value(target, 'start_time'), _old_value(target, 'end_time'))
+    _mark_dirty(target, target.space_id, target.start_time, target.end_time)
+
+@event.listens_for(Session, 'after_flush')
+def _rebuild_dirty_days(session, flush_context):
+    dirty = session.info.pop('occupancy_dirty', None)
+    if dirty:
+        connection = session.connection()
+        for space_id, days in dirty.items():
+            rebuild_days(connection, space_id, days)
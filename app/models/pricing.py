@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, Float, String, Boolean, ForeignKey, Enum
+import enum
+from .base import BaseModel, db
+
+class PriceRuleType(enum.Enum):
+    TIME_OF_DAY = "time_of_day"
+    WEEKDAY = "weekday"
+    SEASON = "season"
+    LONG_STAY = "long_stay"
+
+class PriceRule(BaseModel):
+    """Per-space pricing rule applied on top of price_per_hour/price_per_day"""
+    __tablename__ = 'price_rules'
+
+    space_id = Column(Integer, ForeignKey('spaces.id', ondelete='CASCADE'), nullable=False, index=True)
+    type = Column(Enum(PriceRuleType), nullable=False)
+    multiplier = Column(Float, nullable=False, default=1.0)
+    discount = Column(Float, nullable=True)  # long_stay: fraction taken off, e.g. 0.15
+    start_hour = Column(Integer, nullable=True)  # time_of_day: [start_hour, end_hour), may wrap midnight
+    end_hour = Column(Integer, nullable=True)
+    weekdays = Column(String(20), nullable=True)  # weekday: comma-separated, 0=Monday .. 6=Sunday
+    start_date = Column(String(5), nullable=True)  # season: 'MM-DD', inclusive, may wrap the year end
+    end_date = Column(String(5), nullable=True)
+    min_hours = Column(Float, nullable=True)  # long_stay: minimum booking length
+    is_active = Column(Boolean, default=True)
+
+    space = db.relationship('Space', backref=db.backref('price_rules', lazy=True, cascade='all, delete-orphan'))
+
+    def to_dict(self):
+        """Convert price rule object to dictionary"""
+        return {
+            'id': self.id,
+            'space_id': self.space_id,
+            'type': self.type.value,
+            'multiplier': self.multiplier,
+            'discount': self.discount,
+            'start_hour': self.start_hour,
+            'end_hour': self.end_hour,
+            'weekdays': [int(day) for day in self.weekdays.split(',')] if self.weekdays else None,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'min_hours': self.min_hours,
+            'is_active': self.is_active,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat()
+        }
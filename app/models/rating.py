@@ -0,0 +1,97 @@
+from sqlalchemy import Column, Integer, ForeignKey, event, update, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import attributes
+from datetime import datetime
+from .base import db
+from .space import Space
+from .testimonial import Testimonial
+
+RATING_VALUES = range(1, 6)
+APPROVED = 'approved'
+
+class SpaceRating(db.Model):
+    """Running rating summary of a space's approved testimonials"""
+    __tablename__ = 'space_ratings'
+
+    space_id = Column(Integer, ForeignKey('spaces.id', ondelete='CASCADE'), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)
+    stars_1 = Column(Integer, nullable=False, default=0)
+    stars_2 = Column(Integer, nullable=False, default=0)
+    stars_3 = Column(Integer, nullable=False, default=0)
+    stars_4 = Column(Integer, nullable=False, default=0)
+    stars_5 = Column(Integer, nullable=False, default=0)
+
+    space = db.relationship('Space', backref=db.backref('rating_summary', uselist=False, lazy='selectin'))
+
+    def to_dict(self):
+        return {
+            'average': round(self.total / self.count, 2) if self.count else None,
+            'count': self.count,
+            'histogram': {str(stars): getattr(self, f'stars_{stars}') for stars in RATING_VALUES}
+        }
+
+EMPTY_RATING = {'average': None, 'count': 0, 'histogram': {str(stars): 0 for stars in RATING_VALUES}}
+
+def _ensure_row(connection, space_id):
+    values = {'space_id': space_id, 'count': 0, 'total': 0, **{f'stars_{stars}': 0 for stars in RATING_VALUES}}
+    table = SpaceRating.__table__
+    if connection.dialect.name == 'postgresql':
+        connection.execute(postgresql.insert(table).values(**values).on_conflict_do_nothing())
+    elif connection.dialect.name == 'sqlite':
+        connection.execute(sqlite.insert(table).values(**values).on_conflict_do_nothing())
+    elif not connection.execute(table.select().where(table.c.space_id == space_id)).first():
+        connection.execute(insert(table).values(**values))
+
+def apply_rating_deltas(connection, space_id, deltas):
+    """Apply {rating: +n/-n} to a space's summary in one UPDATE, touching the space so its ETag changes"""
+    deltas = {rating: delta for rating, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    _ensure_row(connection, space_id)
+    table = SpaceRating.__table__
+    values = {
+        table.c.count: table.c.count + sum(deltas.values()),
+        table.c.total: table.c.total + sum(rating * delta for rating, delta in deltas.items())
+    }
+    for rating, delta in deltas.items():
+        stars = table.c[f'stars_{rating}']
+        values[stars] = stars + delta
+    connection.execute(update(table).where(table.c.space_id == space_id).values(values))
+    spaces = Space.__table__
+    connection.execute(update(spaces).where(spaces.c.id == space_id).values(updated_at=datetime.utcnow()))
+
+def apply_rating_delta(connection, space_id, rating, delta):
+    """Add (delta=1) or remove (delta=-1) one approved rating"""
+    apply_rating_deltas(connection, space_id, {rating: delta})
+
+def contribution(status, space_id, rating):
+    """(space_id, rating) counted by the summary for a testimonial in this state, or None"""
+    return (space_id, rating) if status == APPROVED and rating in RATING_VALUES else None
+
+def _old_value(target, name):
+    history = attributes.get_history(target, name)
+    return history.deleted[0] if history.deleted else getattr(target, name)
+
+@event.listens_for(Testimonial, 'after_insert')
+def _testimonial_inserted(mapper, connection, target):
+    new = contribution(target.status, target.space_id, target.rating)
+    if new:
+        apply_rating_delta(connection, *new, 1)
+
+@event.listens_for(Testimonial, 'after_delete')
+def _testimonial_deleted(mapper, connection, target):
+    old = contribution(*(_old_value(target, name) for name in ('status', 'space_id', 'rating')))
+    if old:
+        apply_rating_delta(connection, *old, -1)
+
+@event.listens_for(Testimonial, 'after_update')
+def _testimonial_updated(mapper, connection, target):
+    old = contribution(*(_old_value(target, name) for name in ('status', 'space_id', 'rating')))
+    new = contribution(target.status, target.space_id, target.rating)
+    if old == new:
+        return
+    if old:
+        apply_rating_delta(connection, *old, -1)
+    if new:
+        apply_rating_delta(connection, *new, 1)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, DateTime, Index
+from .base import BaseModel
+
+class TokenRevocation(BaseModel):
+    """Revocation feed entry shared by every worker when Redis is not configured
+
+    entry is 'jti:<jti>' (one token) or 'user:<id>:<version>' (every older token of the user);
+    created_at orders the feed and the row is dropped once nothing it revokes can still be presented.
+    """
+    __tablename__ = 'token_revocations'
+    __table_args__ = (
+        Index('ix_token_revocations_created_at', 'created_at'),
+        Index('ix_token_revocations_entry', 'entry'),
+        Index('ix_token_revocations_expires_at', 'expires_at'),
+    )
+
+    entry = Column(String(120), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, String, DateTime, select, update, insert
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
+from .base import db
+
+class ScheduledJob(db.Model):
+    """Last run of each scheduler job, shared by every process that runs a scheduler"""
+    __tablename__ = 'scheduled_jobs'
+
+    name = Column(String(100), primary_key=True)
+    last_run_at = Column(DateTime, nullable=False)
+
+    @classmethod
+    def claim(cls, name, interval, now=None):
+        """Record a run of the job unless one was recorded less than interval seconds ago; True if the caller runs it
+
+        A conditional UPDATE (or the first INSERT) decides, so exactly one process wins each interval.
+        Uses its own connection and commits at once, outside the caller's session.
+        """
+        now = now or datetime.utcnow()
+        table = cls.__table__
+        with db.engine.begin() as connection:
+            claimed = connection.execute(
+                update(table).where(table.c.name == name, table.c.last_run_at <= now - timedelta(seconds=interval))
+                .values(last_run_at=now)
+            ).rowcount
+            if claimed:
+                return True
+            if connection.execute(select(table.c.name).where(table.c.name == name)).first() is not None:
+                return False
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(insert(table).values(name=name, last_run_at=now))
+        except IntegrityError:
+            # Another process recorded the first run in the meantime
+            return False
+        return True
@@ -1,7 +1,10 @@
-from sqlalchemy import Column, String, Float, Integer, Boolean, ForeignKey, Text, Enum
+from sqlalchemy import Column, String, Float, Integer, Boolean, ForeignKey, Text, Enum, Index, and_, exists, false, func, select, text
 from sqlalchemy.orm import relationship
 import enum
-from .base import BaseModel, db
+import json
+from .base import BaseModel, SoftDeleteMixin, db
+from .amenity import Amenity, space_amenities, parse_amenities, slugify
+from .booking import Booking, ACTIVE_STATUSES
 from datetime import datetime
 
 class SpaceType(enum.Enum):
@@ -13,14 +16,14 @@ class SpaceType(enum.Enum):
 
 class SpaceStatus(enum.Enum):
     AVAILABLE = "available"
-    BOOKED = "booked"
+    BOOKED = "booked"  # no longer set; availability comes from the occupancy calendar
     MAINTENANCE = "maintenance"
 
 class SpaceImage(db.Model):
     __tablename__ = 'space_images'
     
     id = db.Column(db.Integer, primary_key=True)
-    space_id = db.Column(db.Integer, db.ForeignKey('spaces.id'), nullable=False)
+    space_id = db.Column(db.Integer, db.ForeignKey('spaces.id'), nullable=False, index=True)
     image_url = db.Column(db.String(255), nullable=False)
     public_id = db.Column(db.String(255), nullable=True)
     is_primary = db.Column(db.Boolean, default=False)
@@ -28,9 +31,22 @@ class SpaceImage(db.Model):
     
     space = db.relationship('Space', back_populates='space_images')
 
-class Space(BaseModel):
+class Space(SoftDeleteMixin, BaseModel):
     """Space model for managing spaces in the platform"""
     __tablename__ = 'spaces'
+    __table_args__ = (
+        # Public listings only ever look at live active spaces, so keep the rest out of these indexes
+        Index('ix_spaces_active_city_type_capacity', 'city', 'type', 'capacity',
+              postgresql_where=text('is_active AND deleted_at IS NULL'),
+              sqlite_where=text('is_active = 1 AND deleted_at IS NULL')),
+        Index('ix_spaces_active_price_per_hour_id', 'price_per_hour', 'id',
+              postgresql_where=text('is_active AND deleted_at IS NULL'),
+              sqlite_where=text('is_active = 1 AND deleted_at IS NULL')),
+        Index('ix_spaces_status', 'status'),
+        Index('ix_spaces_deleted_at', 'deleted_at', postgresql_where=text('deleted_at IS NOT NULL'),
+              sqlite_where=text('deleted_at IS NOT NULL')),
+    )
+    purge_dependents = ('space_images',)
 
     name = Column(String(100), nullable=False)
     description = Column(Text, nullable=False)
@@ -75,12 +91,13 @@ class Space(BaseModel):
         }
     amenities = Column(Text, nullable=True)  # JSON string of amenities
     rules = Column(Text, nullable=True)
-    owner_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    owner_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
     is_active = Column(Boolean, default=True)
 
     # Relationships
     bookings = relationship('Booking', backref='space', lazy=True)
     space_images = relationship('SpaceImage', back_populates='space', lazy=True, cascade='all, delete-orphan')
+    amenity_items = relationship('Amenity', secondary=space_amenities, lazy=True, backref='spaces')
 
     def to_dict(self):
         """Convert space object to dictionary"""
@@ -109,9 +126,65 @@ class Space(BaseModel):
                 'id': img.id,
                 'url': img.image_url,
                 'is_primary': img.is_primary
-            } for img in self.space_images]
+            } for img in self.space_images],
+            'rating': self.rating_dict()
         }
 
+    def rating_dict(self):
+        """Rating summary maintained from approved testimonials (see models/rating.py)"""
+        from .rating import EMPTY_RATING
+        summary = self.rating_summary
+        return summary.to_dict() if summary else EMPTY_RATING
+
+    @classmethod
+    def lock(cls, space_id):
+        """Load a space with SELECT ... FOR UPDATE, serializing its booking writes until commit/rollback"""
+        return cls.query.filter_by(id=space_id).with_for_update().populate_existing().first()
+
+    @classmethod
+    def free_between(cls, query, start, end):
+        """Restrict a space query to spaces with no active booking overlapping [start, end)"""
+        busy = exists().where(and_(
+            Booking.space_id == cls.id,
+            Booking.status.in_(ACTIVE_STATUSES),
+            Booking.start_time < end,
+            Booking.end_time > start
+        ))
+        return query.filter(~busy)
+
+    def set_amenities(self, value):
+        """Set amenities from a list or JSON/comma-separated string, keeping both representations in sync"""
+        names = parse_amenities(value)
+        self.amenities = json.dumps(names)
+        self.amenity_items = Amenity.get_or_create_many(names)
+
+    @classmethod
+    def filter_by_amenities(cls, query, names, match_all=True, session=None):
+        """Restrict a space query to spaces that have all (or any) of the given amenities"""
+        slugs = {slugify(name) for name in names} - {''}
+        if not slugs:
+            return query
+        amenity_ids = Amenity.ids_for_slugs(slugs, session=session)
+        if not amenity_ids or (match_all and len(amenity_ids) < len(slugs)):
+            return query.filter(false())
+        links = select(space_amenities.c.space_id).where(space_amenities.c.amenity_id.in_(amenity_ids))
+        if match_all:
+            links = links.group_by(space_amenities.c.space_id).having(func.count() == len(amenity_ids))
+        return query.filter(cls.id.in_(links))
+
+    @classmethod
+    def amenity_facets(cls, query):
+        """Count the spaces matched by a query per amenity, in one grouped query"""
+        matched = query.order_by(None).with_entities(cls.id).subquery()
+        count = func.count(space_amenities.c.space_id)
+        rows = db.session.query(Amenity.slug, Amenity.name, count) \
+            .join(space_amenities, space_amenities.c.amenity_id == Amenity.id) \
+            .filter(space_amenities.c.space_id.in_(select(matched.c.id))) \
+            .group_by(Amenity.id, Amenity.slug, Amenity.name) \
+            .order_by(count.desc(), Amenity.slug) \
+            .all()
+        return [{'slug': slug, 'name': name, 'count': total} for slug, name, total in rows]
+
     def add_image(self, image_url, public_id, is_primary=False):
         """Add an image to the space"""
         # If this is the first image or is_primary is True, set it as primary
@@ -127,7 +200,9 @@ class Space(BaseModel):
             public_id=public_id,
             is_primary=is_primary
         )
-        db.session.add(image)
+        # Cascades into whichever session holds the space (the Flask one or an async request's)
+        self.space_images.append(image)
+        self.updated_at = datetime.utcnow()
         return image
     
     def remove_image(self, image_id):
@@ -138,6 +213,7 @@ class Space(BaseModel):
             # If this was the primary image, set another image as primary
             if image.is_primary and self.space_images:
                 self.space_images[0].is_primary = True
+            self.updated_at = datetime.utcnow()
             return True
         return False
     
@@ -150,5 +226,6 @@ class Space(BaseModel):
                 img.is_primary = False
             # Set new primary image
             image.is_primary = True
+            self.updated_at = datetime.utcnow()
             return True
         return False 
\ No newline at end of file
@@ -1,17 +1,31 @@
-from sqlalchemy import Column, String, Text, ForeignKey, Integer
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, ForeignKey, Integer, Index, event, select, update
+from sqlalchemy.orm import relationship, attributes
+from datetime import datetime
 from .base import BaseModel, db
+from .user import User
+
+AUTHOR_FIELDS = ('first_name', 'last_name', 'profile_picture')
 
 class Testimonial(BaseModel):
     """Testimonial model for user reviews"""
     __tablename__ = 'testimonials'
+    __table_args__ = (
+        Index('ix_testimonials_space_id_status_created_at', 'space_id', 'status', 'created_at'),
+        # Moderation queue keyset: WHERE status = 'pending' AND (created_at, id) > cursor
+        Index('ix_testimonials_status_created_at_id', 'status', 'created_at', 'id'),
+    )
 
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
     space_id = Column(Integer, ForeignKey('spaces.id'), nullable=False)
     rating = Column(Integer, nullable=False)
     comment = Column(Text, nullable=False)
     status = Column(String(20), default='pending')  # pending, approved, rejected
 
+    # Author display fields copied from the user so listing testimonials never loads users
+    author_first_name = Column(String(50), nullable=True)
+    author_last_name = Column(String(50), nullable=True)
+    author_profile_picture = Column(String(255), nullable=True)
+
     # Relationships
     user = relationship('User', backref='testimonials')
     space = relationship('Space', backref='testimonials')
@@ -26,10 +40,31 @@ class Testimonial(BaseModel):
             'comment': self.comment,
             'status': self.status,
             'user': {
-                'first_name': self.user.first_name,
-                'last_name': self.user.last_name,
-                'profile_picture': self.user.profile_picture
+                'first_name': self.author_first_name,
+                'last_name': self.author_last_name,
+                'profile_picture': self.author_profile_picture
             },
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
-        } 
\ No newline at end of file
+        }
+
+@event.listens_for(Testimonial, 'before_insert')
+def _snapshot_author(mapper, connection, target):
+    if target.author_first_name is not None:
+        return
+    users = User.__table__
+    author = connection.execute(
+        select(*[users.c[name] for name in AUTHOR_FIELDS]).where(users.c.id == target.user_id)
+    ).first()
+    if author:
+        for name in AUTHOR_FIELDS:
+            setattr(target, f'author_{name}', author._mapping[name])
+
+@event.listens_for(User, 'after_update')
+def _refresh_author(mapper, connection, target):
+    if not any(attributes.get_history(target, name).has_changes() for name in AUTHOR_FIELDS):
+        return
+    testimonials = Testimonial.__table__
+    values = {f'author_{name}': getattr(target, name) for name in AUTHOR_FIELDS}
+    values['updated_at'] = datetime.utcnow()
+    connection.execute(update(testimonials).where(testimonials.c.user_id == target.id).values(**values))
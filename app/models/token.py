@@ -0,0 +1,64 @@
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Index, update
+from sqlalchemy.orm import relationship
+from datetime import datetime, timedelta
+import enum
+import hashlib
+import secrets
+from .base import BaseModel, db
+
+class TokenPurpose(enum.Enum):
+    VERIFY_EMAIL = "verify_email"
+    RESET_PASSWORD = "reset_password"
+
+class UserToken(BaseModel):
+    """Single-use email verification / password reset token; only its SHA-256 hash is stored"""
+    __tablename__ = 'user_tokens'
+    __table_args__ = (
+        Index('ix_user_tokens_token_hash', 'token_hash', unique=True),
+        Index('ix_user_tokens_user_id_purpose', 'user_id', 'purpose'),
+        Index('ix_user_tokens_expires_at', 'expires_at'),
+    )
+
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    purpose = Column(Enum(TokenPurpose), nullable=False)
+    token_hash = Column(String(64), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    used_at = Column(DateTime, nullable=True)
+
+    user = relationship('User')
+
+    @staticmethod
+    def hash_token(token):
+        # Tokens carry 256 random bits, so a fast hash is enough to make a leaked table useless
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def issue(cls, user, purpose, ttl):
+        """Add a new token for the user, replacing any unused one for the same purpose; return the raw token
+
+        The caller commits (with the user, for a new account).
+        """
+        if user.id is not None:
+            cls.query.filter_by(user_id=user.id, purpose=purpose, used_at=None).delete(synchronize_session=False)
+        token = secrets.token_urlsafe(32)
+        db.session.add(cls(user=user, purpose=purpose, token_hash=cls.hash_token(token),
+                           expires_at=datetime.utcnow() + timedelta(seconds=ttl)))
+        return token
+
+    @classmethod
+    def consume(cls, token, purpose):
+        """Mark a live token used and return its user, or None if it is unknown, expired or already used"""
+        now = datetime.utcnow()
+        row = cls.query.filter_by(token_hash=cls.hash_token(token), purpose=purpose).first()
+        if row is None or row.used_at is not None or row.expires_at <= now:
+            return None
+        # Conditional update so two concurrent requests cannot both spend the same token
+        claimed = db.session.execute(
+            update(cls.__table__)
+            .where(cls.__table__.c.id == row.id, cls.__table__.c.used_at.is_(None))
+            .values(used_at=now, updated_at=now)
+        ).rowcount
+        if not claimed:
+            return None
+        db.session.expire(row, ['used_at', 'updated_at'])
+        return row.user
@@ -1,17 +1,23 @@
 from werkzeug.security import generate_password_hash, check_password_hash
-from sqlalchemy import Column, String, Boolean, Enum, ForeignKey
+from sqlalchemy import Column, String, Boolean, Integer, Enum, ForeignKey, Index, text, true
 from sqlalchemy.orm import relationship
 import enum
-from .base import BaseModel, db
+from .base import BaseModel, SoftDeleteMixin, db
 
 class UserRole(enum.Enum):
     ADMIN = "admin"
     SPACE_OWNER = "space_owner"
     CLIENT = "client"
 
-class User(BaseModel):
+class User(SoftDeleteMixin, BaseModel):
     """User model for authentication and authorization"""
     __tablename__ = 'users'
+    __table_args__ = (
+        # Admin filters look at live accounts; soft-deleted ones are only listed for restore/purge
+        Index('ix_users_active_role', 'role', postgresql_where=text('is_active'), sqlite_where=text('is_active = 1')),
+        Index('ix_users_deleted_at', 'deleted_at', postgresql_where=text('deleted_at IS NOT NULL'),
+              sqlite_where=text('deleted_at IS NOT NULL')),
+    )
 
     email = Column(String(120), unique=True, nullable=False)
     password_hash = Column(String(128), nullable=False)
@@ -19,9 +25,10 @@ class User(BaseModel):
     last_name = Column(String(50), nullable=False)
     role = Column(Enum(UserRole), nullable=False)
     is_verified = Column(Boolean, default=False)
-    verification_token = Column(String(100), nullable=True)
     profile_picture = Column(String(255), nullable=True)
     phone_number = Column(String(20), nullable=True)
+    token_version = Column(Integer, nullable=False, default=0, server_default='0')  # bumped to log out everywhere
+    is_active = Column(Boolean, nullable=False, default=True, server_default=true())  # false: cannot log in
 
     # Relationships
     spaces = relationship('Space', backref='owner', lazy=True)
@@ -42,6 +49,18 @@ class User(BaseModel):
         """Check if the provided password matches the hash"""
         return check_password_hash(self.password_hash, password)
 
+    def delete(self):
+        """Soft-delete the account the way the admin bulk action does: deactivate it and sign it out everywhere"""
+        from ..utils.accounts import bulk_update_users
+        bulk_update_users([self.id], 'soft_delete')
+        db.session.commit()
+
+    def restore(self):
+        """Bring a soft-deleted account back and let it log in again"""
+        from ..utils.accounts import bulk_update_users
+        bulk_update_users([self.id], 'restore')
+        db.session.commit()
+
     def to_dict(self):
         """Convert user object to dictionary"""
         return {
@@ -53,6 +72,8 @@ class User(BaseModel):
             'is_verified': self.is_verified,
             'profile_picture': self.profile_picture,
             'phone_number': self.phone_number,
+            'is_active': self.is_active,
+            'deleted_at': self.deleted_at.isoformat() if self.deleted_at else None,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         } 
\ No newline at end of file
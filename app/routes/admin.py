@@ -5,8 +5,9 @@ from ..models.space import Space
 from ..models.booking import Booking, BookingStatus
 from ..models.testimonial import Testimonial
 from ..utils.auth import require_role
+from ..utils.accounts import bulk_update_users
+from ..utils.dashboard import platform_stats
 from ..models.base import db
-from datetime import datetime, timedelta
 import json
 
 admin_bp = Blueprint('admin', __name__)
@@ -79,13 +80,14 @@ def update_user(user_id):
 @jwt_required()
 @require_role('admin')
 def delete_user(user_id):
-    """Delete a user"""
-    user = User.get_by_id(user_id)
-    if not user:
+    """Soft-delete a user"""
+    result = bulk_update_users([user_id], 'soft_delete', actor_id=get_jwt_identity())
+    if result['not_found']:
         return jsonify({'message': 'User not found'}), 404
+    if result['skipped']:
+        return jsonify({'message': 'You cannot delete your own account'}), 400
     
-    user.is_active = False
-    user.save()
+    db.session.commit()
     return jsonify({'message': 'User deleted successfully'}), 200
 
 # Space Management
@@ -188,11 +190,17 @@ def update_booking(booking_id):
     data = request.get_json()
     if 'status' in data:
         try:
-            booking.status = BookingStatus(data['status'])
-            booking.save()
-            return jsonify(booking.to_dict()), 200
+            status = BookingStatus(data['status'])
         except ValueError:
             return jsonify({'message': 'Invalid status'}), 400
+        if status == BookingStatus.CONFIRMED:
+            Space.lock(booking.space_id)
+            if booking.conflicts(statuses=(BookingStatus.CONFIRMED,)).first():
+                db.session.rollback()
+                return jsonify({'message': 'Another confirmed booking overlaps this time slot'}), 409
+        booking.status = status
+        booking.save()
+        return jsonify(booking.to_dict()), 200
     
     return jsonify({'message': 'No status provided'}), 400
 
@@ -243,24 +251,4 @@ def update_testimonial(testimonial_id):
 @require_role('admin')
 def get_stats():
     """Get platform statistics"""
-    total_users = User.query.count()
-    total_spaces = Space.query.count()
-    total_bookings = Booking.query.count()
-    active_bookings = Booking.query.filter_by(status=BookingStatus.CONFIRMED).count()
-    
-    # Calculate revenue for the last 30 days
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    recent_bookings = Booking.query.filter(
-        Booking.created_at >= thirty_days_ago,
-        Booking.status == BookingStatus.CONFIRMED
-    ).all()
-    
-    total_revenue = sum(booking.total_amount for booking in recent_bookings)
-    
-    return jsonify({
-        'total_users': total_users,
-        'total_spaces': total_spaces,
-        'total_bookings': total_bookings,
-        'active_bookings': active_bookings,
-        'revenue_last_30_days': total_revenue
-    }), 200 
\ No newline at end of file
+    return jsonify(platform_stats()), 200 
\ No newline at end of file
@@ -1,7 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app.models.booking import Booking, BookingStatus
-from app.models.space import Space, SpaceStatus
+from app.models.space import Space
 from app.models.user import User, UserRole
 from app.utils.auth import require_role
 from app.models.base import db
@@ -58,13 +58,15 @@ def update_booking(booking_id):
     if not booking:
         return jsonify({'error': 'Booking not found'}), 404
 
-    booking.status = status_enum
-
-    # Update space status accordingly
     if status_enum == BookingStatus.CONFIRMED:
-        booking.space.status = SpaceStatus.BOOKED
-    elif status_enum in [BookingStatus.CANCELLED, BookingStatus.COMPLETED]:
-        booking.space.status = SpaceStatus.AVAILABLE
+        # Serialize confirmations per space so two overlapping bookings can't both be confirmed
+        Space.lock(booking.space_id)
+        if booking.conflicts(statuses=(BookingStatus.CONFIRMED,)).first():
+            db.session.rollback()
+            return jsonify({'error': 'Another confirmed booking overlaps this time slot'}), 409
+
+    # The space's occupancy calendar follows the status change (see models/occupancy.py)
+    booking.status = status_enum
 
     try:
         db.session.commit()
@@ -1,9 +1,11 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token, create_refresh_token
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity, create_access_token, create_refresh_token
 from werkzeug.security import generate_password_hash
 from ..models.user import User, UserRole
-from ..utils.auth import generate_verification_token, verify_token
+from ..models.token import UserToken, TokenPurpose
+from ..utils.tokens import issue_token
 from ..utils.email import send_verification_email
+from ..utils.revocation import revoke_token, revoke_all_tokens, token_claims
 from ..models.base import db
 import json
 
@@ -38,9 +40,8 @@ def register():
         role=role
     )
     
-    # Generate verification token
-    verification_token = generate_verification_token()
-    user.verification_token = verification_token
+    # Generate verification token (saved with the user)
+    verification_token = issue_token(user, TokenPurpose.VERIFY_EMAIL)
     
     # Save user
     user.save()
@@ -59,12 +60,11 @@ def verify_email():
     if not token:
         return jsonify({'message': 'Token is required'}), 400
     
-    user = User.query.filter_by(verification_token=token).first()
+    user = UserToken.consume(token, TokenPurpose.VERIFY_EMAIL)
     if not user:
         return jsonify({'message': 'Invalid or expired token'}), 400
     
     user.is_verified = True
-    user.verification_token = None
     user.save()
     
     return jsonify({'message': 'Email verified successfully'}), 200
@@ -83,11 +83,14 @@ def login():
     if not user or not user.check_password(password):
         return jsonify({'message': 'Invalid email or password'}), 401
     
+    if not user.is_active:
+        return jsonify({'message': 'Account is deactivated'}), 403
+    
     if not user.is_verified:
         return jsonify({'message': 'Please verify your email first'}), 403
     
-    access_token = create_access_token(identity=user.id)
-    refresh_token = create_refresh_token(identity=user.id)
+    access_token = create_access_token(identity=user.id, additional_claims=token_claims(user))
+    refresh_token = create_refresh_token(identity=user.id, additional_claims=token_claims(user))
     
     return jsonify({
         'access_token': access_token,
@@ -100,7 +103,8 @@ def login():
 def refresh():
     """Refresh access token"""
     current_user_id = get_jwt_identity()
-    access_token = create_access_token(identity=current_user_id)
+    # Carry the refresh token's version over so logging out everywhere also covers refreshed tokens
+    access_token = create_access_token(identity=current_user_id, additional_claims={'ver': get_jwt().get('ver', 0)})
     return jsonify({'access_token': access_token}), 200
 
 @auth_bp.route('/me', methods=['GET'])
@@ -115,8 +119,7 @@ def get_current_user():
 @jwt_required()
 def logout():
     """Logout user"""
-    # In a stateless JWT system, we don't need to do anything on the server side
-    # The client should remove the tokens from local storage
+    revoke_token(get_jwt())
     return jsonify({'message': 'Successfully logged out'}), 200
 
 @auth_bp.route('/reset-password', methods=['POST'])
@@ -132,9 +135,8 @@ def reset_password():
     if not user:
         return jsonify({'message': 'User not found'}), 404
     
-    reset_token = generate_verification_token()
-    user.verification_token = reset_token
-    user.save()
+    reset_token = issue_token(user, TokenPurpose.RESET_PASSWORD)
+    db.session.commit()
     
     # Send password reset email
     send_verification_email(user, reset_token)
@@ -151,12 +153,12 @@ def update_password():
     if not token or not new_password:
         return jsonify({'message': 'Token and new password are required'}), 400
     
-    user = User.query.filter_by(verification_token=token).first()
+    user = UserToken.consume(token, TokenPurpose.RESET_PASSWORD)
     if not user:
         return jsonify({'message': 'Invalid or expired token'}), 400
     
     user.set_password(new_password)
-    user.verification_token = None
-    user.save()
+    # A password reset also signs out every existing session
+    revoke_all_tokens(user)
     
     return jsonify({'message': 'Password updated successfully'}), 200 
\ No newline at end of file
@@ -2,7 +2,8 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token, create_refresh_token
 from werkzeug.security import generate_password_hash
 from ..models.user import User, UserRole
-from ..utils.auth import generate_verification_token, verify_token
+from ..models.token import UserToken, TokenPurpose
+from ..utils.tokens import issue_token
 from ..utils.email import send_verification_email
 from ..models.base import db
 import json
@@ -38,9 +39,8 @@ def register():
         role=role
     )
     
-    # Generate verification token
-    verification_token = generate_verification_token()
-    user.verification_token = verification_token
+    # Generate verification token (saved with the user)
+    verification_token = issue_token(user, TokenPurpose.VERIFY_EMAIL)
     
     # Save user
     user.save()
@@ -59,12 +59,11 @@ def verify_email():
     if not token:
         return jsonify({'message': 'Token is required'}), 400
     
-    user = User.query.filter_by(verification_token=token).first()
+    user = UserToken.consume(token, TokenPurpose.VERIFY_EMAIL)
     if not user:
         return jsonify({'message': 'Invalid or expired token'}), 400
     
     user.is_verified = True
-    user.verification_token = None
     user.save()
     
     return jsonify({'message': 'Email verified successfully'}), 200
@@ -83,6 +82,9 @@ def login():
     if not user or not user.check_password(password):
         return jsonify({'message': 'Invalid email or password'}), 401
     
+    if not user.is_active:
+        return jsonify({'message': 'Account is deactivated'}), 403
+    
     if not user.is_verified:
         return jsonify({'message': 'Please verify your email first'}), 403
     
@@ -132,9 +134,8 @@ def reset_password():
     if not user:
         return jsonify({'message': 'User not found'}), 404
     
-    reset_token = generate_verification_token()
-    user.verification_token = reset_token
-    user.save()
+    reset_token = issue_token(user, TokenPurpose.RESET_PASSWORD)
+    db.session.commit()
     
     # Send password reset email
     send_verification_email(user, reset_token)
@@ -151,12 +152,11 @@ def update_password():
     if not token or not new_password:
         return jsonify({'message': 'Token and new password are required'}), 400
     
-    user = User.query.filter_by(verification_token=token).first()
+    user = UserToken.consume(token, TokenPurpose.RESET_PASSWORD)
     if not user:
         return jsonify({'message': 'Invalid or expired token'}), 400
     
     user.set_password(new_password)
-    user.verification_token = None
     user.save()
     
     return jsonify({'message': 'Password updated successfully'}), 200 
\ No newline at end of file
@@ -49,12 +49,6 @@ def create_space():
         except ValueError:
             return jsonify({'error': 'Invalid space type'}), 400
 
-        import json
-        # Convert amenities to JSON string if it's a list or dict
-        amenities = data.get('amenities')
-        if amenities and not isinstance(amenities, str):
-            amenities = json.dumps(amenities)
-
         space = Space(
             name=data['name'],
             description=data['description'],
@@ -69,9 +63,9 @@ def create_space():
             price_per_day=float(data['price_per_day']),
             owner_id=current_user_id,
             status=SpaceStatus.AVAILABLE,
-            is_active=True,
-            amenities=amenities
+            is_active=True
         )
+        space.set_amenities(data.get('amenities'))
         db.session.add(space)
         db.session.flush()
 
@@ -140,6 +134,9 @@ def update_space(space_id):
             except ValueError:
                 return jsonify({'error': 'Invalid space type'}), 400
 
+        if 'amenities' in data:
+            space.set_amenities(data['amenities'])
+
         # Handle new images from files
         for image in new_images:
             result = upload_image(image)
@@ -185,9 +182,7 @@ def delete_space(space_id):
         if space.owner_id != current_user_id:
             return jsonify({'error': 'Unauthorized'}), 403
 
-        # Soft delete
-        space.is_active = False
-        db.session.commit()
+        space.delete()
         return jsonify({'message': 'Space deleted successfully'}), 200
     except Exception as e:
         db.session.rollback()
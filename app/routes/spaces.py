@@ -4,6 +4,7 @@ from ..models.space import Space, SpaceType, SpaceStatus
 from ..models.user import User, UserRole
 from ..utils.cloudinary import upload_image, delete_image
 from ..utils.auth import require_role
+from ..utils.http_cache import compute_validators, not_modified, validator_headers
 from ..models.base import db
 import json
 
@@ -16,6 +17,8 @@ def list_spaces():
     per_page = request.args.get('per_page', 10, type=int)
     space_type = request.args.get('type')
     city = request.args.get('city')
+    amenities = request.args.get('amenities')
+    amenities_match = request.args.get('amenities_match', 'all')
     
     query = Space.query.filter_by(is_active=True)
     
@@ -29,23 +32,42 @@ def list_spaces():
     if city:
         query = query.filter_by(city=city)
     
+    if amenities:
+        if amenities_match not in ('all', 'any'):
+            return jsonify({'message': 'Invalid amenities_match, use all or any'}), 400
+        query = Space.filter_by_amenities(query, amenities.split(','), match_all=amenities_match == 'all')
+    
+    etag, last_modified = compute_validators(query, Space.updated_at, page, per_page)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+    
     spaces = query.paginate(page=page, per_page=per_page)
     
-    return jsonify({
+    result = {
         'spaces': [space.to_dict() for space in spaces.items],
         'total': spaces.total,
         'pages': spaces.pages,
         'current_page': spaces.page
-    }), 200
+    }
+    if request.args.get('facets', 'false').lower() == 'true':
+        result['amenity_facets'] = Space.amenity_facets(query)
+    
+    return jsonify(result), 200, validator_headers(etag, last_modified)
 
 @spaces_bp.route('/<int:space_id>', methods=['GET'])
 def get_space_by_id(space_id):
     """Get a specific space by ID"""
-    space = Space.get_by_id(space_id)
-    if not space or not space.is_active:
+    query = Space.query.filter_by(id=space_id, is_active=True)
+    etag, last_modified = compute_validators(query, Space.updated_at)
+    if last_modified is None:
         return jsonify({'message': 'Space not found'}), 404
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
     
-    return jsonify(space.to_dict()), 200
+    space = query.first()
+    return jsonify(space.to_dict()), 200, validator_headers(etag, last_modified)
 
 @spaces_bp.route('/', methods=['POST'])
 @jwt_required()
@@ -90,10 +112,10 @@ def create_new_space():
         price_per_hour=float(data['price_per_hour']),
         price_per_day=float(data['price_per_day']),
         images=json.dumps(images),
-        amenities=data.get('amenities', '[]'),
         rules=data.get('rules', ''),
         owner_id=current_user_id
     )
+    space.set_amenities(data.get('amenities', '[]'))
     
     space.save()
     
@@ -118,10 +140,13 @@ def update_space_by_id(space_id):
     # Update fields
     for field in ['name', 'description', 'address', 'city', 'state', 
                  'country', 'postal_code', 'capacity', 'price_per_hour', 
-                 'price_per_day', 'amenities', 'rules']:
+                 'price_per_day', 'rules']:
         if field in data:
             setattr(space, field, data[field])
     
+    if 'amenities' in data:
+        space.set_amenities(data['amenities'])
+    
     # Handle space type
     if 'type' in data:
         try:
@@ -156,7 +181,6 @@ def delete_space_by_id(space_id):
     if space.owner_id != current_user_id:
         return jsonify({'message': 'Unauthorized'}), 403
     
-    space.is_active = False
-    space.save()
+    space.delete()
     
     return jsonify({'message': 'Space deleted successfully'}), 200 
\ No newline at end of file
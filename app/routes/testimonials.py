@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..models.testimonial import Testimonial
 from ..models.user import User
 from ..utils.auth import require_role
+from ..utils.http_cache import compute_validators, not_modified, validator_headers
 from ..models.base import db
 
 testimonials_bp = Blueprint('testimonials', __name__)
@@ -18,6 +19,11 @@ def get_testimonials():
     if space_id:
         query = query.filter_by(space_id=space_id)
     
+    etag, last_modified = compute_validators(query, Testimonial.updated_at, page, per_page)
+    cached = not_modified(etag, last_modified)
+    if cached:
+        return cached
+    
     testimonials = query.paginate(page=page, per_page=per_page)
     
     return jsonify({
@@ -25,7 +31,7 @@ def get_testimonials():
         'total': testimonials.total,
         'pages': testimonials.pages,
         'current_page': testimonials.page
-    }), 200
+    }), 200, validator_headers(etag, last_modified)
 
 @testimonials_bp.route('/', methods=['POST'])
 @jwt_required()
@@ -0,0 +1,63 @@
+from datetime import datetime
+from sqlalchemy import select, update
+from ..models.base import db, after_commit
+from ..models.user import User
+from .revocation import revocations
+
+USER_ACTIONS = ('set_role', 'verify', 'soft_delete', 'restore')
+# Actions an admin may not apply to their own account
+SELF_ACTIONS = ('set_role', 'soft_delete')
+
+
+def _changes(action, row, role):
+    """Whether the action would change this user"""
+    if action == 'set_role':
+        return row.role != role
+    if action == 'verify':
+        return not row.is_verified
+    if action == 'soft_delete':
+        return row.deleted_at is None
+    return row.deleted_at is not None or not row.is_active
+
+
+def bulk_update_users(ids, action, role=None, actor_id=None):
+    """Apply one admin action to many users with a single UPDATE; the caller commits
+
+    Soft-deleted users are deactivated and signed out everywhere. Returns
+    {'updated': [...], 'unchanged': [...], 'skipped': [...], 'not_found': [...]}.
+    """
+    table = User.__table__
+    ids = sorted(set(ids))
+    rows = db.session.execute(
+        select(table.c.id, table.c.role, table.c.is_verified, table.c.is_active, table.c.deleted_at,
+               table.c.token_version)
+        .where(table.c.id.in_(ids)).with_for_update()
+    ).fetchall()
+    found = {row.id for row in rows}
+    skipped = [row.id for row in rows if row.id == actor_id and action in SELF_ACTIONS]
+    changed = [row for row in rows if row.id not in skipped and _changes(action, row, role)]
+
+    now = datetime.utcnow()
+    values = {
+        'set_role': {'role': role},
+        'verify': {'is_verified': True},
+        'soft_delete': {'is_active': False, 'deleted_at': now, 'token_version': table.c.token_version + 1},
+        'restore': {'is_active': True, 'deleted_at': None},
+    }[action]
+    if changed:
+        db.session.execute(
+            update(table).where(table.c.id.in_([row.id for row in changed])).values(updated_at=now, **values)
+        )
+    if changed and action == 'soft_delete':
+        versions = {row.id: (row.token_version or 0) + 1 for row in changed}
+
+        def sign_out():
+            for user_id, version in versions.items():
+                revocations().revoke_user(user_id, version)
+        after_commit(db.session(), sign_out)
+    return {
+        'updated': [row.id for row in changed],
+        'unchanged': sorted(found - {row.id for row in changed} - set(skipped)),
+        'skipped': skipped,
+        'not_found': [user_id for user_id in ids if user_id not in found]
+    }
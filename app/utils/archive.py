@@ -0,0 +1,73 @@
+import logging
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import select, insert, delete, literal
+from ..models.base import db
+from ..models.booking import Booking, BookingStatus
+from ..models.archive import BookingArchive
+from .scheduler import scheduler
+
+logger = logging.getLogger(__name__)
+
+# Only bookings that can no longer change are moved
+ARCHIVABLE_STATUSES = (BookingStatus.COMPLETED, BookingStatus.CANCELLED)
+
+
+def _archive_batch(cutoff, now, batch_size):
+    """Move one batch of finished bookings that ended before cutoff; return how many moved"""
+    bookings = Booking.__table__
+    archive = BookingArchive.__table__
+    names = [column.name for column in bookings.columns]
+    candidates = select(bookings.c.id).where(
+        bookings.c.status.in_(ARCHIVABLE_STATUSES),
+        bookings.c.end_time < cutoff
+    ).order_by(bookings.c.id).limit(batch_size)
+
+    if db.engine.dialect.name == 'postgresql':
+        # WITH moved AS (DELETE ... RETURNING *) INSERT INTO bookings_archive SELECT ... FROM moved
+        moved = delete(bookings).where(bookings.c.id.in_(candidates.with_for_update(skip_locked=True))) \
+            .returning(*bookings.columns).cte('moved')
+        statement = insert(archive).from_select(
+            names + ['archived_at'],
+            select(*[moved.c[name] for name in names], literal(now, archive.c.archived_at.type))
+        )
+        return db.session.execute(statement).rowcount
+
+    ids = db.session.execute(candidates).scalars().all()
+    if ids:
+        db.session.execute(insert(archive).from_select(
+            names + ['archived_at'],
+            select(*bookings.columns, literal(now, archive.c.archived_at.type)).where(bookings.c.id.in_(ids))
+        ))
+        db.session.execute(delete(bookings).where(bookings.c.id.in_(ids)))
+    return len(ids)
+
+
+def archive_bookings(now=None, after_days=None, batch_size=None):
+    """Move finished bookings older than BOOKING_ARCHIVE_AFTER_DAYS into bookings_archive"""
+    now = now or datetime.utcnow()
+    after_days = after_days if after_days is not None else current_app.config.get('BOOKING_ARCHIVE_AFTER_DAYS', 180)
+    batch_size = batch_size or current_app.config.get('BOOKING_ARCHIVE_BATCH_SIZE', 1000)
+    cutoff = now - timedelta(days=after_days)
+    moved = 0
+    while True:
+        count = _archive_batch(cutoff, now, batch_size)
+        db.session.commit()
+        moved += count
+        if count < batch_size:
+            break
+    if moved:
+        logger.info('Archived %s bookings that ended before %s', moved, cutoff.isoformat())
+    return moved
+
+
+scheduler.add_job('archive_bookings', archive_bookings, 'BOOKING_ARCHIVE_INTERVAL', 3600)
+
+
+@click.command('archive-bookings')
+@with_appcontext
+def archive_bookings_command():
+    """Move old completed and cancelled bookings into bookings_archive now."""
+    click.echo(f'{archive_bookings()} bookings archived')
@@ -0,0 +1,272 @@
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from flask import current_app
+from flask_caching import Cache
+from sqlalchemy import event, select
+from sqlalchemy.orm import object_session
+from ..models.base import after_commit
+from ..models.booking import Booking
+from ..models.space import Space, SpaceImage
+from ..models.testimonial import Testimonial
+
+# Backed by Redis when REDIS_URL is set so every worker sees the same entries
+cache = Cache()
+
+def redis_client(app=None):
+    """A Redis client on REDIS_URL shared by the app, for data structures Flask-Caching lacks; None without Redis"""
+    app = app or current_app
+    if 'redis' not in app.extensions:
+        url = app.config.get('REDIS_URL')
+        if url:
+            import redis
+            app.extensions['redis'] = redis.Redis.from_url(url)
+        else:
+            app.extensions['redis'] = None
+    return app.extensions['redis']
+
+def generation(namespace):
+    """Current generation token of a cache namespace; bumping it orphans every older entry"""
+    key = f'generation:{namespace}'
+    token = cache.get(key)
+    if token is None:
+        token = uuid.uuid4().hex
+        cache.add(key, token, timeout=0)
+        token = cache.get(key) or token
+    return token
+
+def bump_generation(namespace):
+    cache.set(f'generation:{namespace}', uuid.uuid4().hex, timeout=0)
+
+def make_key(namespace, *parts):
+    """Cache key scoped to the namespace's current generation"""
+    digest = hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    return f'{namespace}:{generation(namespace)}:{digest}'
+
+@event.listens_for(Booking, 'after_insert')
+@event.listens_for(Booking, 'after_update')
+@event.listens_for(Booking, 'after_delete')
+@event.listens_for(Space, 'after_insert')
+@event.listens_for(Space, 'after_update')
+@event.listens_for(Space, 'after_delete')
+@event.listens_for(Testimonial, 'after_insert')
+@event.listens_for(Testimonial, 'after_update')
+@event.listens_for(Testimonial, 'after_delete')
+def _invalidate_search(mapper, connection, target):
+    after_commit(object_session(target), lambda: bump_generation('search'), key='bump:search')
+
+def owner_namespace(owner_id):
+    return f'owner:{owner_id}'
+
+def _owner_of(session, connection, space_id):
+    """Owner id of a space, remembered for the rest of the transaction"""
+    owners = session.info.setdefault('space_owners', {})
+    if space_id not in owners:
+        spaces = Space.__table__
+        owners[space_id] = connection.execute(select(spaces.c.owner_id).where(spaces.c.id == space_id)).scalar()
+    return owners[space_id]
+
+def _bump_owner(session, owner_id):
+    if owner_id is not None:
+        namespace = owner_namespace(owner_id)
+        after_commit(session, lambda: bump_generation(namespace), key=f'bump:{namespace}')
+
+@event.listens_for(Booking, 'after_insert')
+@event.listens_for(Booking, 'after_update')
+@event.listens_for(Booking, 'after_delete')
+@event.listens_for(Testimonial, 'after_insert')
+@event.listens_for(Testimonial, 'after_update')
+@event.listens_for(Testimonial, 'after_delete')
+def _invalidate_owner_by_space(mapper, connection, target):
+    session = object_session(target)
+    _bump_owner(session, _owner_of(session, connection, target.space_id))
+
+@event.listens_for(Space, 'after_insert')
+@event.listens_for(Space, 'after_update')
+@event.listens_for(Space, 'after_delete')
+def _invalidate_owner(mapper, connection, target):
+    _bump_owner(object_session(target), target.owner_id)
+
+class LocalCache:
+    """Per-process LRU whose entries also expire after their own TTL"""
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.entries.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl, max_size):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+class TieredCache:
+    """A per-process LocalCache in front of the shared cache, for values that are read far more than written
+
+    Loads are single-flight (one thread per process, one process per key via a cache.add lock) and
+    entries are refreshed early with probability rising towards expiry (XFetch), so a hot key
+    expiring does not send every worker to the database at once. Other processes may serve a
+    local copy for up to the local TTL after invalidate(). A None result is cached for
+    CACHE_NEGATIVE_TTL so misses are single-flight too. Each key has a version that invalidate()
+    replaces; entries carry the version they were loaded under, so a load that read the row
+    before a commit cannot outlive the invalidation.
+    """
+
+    def __init__(self, namespace, ttl_setting, local_ttl_setting, local_size_setting):
+        self.namespace = namespace
+        self.ttl_setting = ttl_setting
+        self.local_ttl_setting = local_ttl_setting
+        self.local_size_setting = local_size_setting
+        self.local = LocalCache()
+        self.locks = {}
+        self.locks_guard = threading.Lock()
+
+    def _key(self, key):
+        return f'{self.namespace}:{key}'
+
+    def _version_key(self, key):
+        return self._key(f'{key}:version')
+
+    def _shared(self, key):
+        """The shared entry for key, or None if it is missing or from before the last invalidate()"""
+        entry, version = cache.get_many(self._key(key), self._version_key(key))
+        if entry is None or entry.get('version') != version:
+            return None
+        return entry
+
+    def _fresh(self, entry, now):
+        """False once XFetch decides to recompute: now - delta * beta * ln(rand) >= expiry"""
+        beta = current_app.config.get('CACHE_EARLY_EXPIRY_BETA', 1.0)
+        return now - entry['delta'] * beta * math.log(1.0 - random.random()) < entry['expiry']
+
+    def _remember(self, key, entry, now):
+        ttl = min(current_app.config.get(self.local_ttl_setting, 5), entry['expiry'] - now)
+        if ttl > 0:
+            self.local.set(key, entry, ttl, current_app.config.get(self.local_size_setting, 1024))
+
+    def get(self, key, loader):
+        """Cached value for key, calling loader() on a miss; a None result is only kept for CACHE_NEGATIVE_TTL"""
+        now = time.time()
+        entry = self.local.get(key)
+        if entry is not None and self._fresh(entry, now):
+            return entry['value']
+        entry = self._shared(key)
+        if entry is not None and self._fresh(entry, now):
+            self._remember(key, entry, now)
+            return entry['value']
+        return self._load(key, loader, entry)
+
+    def _load(self, key, loader, stale):
+        with self.locks_guard:
+            lock, users = self.locks.get(key, (None, 0))
+            lock = lock or threading.Lock()
+            self.locks[key] = (lock, users + 1)
+        try:
+            with lock:
+                # Another thread may have refreshed it while this one waited
+                entry = self.local.get(key)
+                if entry is not None and entry['expiry'] > (stale['expiry'] if stale else time.time()):
+                    return entry['value']
+                lock_key = self._key(f'{key}:lock')
+                timeout = current_app.config.get('CACHE_LOCK_TIMEOUT', 5)
+                acquired = cache.add(lock_key, 1, timeout=timeout)
+                if not acquired:
+                    if stale is not None:
+                        return stale['value']
+                    entry = self._wait(key, timeout)
+                    if entry is not None:
+                        return entry['value']
+                try:
+                    return self._fill(key, loader)
+                finally:
+                    if acquired:
+                        cache.delete(lock_key)
+        finally:
+            with self.locks_guard:
+                lock, users = self.locks[key]
+                if users > 1:
+                    self.locks[key] = (lock, users - 1)
+                else:
+                    del self.locks[key]
+
+    def _fill(self, key, loader):
+        version = cache.get(self._version_key(key))
+        started = time.time()
+        value = loader()
+        now = time.time()
+        ttl = current_app.config.get(self.ttl_setting, 300)
+        if value is None:
+            ttl = min(ttl, current_app.config.get('CACHE_NEGATIVE_TTL', 5))
+        if ttl > 0:
+            entry = {'value': value, 'delta': now - started, 'expiry': now + ttl, 'version': version}
+            cache.set(self._key(key), entry, timeout=ttl)
+            # Readers ignore the entry if invalidate() ran during the load; keep it out of this process too
+            if cache.get(self._version_key(key)) == version:
+                self._remember(key, entry, now)
+        return value
+
+    def _wait(self, key, timeout):
+        """Poll for the value another process is loading; None if it does not show up in time
+        or the loader released its lock without storing anything (it failed)"""
+        lock_key = self._key(f'{key}:lock')
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = self._shared(key)
+            if entry is not None:
+                self._remember(key, entry, time.time())
+                return entry
+            if cache.get(lock_key) is None:
+                return None
+        return None
+
+    def invalidate(self, key):
+        cache.set(self._version_key(key), uuid.uuid4().hex, timeout=0)
+        self.local.delete(key)
+        cache.delete(self._key(key))
+
+# Serialized GET /spaces/<id> bodies with their validators
+space_details = TieredCache('space_detail', 'SPACE_DETAIL_TTL', 'SPACE_DETAIL_LOCAL_TTL', 'SPACE_DETAIL_LOCAL_SIZE')
+
+def invalidate_space_detail(session, space_id):
+    if space_id is not None:
+        after_commit(session, lambda: space_details.invalidate(space_id), key=('space_detail', space_id))
+
+# after_insert drops a cached 404 for the new id
+@event.listens_for(Space, 'after_insert')
+@event.listens_for(Space, 'after_update')
+@event.listens_for(Space, 'after_delete')
+def _invalidate_space_detail(mapper, connection, target):
+    invalidate_space_detail(object_session(target), target.id)
+
+# Testimonials change the embedded rating summary
+@event.listens_for(SpaceImage, 'after_insert')
+@event.listens_for(SpaceImage, 'after_update')
+@event.listens_for(SpaceImage, 'after_delete')
+@event.listens_for(Testimonial, 'after_insert')
+@event.listens_for(Testimonial, 'after_update')
+@event.listens_for(Testimonial, 'after_delete')
+def _invalidate_space_detail_by_space(mapper, connection, target):
+    invalidate_space_detail(object_session(target), target.space_id)
@@ -0,0 +1,165 @@
+import threading
+import zlib
+from collections import OrderedDict
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'text/html',
+    'text/plain',
+    'text/css',
+    'text/csv',
+    'application/javascript',
+)
+
+
+def available_encodings():
+    """Encodings the server can produce, in order of preference"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+class _Compressor:
+    """Incremental compressor with the same interface for gzip and brotli"""
+
+    def __init__(self, encoding, level, brotli_quality):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._obj = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31 writes a gzip header and trailer
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        """Compress a chunk and flush it so the client can decode it right away"""
+        if self.encoding == 'br':
+            return self._obj.process(data) + self._obj.flush()
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._obj.finish()
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+def compress_bytes(data, encoding, level=6, brotli_quality=5):
+    """Compress a whole body in one go"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+class PrecompressedCache:
+    """Small thread-safe LRU of compressed bodies keyed by representation and encoding"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class Compression:
+    """Negotiates gzip/brotli for responses above a size threshold"""
+
+    def __init__(self, app=None):
+        self.cache = PrecompressedCache()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESS_LEVEL', 6)
+        app.config.setdefault('COMPRESS_BROTLI_QUALITY', 5)
+        app.config.setdefault('COMPRESS_MIMETYPES', DEFAULT_MIMETYPES)
+        app.config.setdefault('COMPRESS_CACHE_SIZE', 256)
+        self.config = app.config
+        self.cache.maxsize = app.config['COMPRESS_CACHE_SIZE']
+        app.extensions['compression'] = self
+        app.after_request(self.after_request)
+
+    def negotiate(self):
+        """Pick the best encoding the client accepts, or None"""
+        return request.accept_encodings.best_match(available_encodings())
+
+    def after_request(self, response):
+        if response.mimetype not in self.config['COMPRESS_MIMETYPES']:
+            return response
+        response.vary.add('Accept-Encoding')
+
+        if (response.status_code < 200 or response.status_code in (204, 304)
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or 'Content-Range' in response.headers):
+            return response
+
+        encoding = self.negotiate()
+        if not encoding:
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < self.config['COMPRESS_MIN_SIZE']:
+                return response
+            response.set_data(self._compress_cached(response, body, encoding))
+
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _compress_cached(self, response, body, encoding):
+        """Compress a body, reusing earlier output for the same ETag"""
+        etag, _ = response.get_etag()
+        if not etag:
+            return self._compress(body, encoding)
+        key = (request.full_path, response.mimetype, etag, encoding)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = self._compress(body, encoding)
+            self.cache.set(key, compressed)
+        return compressed
+
+    def _compress(self, body, encoding):
+        return compress_bytes(body, encoding, self.config['COMPRESS_LEVEL'],
+                              self.config['COMPRESS_BROTLI_QUALITY'])
+
+    def _stream(self, iterable, encoding):
+        compressor = _Compressor(encoding, self.config['COMPRESS_LEVEL'],
+                                 self.config['COMPRESS_BROTLI_QUALITY'])
+        try:
+            for chunk in iterable:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                if chunk:
+                    yield compressor.compress(chunk)
+            yield compressor.finish()
+        finally:
+            if hasattr(iterable, 'close'):
+                iterable.close()
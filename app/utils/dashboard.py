@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, select, union_all
+from ..models.base import db
+from ..models.space import Space
+from ..models.user import User
+from ..models.booking import Booking, BookingStatus, ACTIVE_STATUSES
+from ..models.archive import BookingArchive
+from ..models.occupancy import load_index, SLOTS_PER_DAY
+
+PERIODS = ('day', 'week', 'month')
+REVENUE_STATUSES = (BookingStatus.CONFIRMED, BookingStatus.COMPLETED)
+
+
+def period_start(column, period):
+    """SQL expression truncating a timestamp to the start of its day/week/month"""
+    if db.engine.dialect.name == 'sqlite':
+        if period == 'day':
+            return func.date(column)
+        if period == 'week':
+            return func.date(column, 'weekday 0', '-6 days')
+        return func.strftime('%Y-%m-01', column)
+    return func.date_trunc(period, column)
+
+
+def period_floor(moment, period):
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def _label(value):
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def revenue_by_period(space_ids, period, since):
+    """{space_id: [{'period', 'revenue', 'bookings'}]} from one grouped query over live and archived bookings"""
+    # Finished bookings move to bookings_archive after BOOKING_ARCHIVE_AFTER_DAYS; older periods live there
+    paid = union_all(*[
+        select(model.space_id, model.start_time, model.total_amount).where(
+            model.space_id.in_(space_ids),
+            model.status.in_(REVENUE_STATUSES),
+            model.start_time >= since
+        ) for model in (Booking, BookingArchive)
+    ]).subquery()
+    bucket = period_start(paid.c.start_time, period).label('period')
+    rows = db.session.execute(
+        select(paid.c.space_id, bucket, func.sum(paid.c.total_amount), func.count())
+        .group_by(paid.c.space_id, bucket).order_by(paid.c.space_id, bucket)
+    )
+    result = {space_id: [] for space_id in space_ids}
+    for space_id, label, revenue, count in rows:
+        result[space_id].append({'period': _label(label), 'revenue': round(revenue or 0, 2), 'bookings': count})
+    return result
+
+
+def upcoming_bookings(space_ids, now, per_space):
+    """Next bookings of each space, ranked in SQL with row_number() per space"""
+    rank = func.row_number().over(partition_by=Booking.space_id, order_by=(Booking.start_time, Booking.id)).label('rank')
+    ranked = db.session.query(Booking.id.label('id'), rank).filter(
+        Booking.space_id.in_(space_ids),
+        Booking.status.in_(ACTIVE_STATUSES),
+        Booking.start_time >= now
+    ).subquery()
+    bookings = Booking.query.join(ranked, ranked.c.id == Booking.id) \
+        .filter(ranked.c.rank <= per_space).order_by(Booking.space_id, Booking.start_time).all()
+    result = {space_id: [] for space_id in space_ids}
+    for booking in bookings:
+        result[booking.space_id].append({
+            'id': booking.id,
+            'client_id': booking.client_id,
+            'start_time': booking.start_time.isoformat(),
+            'end_time': booking.end_time.isoformat(),
+            'status': booking.status.value,
+            'total_amount': booking.total_amount
+        })
+    return result
+
+
+def owner_dashboard(owner_id, period='month', periods=6, utilization_days=30, upcoming=5, now=None):
+    """Per-space utilization, upcoming bookings, revenue and rating for one owner"""
+    now = now or datetime.utcnow()
+    spaces = Space.query.filter(Space.owner_id == owner_id).order_by(Space.id).all()
+    space_ids = [space.id for space in spaces]
+
+    window_end = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    window_start = window_end - timedelta(days=utilization_days)
+    index = load_index(space_ids, window_start, window_end)
+    total_slots = utilization_days * SLOTS_PER_DAY
+
+    since = period_floor(now, period)
+    for _ in range(periods - 1):
+        since = period_floor(since - timedelta(days=1), period)
+    revenue = revenue_by_period(space_ids, period, since)
+    upcoming_by_space = upcoming_bookings(space_ids, now, upcoming)
+
+    result = []
+    for space in spaces:
+        occupied = index.occupied_slots(space.id, window_start, window_end)
+        result.append({
+            'id': space.id,
+            'name': space.name,
+            'city': space.city,
+            'is_active': space.is_active,
+            'utilization': round(100.0 * occupied / total_slots, 1),
+            'revenue': revenue[space.id],
+            'upcoming_bookings': upcoming_by_space[space.id],
+            'rating': space.rating_dict()
+        })
+    return {
+        'period': period,
+        'since': since.isoformat(),
+        'utilization_window': {'start': window_start.isoformat(), 'end': window_end.isoformat()},
+        'spaces': result,
+        'totals': {
+            'spaces': len(result),
+            'revenue': round(sum(entry['revenue'] for space in result for entry in space['revenue']), 2),
+            'upcoming_bookings': sum(len(space['upcoming_bookings']) for space in result)
+        }
+    }
+
+
+def platform_stats(now=None):
+    """Platform-wide counts and revenue of the last 30 days, for both admin stats endpoints"""
+    now = now or datetime.utcnow()
+    # Archived bookings are counted but never scanned; recent figures only touch the hot table
+    return {
+        'total_users': User.query.count(),
+        'total_spaces': Space.query.count(),
+        'total_bookings': Booking.query.count() + BookingArchive.query.count(),
+        'active_bookings': Booking.query.filter_by(status=BookingStatus.CONFIRMED).count(),
+        'revenue_last_30_days': db.session.query(func.coalesce(func.sum(Booking.total_amount), 0)).filter(
+            Booking.created_at >= now - timedelta(days=30),
+            Booking.status.in_(REVENUE_STATUSES)
+        ).scalar()
+    }
@@ -0,0 +1,184 @@
+import heapq
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import func, select
+from ..models.base import db
+from ..models.booking import Booking, BookingStatus
+from ..models.rating import SpaceRating
+from ..models.space import Space, SpaceStatus
+from .cache import redis_client
+from .scheduler import scheduler
+
+logger = logging.getLogger(__name__)
+
+ALL_CITIES = 'all'
+
+
+def ranking_key(city=None):
+    return f'city:{city.strip().lower()}' if city else ALL_CITIES
+
+
+class MemoryRanking:
+    """Per-process rankings, used when REDIS_URL is not set; each worker fills its own"""
+
+    def __init__(self):
+        self.rankings = {}
+        self.refreshed = None
+
+    def replace(self, rankings):
+        # Swap the whole dict so readers never see a half-written refresh
+        self.rankings = {key: sorted(entries, key=lambda entry: -entry[1]) for key, entries in rankings.items()}
+        self.refreshed = time.time()
+
+    def top(self, key, limit):
+        return self.rankings.get(key, [])[:limit]
+
+    def refreshed_at(self):
+        return self.refreshed
+
+
+class RedisRanking:
+    """Rankings as Redis sorted sets shared by every worker; top-k reads are O(log n + k)"""
+
+    def __init__(self, client, prefix='featured'):
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, key):
+        return f'{self.prefix}:{key}'
+
+    def replace(self, rankings):
+        """Write every ranking under a staging key, then rename them all in one transaction"""
+        index = self._key('keys')
+        previous = {key.decode() if isinstance(key, bytes) else key for key in self.client.smembers(index)}
+        staging = self.client.pipeline(transaction=False)
+        for key, entries in rankings.items():
+            staged = self._key(f'staging:{key}')
+            staging.delete(staged)
+            for start in range(0, len(entries), 1000):
+                staging.zadd(staged, {space_id: score for space_id, score in entries[start:start + 1000]})
+        staging.execute()
+        swap = self.client.pipeline(transaction=True)
+        for key in rankings:
+            swap.rename(self._key(f'staging:{key}'), self._key(key))
+        for key in previous - set(rankings):
+            swap.delete(self._key(key))
+        swap.delete(index)
+        if rankings:
+            swap.sadd(index, *rankings)
+        swap.set(self._key('refreshed_at'), time.time())
+        swap.execute()
+
+    def top(self, key, limit):
+        return [(int(space_id), score)
+                for space_id, score in self.client.zrevrange(self._key(key), 0, limit - 1, withscores=True)]
+
+    def refreshed_at(self):
+        value = self.client.get(self._key('refreshed_at'))
+        return float(value) if value is not None else None
+
+
+def ranking_store(app=None):
+    """The app's ranking store: Redis sorted sets when REDIS_URL is set, otherwise in memory"""
+    app = app or current_app
+    store = app.extensions.get('featured_ranking')
+    if store is None:
+        client = redis_client(app)
+        store = RedisRanking(client) if client is not None else MemoryRanking()
+        app.extensions['featured_ranking'] = store
+    return store
+
+
+def score_spaces(now=None):
+    """Score every bookable space: a Bayesian rating average and recent booking volume, mixed by FEATURED_WEIGHTS
+
+    Returns [(space_id, city, score)]. Both signals are scaled to [0, 1] before weighting.
+    """
+    now = now or datetime.utcnow()
+    config = current_app.config
+    weights = config.get('FEATURED_WEIGHTS', {'rating': 0.6, 'bookings': 0.4})
+    prior = config.get('FEATURED_RATING_PRIOR', 5)
+    since = now - timedelta(days=config.get('FEATURED_BOOKING_WINDOW_DAYS', 30))
+
+    bookings = Booking.__table__
+    recent = (
+        select(bookings.c.space_id, func.count().label('bookings'))
+        .where(bookings.c.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED, BookingStatus.COMPLETED]),
+               bookings.c.created_at >= since)
+        .group_by(bookings.c.space_id)
+        .subquery()
+    )
+    spaces = Space.__table__
+    ratings = SpaceRating.__table__
+    rows = db.session.execute(
+        select(spaces.c.id, spaces.c.city, ratings.c.count, ratings.c.total, recent.c.bookings)
+        .select_from(spaces.outerjoin(ratings, ratings.c.space_id == spaces.c.id)
+                     .outerjoin(recent, recent.c.space_id == spaces.c.id))
+        .where(spaces.c.is_active.is_(True), spaces.c.deleted_at.is_(None), spaces.c.status != SpaceStatus.MAINTENANCE)
+    ).fetchall()
+    if not rows:
+        return []
+
+    reviews = sum(row.count or 0 for row in rows)
+    mean = sum(row.total or 0 for row in rows) / reviews if reviews else 3.0
+    most_booked = math.log1p(max(row.bookings or 0 for row in rows)) or 1.0
+    scored = []
+    for row in rows:
+        rating = (prior * mean + (row.total or 0)) / (prior + (row.count or 0)) / 5
+        popularity = math.log1p(row.bookings or 0) / most_booked
+        score = weights.get('rating', 0) * rating + weights.get('bookings', 0) * popularity
+        scored.append((row.id, row.city, round(score, 6)))
+    return scored
+
+
+def refresh_rankings(now=None):
+    """Recompute the overall and per-city rankings, keeping the top FEATURED_SIZE of each"""
+    started = time.perf_counter()
+    size = current_app.config.get('FEATURED_SIZE', 100)
+    by_key = defaultdict(list)
+    for space_id, city, score in score_spaces(now):
+        by_key[ALL_CITIES].append((space_id, score))
+        if city:
+            by_key[ranking_key(city)].append((space_id, score))
+    rankings = {key: heapq.nlargest(size, entries, key=lambda entry: (entry[1], -entry[0]))
+                for key, entries in by_key.items()}
+    ranking_store().replace(rankings)
+    logger.info('Ranked %s spaces into %s rankings in %.2fs', len(by_key[ALL_CITIES]), len(rankings),
+                time.perf_counter() - started)
+    return {'spaces': len(by_key[ALL_CITIES]), 'rankings': len(rankings)}
+
+
+_refresh_lock = threading.Lock()
+
+
+def featured(city=None, limit=10):
+    """[(space_id, score)] best first; rankings missing or two intervals old are rebuilt first
+
+    Lets a worker without the job (memory store) or a fresh Redis serve the page on its own.
+    """
+    store = ranking_store()
+    max_age = 2 * current_app.config.get('FEATURED_REFRESH_INTERVAL', 900)
+    refreshed = store.refreshed_at()
+    if refreshed is None or time.time() - refreshed > max_age:
+        with _refresh_lock:
+            refreshed = store.refreshed_at()
+            if refreshed is None or time.time() - refreshed > max_age:
+                refresh_rankings()
+    return store.top(ranking_key(city), limit)
+
+
+scheduler.add_job('rank_spaces', refresh_rankings, 'FEATURED_REFRESH_INTERVAL', 900)
+
+
+@click.command('rank-spaces')
+@with_appcontext
+def rank_spaces_command():
+    """Recompute the featured space rankings now."""
+    click.echo(refresh_rankings())
@@ -0,0 +1,66 @@
+import hashlib
+from datetime import timezone
+from flask import current_app, request
+from sqlalchemy import func
+from werkzeug.http import http_date
+
+
+def compute_validators(query, column, *extra):
+    """Return (etag, last_modified) for the rows matched by a query.
+
+    Uses a single max()/count() aggregate so nothing is loaded or serialized.
+    The row count is part of the ETag so deletions also change it.
+    """
+    last_modified, count = query.order_by(None).with_entities(func.max(column), func.count()).one()
+    if last_modified is not None:
+        last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+    return make_etag(column.class_.__tablename__, last_modified, count, *extra), last_modified
+
+
+def make_etag(*parts):
+    """Build a weak ETag value from arbitrary parts"""
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return digest[:32]
+
+
+def not_modified(etag, last_modified):
+    """Return a 304 response if the request's validators still match, otherwise None"""
+    if request.if_none_match:
+        matched = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified is not None:
+        since = request.if_modified_since
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        matched = last_modified <= since
+    else:
+        matched = False
+
+    if not matched:
+        return None
+    response = current_app.response_class(status=304)
+    response.headers.update(validator_headers(etag, last_modified))
+    return response
+
+
+def validator_headers(etag, last_modified):
+    """Response headers carrying the ETag and Last-Modified validators"""
+    headers = {'ETag': 'W/"%s"' % etag}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+    return headers
+
+
+def apply_cache_policy(response):
+    """Set Cache-Control from the per-namespace policy unless the view already did"""
+    if request.method not in ('GET', 'HEAD') or 'Cache-Control' in response.headers:
+        return response
+    if response.status_code not in (200, 304):
+        return response
+    endpoint = request.endpoint or ''
+    if not endpoint.startswith('api.'):
+        return response
+    namespace = endpoint[len('api.'):].split('_', 1)[0]
+    policy = current_app.config.get('CACHE_CONTROL_POLICIES', {}).get(namespace)
+    if policy:
+        response.headers['Cache-Control'] = policy
+    return response
@@ -0,0 +1,117 @@
+import logging
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from flask.signals import Namespace
+from sqlalchemy import select, update, or_
+from ..models.base import db
+from ..models.booking import Booking, BookingStatus
+from ..models.occupancy import rebuild_days, day_masks
+from .cache import bump_generation
+from .scheduler import scheduler
+
+logger = logging.getLogger(__name__)
+
+_signals = Namespace()
+
+# Sent once per booking moved by the sweeper, after its batch commits:
+# sender=app, booking_id, space_id, client_id, from_status, to_status
+booking_transitioned = _signals.signal('booking-transitioned')
+
+EXPIRED_REASON = 'Expired: unpaid hold'
+
+
+def _transition(predicate, values, batch_size):
+    """Move one batch of bookings matching predicate; return the moved rows"""
+    bookings = Booking.__table__
+    columns = (bookings.c.id, bookings.c.space_id, bookings.c.client_id, bookings.c.start_time, bookings.c.end_time)
+    candidates = select(bookings.c.id).where(*predicate).order_by(bookings.c.id).limit(batch_size)
+    if db.engine.dialect.name == 'postgresql':
+        # Rows locked by a concurrent writer are left for the next run
+        candidates = candidates.with_for_update(skip_locked=True)
+        statement = update(bookings).where(bookings.c.id.in_(candidates)).values(**values).returning(*columns)
+        return db.session.execute(statement).fetchall()
+    rows = db.session.execute(select(*columns).where(bookings.c.id.in_(candidates))).fetchall()
+    if rows:
+        db.session.execute(update(bookings).where(bookings.c.id.in_([row.id for row in rows]), *predicate)
+                           .values(**values))
+    return rows
+
+
+def _sweep(predicate, values, from_status, batch_size, on_batch=None):
+    moved = 0
+    app = current_app._get_current_object()
+    while True:
+        rows = _transition(predicate, values, batch_size)
+        if not rows:
+            break
+        if on_batch:
+            on_batch(rows)
+        db.session.commit()
+        moved += len(rows)
+        for row in rows:
+            booking_transitioned.send(app, booking_id=row.id, space_id=row.space_id, client_id=row.client_id,
+                                      from_status=from_status, to_status=values['status'])
+        if len(rows) < batch_size:
+            break
+    return moved
+
+
+def complete_past_bookings(now=None, batch_size=None):
+    """Mark confirmed bookings that have ended as completed"""
+    now = now or datetime.utcnow()
+    bookings = Booking.__table__
+    return _sweep(
+        (bookings.c.status == BookingStatus.CONFIRMED, bookings.c.end_time <= now),
+        {'status': BookingStatus.COMPLETED, 'updated_at': now},
+        BookingStatus.CONFIRMED,
+        batch_size or current_app.config.get('BOOKING_SWEEP_BATCH_SIZE', 500)
+    )
+
+
+def _release_slots(rows):
+    """Free the calendar days held by expired bookings"""
+    days_by_space = {}
+    for row in rows:
+        days_by_space.setdefault(row.space_id, set()).update(day_masks(row.start_time, row.end_time))
+    connection = db.session.connection()
+    for space_id, days in days_by_space.items():
+        rebuild_days(connection, space_id, days)
+
+
+def expire_pending_holds(now=None, ttl=None, batch_size=None):
+    """Cancel unpaid pending bookings older than the hold TTL"""
+    now = now or datetime.utcnow()
+    ttl = ttl if ttl is not None else current_app.config.get('PENDING_HOLD_TTL', 24 * 60 * 60)
+    bookings = Booking.__table__
+    expired = _sweep(
+        (bookings.c.status == BookingStatus.PENDING,
+         or_(bookings.c.payment_status.is_(False), bookings.c.payment_status.is_(None)),
+         bookings.c.created_at < now - timedelta(seconds=ttl)),
+        {'status': BookingStatus.CANCELLED, 'cancellation_reason': EXPIRED_REASON, 'updated_at': now},
+        BookingStatus.PENDING,
+        batch_size or current_app.config.get('BOOKING_SWEEP_BATCH_SIZE', 500),
+        on_batch=_release_slots
+    )
+    if expired:
+        bump_generation('search')
+    return expired
+
+
+def sweep_bookings():
+    """Run both lifecycle transitions; return the number of bookings moved by each"""
+    result = {'expired': expire_pending_holds(), 'completed': complete_past_bookings()}
+    if any(result.values()):
+        logger.info('Booking sweep: %(expired)s expired, %(completed)s completed', result)
+    return result
+
+
+scheduler.add_job('sweep_bookings', sweep_bookings, 'BOOKING_SWEEP_INTERVAL')
+
+
+@click.command('sweep-bookings')
+@with_appcontext
+def sweep_bookings_command():
+    """Complete past bookings and expire stale pending holds now."""
+    click.echo(sweep_bookings())
@@ -0,0 +1,74 @@
+import base64
+import json
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import select, update, tuple_
+from ..models.base import db, after_commit
+from ..models.testimonial import Testimonial
+from ..models.rating import apply_rating_deltas, contribution
+from .cache import bump_generation, invalidate_space_detail
+
+MODERATION_STATUSES = ('approved', 'rejected', 'pending')
+
+
+def encode_cursor(testimonial):
+    raw = json.dumps([testimonial.created_at.isoformat(), testimonial.id])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Return (created_at, id) from an opaque cursor or raise ValueError"""
+    try:
+        created_at, testimonial_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(created_at), int(testimonial_id)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError('Invalid cursor')
+
+
+def pending_queue(after=None, limit=50):
+    """Oldest pending testimonials after the cursor position; return (items, next_cursor)"""
+    query = Testimonial.query.filter(Testimonial.status == 'pending')
+    if after:
+        query = query.filter(tuple_(Testimonial.created_at, Testimonial.id) > decode_cursor(after))
+    items = query.order_by(Testimonial.created_at, Testimonial.id).limit(limit + 1).all()
+    next_cursor = encode_cursor(items[limit - 1]) if len(items) > limit else None
+    return items[:limit], next_cursor
+
+
+def moderate(ids, status):
+    """Set the status of many testimonials in one UPDATE and adjust rating summaries in the same transaction
+
+    Returns {'updated': [...], 'unchanged': [...], 'not_found': [...]}; the caller commits.
+    """
+    table = Testimonial.__table__
+    ids = sorted(set(ids))
+    rows = db.session.execute(
+        select(table.c.id, table.c.space_id, table.c.rating, table.c.status)
+        .where(table.c.id.in_(ids)).with_for_update()
+    ).fetchall()
+    found = {row.id for row in rows}
+    changed = [row for row in rows if row.status != status]
+    if changed:
+        db.session.execute(
+            update(table).where(table.c.id.in_([row.id for row in changed]))
+            .values(status=status, updated_at=datetime.utcnow())
+        )
+        deltas = defaultdict(lambda: defaultdict(int))
+        for row in changed:
+            old = contribution(row.status, row.space_id, row.rating)
+            new = contribution(status, row.space_id, row.rating)
+            if old:
+                deltas[old[0]][old[1]] -= 1
+            if new:
+                deltas[new[0]][new[1]] += 1
+        connection = db.session.connection()
+        for space_id, space_deltas in deltas.items():
+            apply_rating_deltas(connection, space_id, space_deltas)
+            invalidate_space_detail(db.session(), space_id)
+        # The bulk UPDATE bypasses mapper events, so invalidate here
+        after_commit(db.session(), lambda: bump_generation('search'), key='bump:search')
+    return {
+        'updated': [row.id for row in changed],
+        'unchanged': sorted(found - {row.id for row in changed}),
+        'not_found': [testimonial_id for testimonial_id in ids if testimonial_id not in found]
+    }
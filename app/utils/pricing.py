@@ -0,0 +1,156 @@
+import threading
+import time
+from datetime import timedelta
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+from ..models.base import after_commit
+from ..models.pricing import PriceRule, PriceRuleType
+
+DEFAULT_RULES_TTL = 300
+
+
+class CompiledRules:
+    """Price rules of one space flattened into lookup tables"""
+
+    def __init__(self, rules=()):
+        self.hour_multipliers = [1.0] * 24
+        self.weekday_multipliers = [1.0] * 7
+        self.seasons = []
+        self.long_stay = []
+
+        for rule in rules:
+            if rule.type == PriceRuleType.TIME_OF_DAY:
+                for hour in _hours(rule.start_hour or 0, 24 if rule.end_hour is None else rule.end_hour):
+                    self.hour_multipliers[hour] *= rule.multiplier
+            elif rule.type == PriceRuleType.WEEKDAY:
+                for day in (int(d) for d in (rule.weekdays or '').split(',') if d.strip()):
+                    self.weekday_multipliers[day] *= rule.multiplier
+            elif rule.type == PriceRuleType.SEASON:
+                self.seasons.append((_month_day(rule.start_date), _month_day(rule.end_date), rule.multiplier))
+            elif rule.type == PriceRuleType.LONG_STAY:
+                self.long_stay.append((rule.min_hours or 0, rule.discount or 0))
+        # Longest threshold first so the best matching discount is found first
+        self.long_stay.sort(reverse=True)
+
+    def season_multiplier(self, moment):
+        multiplier = 1.0
+        day = (moment.month, moment.day)
+        for start, end, value in self.seasons:
+            inside = start <= day <= end if start <= end else (day >= start or day <= end)
+            if inside:
+                multiplier *= value
+        return multiplier
+
+    def discount_for(self, hours):
+        for min_hours, discount in self.long_stay:
+            if hours >= min_hours:
+                return discount
+        return 0.0
+
+    def price(self, space, start, end):
+        """Price an interval: hourly up to 24h, daily beyond, then the long-stay discount"""
+        hours = (end - start).total_seconds() / 3600
+        if hours <= 24:
+            step, rate = timedelta(hours=1), space.price_per_hour
+            base = hours * space.price_per_hour
+        else:
+            step, rate = timedelta(days=1), space.price_per_day
+            base = hours / 24 * space.price_per_day
+
+        subtotal = 0.0
+        cursor = start
+        while cursor < end:
+            if step.days:
+                boundary = min(cursor + step, end)
+                multiplier = self.weekday_multipliers[cursor.weekday()]
+            else:
+                boundary = min(cursor.replace(minute=0, second=0, microsecond=0) + step, end)
+                multiplier = self.hour_multipliers[cursor.hour] * self.weekday_multipliers[cursor.weekday()]
+            units = (boundary - cursor) / step
+            subtotal += units * rate * multiplier * self.season_multiplier(cursor)
+            cursor = boundary
+
+        discount = subtotal * self.discount_for(hours)
+        return {
+            'space_id': space.id,
+            'start_time': start.isoformat(),
+            'end_time': end.isoformat(),
+            'hours': round(hours, 4),
+            'base_amount': round(base, 2),
+            'subtotal': round(subtotal, 2),
+            'discount': round(discount, 2),
+            'total_amount': round(subtotal - discount, 2)
+        }
+
+
+def _hours(start, end):
+    if start < end:
+        return range(start, end)
+    # Wraps midnight, e.g. 22 -> 6
+    return list(range(start, 24)) + list(range(0, end))
+
+
+def _month_day(value):
+    month, day = value.split('-')
+    return int(month), int(day)
+
+
+EMPTY_RULES = CompiledRules()
+_cache = {}
+_lock = threading.Lock()
+
+
+def get_compiled_rules(space_ids):
+    """Return {space_id: CompiledRules}, loading every cache miss with a single query"""
+    ttl = current_app.config.get('PRICE_RULES_TTL', DEFAULT_RULES_TTL)
+    now = time.monotonic()
+    compiled = {}
+    missing = []
+    with _lock:
+        for space_id in set(space_ids):
+            entry = _cache.get(space_id)
+            if entry and entry[0] > now:
+                compiled[space_id] = entry[1]
+            else:
+                missing.append(space_id)
+
+    if missing:
+        by_space = {}
+        rules = PriceRule.query.filter(PriceRule.space_id.in_(missing), PriceRule.is_active.is_(True)).all()
+        for rule in rules:
+            by_space.setdefault(rule.space_id, []).append(rule)
+        with _lock:
+            for space_id in missing:
+                rules_for_space = by_space.get(space_id)
+                compiled[space_id] = CompiledRules(rules_for_space) if rules_for_space else EMPTY_RULES
+                _cache[space_id] = (now + ttl, compiled[space_id])
+    return compiled
+
+
+def invalidate_rules(space_id=None):
+    """Drop compiled rules for one space, or for all spaces"""
+    with _lock:
+        if space_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(space_id, None)
+
+
+def quote(space, start, end):
+    """Price a single interval for a space"""
+    return get_compiled_rules([space.id])[space.id].price(space, start, end)
+
+
+def quote_many(spaces, intervals):
+    """Price (space_id, start, end) intervals against already-loaded spaces"""
+    rules = get_compiled_rules(spaces.keys())
+    return [rules[space_id].price(spaces[space_id], start, end) for space_id, start, end in intervals]
+
+
+@event.listens_for(PriceRule, 'after_insert')
+@event.listens_for(PriceRule, 'after_update')
+@event.listens_for(PriceRule, 'after_delete')
+def _invalidate_on_change(mapper, connection, target):
+    space_id = target.space_id
+    after_commit(object_session(target), lambda: invalidate_rules(space_id), key=('price_rules', space_id))
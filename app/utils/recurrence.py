@@ -0,0 +1,45 @@
+import heapq
+from itertools import islice
+from dateutil.rrule import rrulestr
+
+
+def expand_rule(rule, start, end, limit):
+    """Expand an RRULE into [(start, end)] occurrences of the first booking's length
+
+    Raises ValueError for invalid rules, rules yielding more than `limit` occurrences
+    and occurrences that overlap each other.
+    """
+    try:
+        starts = list(islice(rrulestr(rule, dtstart=start), limit + 1))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'Invalid recurrence rule: {e}')
+    if not starts:
+        raise ValueError('The recurrence rule yields no occurrences')
+    if len(starts) > limit:
+        raise ValueError(f'The recurrence rule yields more than {limit} occurrences')
+    duration = end - start
+    occurrences = [(moment, moment + duration) for moment in starts]
+    for (_, previous_end), (next_start, _) in zip(occurrences, occurrences[1:]):
+        if next_start < previous_end:
+            raise ValueError('Occurrences of the recurrence rule overlap each other')
+    return occurrences
+
+
+def match_conflicts(occurrences, bookings):
+    """Pair each occurrence with an overlapping booking id or None
+
+    Both inputs are sorted by start; bookings are (start, end, id) tuples.
+    A single merge pass keeps the bookings that may still overlap in a heap keyed on end.
+    """
+    result = []
+    active = []
+    index = 0
+    for start, end in occurrences:
+        while index < len(bookings) and bookings[index][0] < end:
+            booking_start, booking_end, booking_id = bookings[index]
+            heapq.heappush(active, (booking_end, booking_id))
+            index += 1
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        result.append(active[0][1] if active else None)
+    return result
@@ -0,0 +1,209 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy import select, insert, delete
+from ..models.base import db
+from ..models.revocation import TokenRevocation
+from .cache import redis_client
+
+# Re-read this much of the feed on every sync so entries written by a slightly slower clock are not missed
+CLOCK_SKEW = 5
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter: no false negatives, false positives at about error_rate when full"""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        added = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                added = True
+        self.count += added
+        return added
+
+    def __contains__(self, item):
+        return all(self.bits[position // 8] & (1 << (position % 8)) for position in self._positions(item))
+
+
+class DatabaseRevocations:
+    """Denylist and feed in the token_revocations table, used when REDIS_URL is not set
+
+    Writes go through their own transaction so a revocation lands even if the request's session rolls back;
+    reads use a short connection of their own too, so checks never touch the request's session (the ASGI
+    app verifies tokens on the event loop, where that session would be shared by every coroutine).
+    """
+
+    def add(self, entry, ttl, retention):
+        now = datetime.utcnow()
+        table = TokenRevocation.__table__
+        with db.engine.begin() as connection:
+            connection.execute(delete(table).where(table.c.expires_at < now))
+            connection.execute(insert(table).values(entry=entry, expires_at=now + timedelta(seconds=ttl),
+                                                    created_at=now, updated_at=now))
+
+    def is_denied(self, jti):
+        table = TokenRevocation.__table__
+        with db.engine.connect() as connection:
+            return connection.execute(
+                select(table.c.id).where(table.c.entry == f'jti:{jti}', table.c.expires_at > datetime.utcnow())
+                .limit(1)
+            ).first() is not None
+
+    def since(self, timestamp):
+        table = TokenRevocation.__table__
+        with db.engine.connect() as connection:
+            rows = connection.execute(
+                select(table.c.entry, table.c.created_at)
+                .where(table.c.created_at >= datetime.utcfromtimestamp(timestamp))
+                .order_by(table.c.created_at)
+            ).fetchall()
+        return [(entry, created_at.replace(tzinfo=timezone.utc).timestamp()) for entry, created_at in rows]
+
+
+class RedisRevocations:
+    """revoked:<jti> keys expiring with their token, plus a sorted set feed of every revocation by time"""
+
+    def __init__(self, client, prefix='revoked'):
+        self.client = client
+        self.prefix = prefix
+
+    def add(self, entry, ttl, retention):
+        now = time.time()
+        feed = f'{self.prefix}:feed'
+        pipeline = self.client.pipeline(transaction=True)
+        if entry.startswith('jti:'):
+            pipeline.set(f'{self.prefix}:{entry[4:]}', 1, ex=max(1, math.ceil(ttl)))
+        pipeline.zadd(feed, {entry: now})
+        pipeline.zremrangebyscore(feed, '-inf', now - retention)
+        pipeline.execute()
+
+    def is_denied(self, jti):
+        return bool(self.client.exists(f'{self.prefix}:{jti}'))
+
+    def since(self, timestamp):
+        return [(item.decode('utf-8'), at)
+                for item, at in self.client.zrangebyscore(f'{self.prefix}:feed', timestamp, '+inf', withscores=True)]
+
+
+def _seconds(expires):
+    return expires.total_seconds() if isinstance(expires, timedelta) else (expires or 0)
+
+
+class RevocationList:
+    """Answers "is this token revoked?" from process memory
+
+    Every worker folds the shared feed into a Bloom filter of revoked JTIs and a map of each user's
+    minimum token version, pulling new entries at most every REVOCATION_SYNC_INTERVAL seconds.
+    A token that misses the filter is accepted with no I/O; a hit is confirmed against the denylist,
+    so false positives cost one lookup and never reject a valid token.
+    """
+
+    def __init__(self, store, config):
+        self.store = store
+        self.capacity = config.get('REVOCATION_BLOOM_CAPACITY', 1000000)
+        self.error_rate = config.get('REVOCATION_BLOOM_ERROR_RATE', 0.001)
+        self.sync_interval = config.get('REVOCATION_SYNC_INTERVAL', 1)
+        # Feed entries matter only while some token they revoke can still be presented
+        self.retention = max(_seconds(config.get('JWT_ACCESS_TOKEN_EXPIRES')),
+                             _seconds(config.get('JWT_REFRESH_TOKEN_EXPIRES'))) + CLOCK_SKEW
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.bloom = BloomFilter(self.capacity, self.error_rate)
+        self.versions = {}
+        self.synced_to = 0
+        self.checked = None
+
+    def _apply(self, entry):
+        kind, _, value = entry.partition(':')
+        if kind == 'jti':
+            self.bloom.add(value)
+        elif kind == 'user':
+            user_id, version = value.rsplit(':', 1)
+            self.versions[user_id] = max(self.versions.get(user_id, 0), int(version))
+
+    def sync(self):
+        now = time.monotonic()
+        if self.checked is not None and now - self.checked < self.sync_interval:
+            return
+        with self.lock:
+            if self.checked is not None and time.monotonic() - self.checked < self.sync_interval:
+                return
+            if self.bloom.count > self.bloom.capacity:
+                # Expired entries have left the feed; start over to bring the false positive rate back down
+                self._reset()
+            for entry, at in self.store.since(self.synced_to - CLOCK_SKEW if self.synced_to else 0):
+                self._apply(entry)
+                self.synced_to = max(self.synced_to, at)
+            self.checked = time.monotonic()
+
+    def revoke_token(self, jwt_data):
+        ttl = jwt_data['exp'] - time.time() if 'exp' in jwt_data else self.retention
+        if ttl > 0:
+            entry = f'jti:{jwt_data["jti"]}'
+            self.store.add(entry, ttl, self.retention)
+            with self.lock:
+                self._apply(entry)
+
+    def revoke_user(self, user_id, version):
+        """Revoke every token of the user carrying a version below this one"""
+        entry = f'user:{user_id}:{version}'
+        self.store.add(entry, self.retention, self.retention)
+        with self.lock:
+            self._apply(entry)
+
+    def is_revoked(self, jwt_data):
+        self.sync()
+        if jwt_data.get('ver', 0) < self.versions.get(str(jwt_data.get('sub')), 0):
+            return True
+        return jwt_data['jti'] in self.bloom and self.store.is_denied(jwt_data['jti'])
+
+
+def revocations(app=None):
+    app = app or current_app
+    revocation_list = app.extensions.get('revocations')
+    if revocation_list is None:
+        client = redis_client(app)
+        store = RedisRevocations(client) if client is not None else DatabaseRevocations()
+        revocation_list = app.extensions['revocations'] = RevocationList(store, app.config)
+    return revocation_list
+
+
+def is_token_revoked(jwt_header, jwt_data):
+    """flask_jwt_extended token_in_blocklist_loader"""
+    return revocations().is_revoked(jwt_data)
+
+
+def revoke_token(jwt_data):
+    """Log out one token (the one the request was made with)"""
+    revocations().revoke_token(jwt_data)
+
+
+def revoke_all_tokens(user):
+    """Log the user out everywhere: bump token_version so every token issued so far is refused"""
+    user.token_version = (user.token_version or 0) + 1
+    db.session.commit()
+    revocations().revoke_user(user.id, user.token_version)
+
+
+def token_claims(user):
+    """Claims every token issued to the user carries; ver ties it to the user's token_version"""
+    return {'ver': user.token_version or 0}
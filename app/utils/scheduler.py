@@ -0,0 +1,96 @@
+import logging
+import os
+import threading
+import time
+import zlib
+from sqlalchemy import text
+from ..models.base import db
+from ..models.scheduled_job import ScheduledJob
+
+logger = logging.getLogger(__name__)
+
+
+def run_exclusive(name, func):
+    """Run func unless another instance holds the job's advisory lock (PostgreSQL only)"""
+    if db.engine.dialect.name != 'postgresql':
+        return func()
+    key = zlib.crc32(name.encode('utf-8'))
+    with db.engine.connect() as connection:
+        if not connection.execute(text('SELECT pg_try_advisory_lock(:key)'), {'key': key}).scalar():
+            logger.debug('Skipping %s, another instance is running it', name)
+            return None
+        try:
+            return func()
+        finally:
+            connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': key})
+
+
+class Scheduler:
+    """Runs registered jobs on fixed intervals in a daemon thread
+
+    Every worker may run one; the scheduled_jobs table lets a single process claim each interval,
+    so restarts and extra workers do not run a job again early.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self.app = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def add_job(self, name, func, interval_setting, default_interval=60):
+        """Register func to run every app.config[interval_setting] seconds"""
+        self.jobs[name] = (func, interval_setting, default_interval)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['scheduler'] = self
+        # Under the debug reloader only the child process serves requests
+        reloader_parent = app.debug and os.environ.get('WERKZEUG_RUN_MAIN') != 'true'
+        # A preloading server starts it in each worker instead (gunicorn.conf.py)
+        autostart = app.config.get('SCHEDULER_AUTOSTART', True)
+        if app.config.get('SCHEDULER_ENABLED') and autostart and not reloader_parent:
+            self.start()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def run_job(self, name, interval=None):
+        """Run one job now inside an app context; errors are logged, not raised
+
+        With an interval the run is skipped if any process ran the job less than interval seconds ago.
+        """
+        func = self.jobs[name][0]
+        with self.app.app_context():
+            try:
+                if interval is not None and not ScheduledJob.claim(name, interval):
+                    logger.debug('Skipping %s, it already ran within %ss', name, interval)
+                    return None
+                return run_exclusive(name, func)
+            except Exception:
+                logger.exception('Scheduled job %s failed', name)
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+    def _run(self):
+        next_run = {name: time.monotonic() for name in self.jobs}
+        while not self._stop.is_set():
+            for name, (_, interval_setting, default_interval) in list(self.jobs.items()):
+                now = time.monotonic()
+                if now < next_run.get(name, now):
+                    continue
+                interval = self.app.config.get(interval_setting, default_interval)
+                self.run_job(name, interval)
+                next_run[name] = time.monotonic() + interval
+            self._stop.wait(1)
+
+
+scheduler = Scheduler()
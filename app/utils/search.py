@@ -0,0 +1,87 @@
+import math
+from datetime import datetime, timedelta
+from flask import current_app
+from ..models.space import Space, SpaceType, SpaceStatus
+from .cache import make_key
+
+SEARCH_FILTERS = ('city', 'type', 'amenities', 'amenities_match')
+
+
+def bucket_window(start, end, minutes):
+    """Widen [start, end) outwards to the bucket grid so nearby windows share a cache entry"""
+    step = timedelta(minutes=minutes)
+    floor = datetime.min + ((start - datetime.min) // step) * step
+    ceiling = datetime.min + -((datetime.min - end) // step) * step
+    return floor, ceiling
+
+
+def parse_search_args(args):
+    """Validate /spaces/search query args; return (params, None) or (None, error response)"""
+    try:
+        start = datetime.fromisoformat(args['start'])
+        end = datetime.fromisoformat(args['end'])
+    except (KeyError, ValueError):
+        return None, ({'message': 'start and end are required ISO 8601 datetimes'}, 400)
+    # Bookings are stored as naive UTC; an offset would also break the comparison and bucketing below
+    if start.tzinfo is not None or end.tzinfo is not None:
+        return None, ({'message': 'start and end must not carry a UTC offset'}, 400)
+    if end <= start:
+        return None, ({'message': 'end must be after start'}, 400)
+    filters = {name: args.get(name) for name in SEARCH_FILTERS}
+    if filters['type']:
+        try:
+            SpaceType(filters['type'])
+        except ValueError:
+            return None, ({'message': 'Invalid space type'}, 400)
+    if filters['amenities'] and (filters['amenities_match'] or 'all') not in ('all', 'any'):
+        return None, ({'message': 'Invalid amenities_match, use all or any'}, 400)
+    try:
+        start, end = bucket_window(start, end, current_app.config.get('SEARCH_WINDOW_BUCKET_MINUTES', 15))
+    except OverflowError:
+        return None, ({'message': 'start and end are out of range'}, 400)
+    return {
+        'filters': filters,
+        'min_capacity': args.get('min_capacity', type=int),
+        'max_price': args.get('max_price', type=float),
+        'start': start,
+        'end': end,
+        'page': args.get('page', default=1, type=int),
+        'per_page': min(args.get('per_page', default=20, type=int), 100)
+    }, None
+
+
+def search_key(params):
+    return make_key('search', params['filters'], params['min_capacity'], params['max_price'],
+                    params['start'], params['end'], params['page'], params['per_page'])
+
+
+def search_spaces(session, params):
+    """Run a search with the given session (sync, or an AsyncSession's via run_sync); return the response body"""
+    filters = params['filters']
+    query = session.query(Space).filter_by(is_active=True).filter(Space.status != SpaceStatus.MAINTENANCE)
+    if filters['city']:
+        query = query.filter(Space.city == filters['city'])
+    if filters['type']:
+        query = query.filter(Space.type == SpaceType(filters['type']))
+    if params['min_capacity'] is not None:
+        query = query.filter(Space.capacity >= params['min_capacity'])
+    if params['max_price'] is not None:
+        query = query.filter(Space.price_per_hour <= params['max_price'])
+    if filters['amenities']:
+        query = Space.filter_by_amenities(query, filters['amenities'].split(','),
+                                          match_all=(filters['amenities_match'] or 'all') == 'all', session=session)
+    query = Space.free_between(query, params['start'], params['end']).order_by(Space.price_per_hour, Space.id)
+
+    # Same page arithmetic as Flask-SQLAlchemy's paginate(error_out=False)
+    page = max(params['page'], 1)
+    per_page = params['per_page'] if params['per_page'] >= 0 else 20
+    total = query.order_by(None).count()
+    items = query.limit(per_page).offset((page - 1) * per_page).all()
+    return {
+        'spaces': [space.to_dict() for space in items],
+        'total': total,
+        'pages': int(math.ceil(total / float(per_page))) if per_page and total else 0,
+        'current_page': page,
+        'start': params['start'].isoformat(),
+        'end': params['end'].isoformat()
+    }
@@ -0,0 +1,74 @@
+import logging
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import select, delete, exists
+from ..models.base import db, SoftDeleteMixin
+from .scheduler import scheduler
+
+logger = logging.getLogger(__name__)
+
+
+def soft_delete_models():
+    """Mapped classes using SoftDeleteMixin"""
+    return sorted((mapper.class_ for mapper in db.Model.registry.mappers if issubclass(mapper.class_, SoftDeleteMixin)),
+                  key=lambda model: model.__tablename__)
+
+
+def _references(table, skip):
+    """(child table, foreign key column) pairs pointing at table that would block or orphan a DELETE"""
+    for child in db.metadata.sorted_tables:
+        for key in child.foreign_keys:
+            if key.column.table is table and child.name not in skip and (key.ondelete or '').upper() != 'CASCADE':
+                yield child, key.parent
+
+
+def _purge_batch(model, cutoff, batch_size):
+    """Hard-delete one batch of the model's tombstones older than cutoff; return how many went"""
+    table = model.__table__
+    dependents = [db.metadata.tables[name] for name in model.purge_dependents]
+    # Tombstones something else still points at (a booking's space, a testimonial's author) are kept as history
+    kept = [exists().where(column == table.c.id) for _, column in _references(table, model.purge_dependents)]
+    ids = db.session.execute(
+        select(table.c.id).where(table.c.deleted_at < cutoff, *[~reference for reference in kept])
+        .order_by(table.c.deleted_at).limit(batch_size)
+    ).scalars().all()
+    if ids:
+        for dependent in dependents:
+            for key in dependent.foreign_keys:
+                if key.column.table is table:
+                    db.session.execute(delete(dependent).where(key.parent.in_(ids)))
+        db.session.execute(delete(table).where(table.c.id.in_(ids)))
+    return len(ids)
+
+
+def purge_tombstones(now=None, after_days=None, batch_size=None):
+    """Hard-delete rows soft-deleted more than SOFT_DELETE_RETENTION_DAYS ago; return {table: count}"""
+    now = now or datetime.utcnow()
+    after_days = after_days if after_days is not None else current_app.config.get('SOFT_DELETE_RETENTION_DAYS', 30)
+    batch_size = batch_size or current_app.config.get('SOFT_DELETE_PURGE_BATCH_SIZE', 500)
+    cutoff = now - timedelta(days=after_days)
+    purged = {}
+    for model in soft_delete_models():
+        purged[model.__tablename__] = 0
+        while True:
+            count = _purge_batch(model, cutoff, batch_size)
+            db.session.commit()
+            purged[model.__tablename__] += count
+            if count < batch_size:
+                break
+        if purged[model.__tablename__]:
+            logger.info('Purged %s %s soft-deleted before %s', purged[model.__tablename__], model.__tablename__,
+                        cutoff.isoformat())
+    return purged
+
+
+scheduler.add_job('purge_tombstones', purge_tombstones, 'SOFT_DELETE_PURGE_INTERVAL', 24 * 60 * 60)
+
+
+@click.command('purge-tombstones')
+@with_appcontext
+def purge_tombstones_command():
+    """Hard-delete rows soft-deleted longer ago than the retention period now."""
+    click.echo(purge_tombstones())
@@ -0,0 +1,65 @@
+import json
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+DEFAULT_YIELD_PER = 1000
+DEFAULT_CHUNK_BYTES = 64 * 1024
+
+
+def wants_ndjson():
+    """Check whether the client asked for newline-delimited JSON"""
+    if request.args.get('format') == 'ndjson':
+        return True
+    best = request.accept_mimetypes.best_match([NDJSON_MIMETYPE, 'application/json'])
+    return best == NDJSON_MIMETYPE and request.accept_mimetypes[NDJSON_MIMETYPE] > 0
+
+
+def _iter_rows(query, serialize, yield_per):
+    """Iterate a query in batches, serializing one row at a time"""
+    for row in query.yield_per(yield_per):
+        yield json.dumps(serialize(row), separators=(',', ':'), default=str)
+
+
+def _buffered(pieces, chunk_bytes):
+    """Group small string pieces into chunks of roughly chunk_bytes"""
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_bytes:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _json_array(rows):
+    yield '['
+    first = True
+    for row in rows:
+        if first:
+            first = False
+            yield row
+        else:
+            yield ',' + row
+    yield ']'
+
+
+def _ndjson(rows):
+    for row in rows:
+        yield row + '\n'
+
+
+def stream_query(query, serialize, ndjson=None, yield_per=None, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Stream the rows of a query as a JSON array (or NDJSON) without materializing them"""
+    if ndjson is None:
+        ndjson = wants_ndjson()
+    if yield_per is None:
+        yield_per = current_app.config.get('STREAMING_YIELD_PER', DEFAULT_YIELD_PER)
+
+    rows = _iter_rows(query, serialize, yield_per)
+    pieces = _ndjson(rows) if ndjson else _json_array(rows)
+    mimetype = NDJSON_MIMETYPE if ndjson else 'application/json'
+    return Response(stream_with_context(_buffered(pieces, chunk_bytes)), mimetype=mimetype)
@@ -0,0 +1,54 @@
+import logging
+from datetime import datetime
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import select, delete
+from ..models.base import db
+from ..models.token import UserToken, TokenPurpose
+from .scheduler import scheduler
+
+logger = logging.getLogger(__name__)
+
+# Config key holding each purpose's lifetime in seconds, and its default
+TOKEN_TTLS = {
+    TokenPurpose.VERIFY_EMAIL: ('EMAIL_VERIFICATION_TOKEN_TTL', 48 * 60 * 60),
+    TokenPurpose.RESET_PASSWORD: ('PASSWORD_RESET_TOKEN_TTL', 60 * 60),
+}
+
+
+def issue_token(user, purpose):
+    """Issue a token for the purpose with its configured lifetime; the caller commits"""
+    setting, default = TOKEN_TTLS[purpose]
+    return UserToken.issue(user, purpose, current_app.config.get(setting, default))
+
+
+def purge_tokens(now=None, batch_size=None):
+    """Delete expired tokens in batches so user_tokens only ever holds live links"""
+    now = now or datetime.utcnow()
+    batch_size = batch_size or current_app.config.get('USER_TOKEN_PURGE_BATCH_SIZE', 1000)
+    tokens = UserToken.__table__
+    purged = 0
+    while True:
+        ids = db.session.execute(
+            select(tokens.c.id).where(tokens.c.expires_at < now).order_by(tokens.c.expires_at).limit(batch_size)
+        ).scalars().all()
+        if ids:
+            db.session.execute(delete(tokens).where(tokens.c.id.in_(ids)))
+        db.session.commit()
+        purged += len(ids)
+        if len(ids) < batch_size:
+            break
+    if purged:
+        logger.info('Purged %s expired user tokens', purged)
+    return purged
+
+
+scheduler.add_job('purge_user_tokens', purge_tokens, 'USER_TOKEN_PURGE_INTERVAL', 3600)
+
+
+@click.command('purge-tokens')
+@with_appcontext
+def purge_tokens_command():
+    """Delete expired email verification and password reset tokens now."""
+    click.echo(f'{purge_tokens()} tokens purged')
@@ -0,0 +1,9 @@
+from app import create_app
+from app.asgi import create_asgi_app
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# ASGI entry point: uvicorn asgi:app --workers 4
+app = create_asgi_app(create_app())
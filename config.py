@@ -14,6 +14,13 @@ class Config:
     JWT_TOKEN_LOCATION = ['headers']
     JWT_HEADER_NAME = 'Authorization'
     JWT_HEADER_TYPE = 'Bearer'
+    # Logout: revoked tokens are shared through Redis when REDIS_URL is set, the token_revocations table otherwise
+    REVOCATION_SYNC_INTERVAL = 1  # seconds a worker may lag behind revocations made by other workers
+    REVOCATION_BLOOM_CAPACITY = 1000000  # revocations per worker filter before it is rebuilt
+    REVOCATION_BLOOM_ERROR_RATE = 0.001
+    # Email verification and password reset links (single use, stored hashed in user_tokens)
+    EMAIL_VERIFICATION_TOKEN_TTL = 48 * 60 * 60  # seconds an email verification link stays valid
+    PASSWORD_RESET_TOKEN_TTL = 60 * 60  # seconds a password reset link stays valid
     
     # Cloudinary settings
     CLOUDINARY_CLOUD_NAME = os.environ.get('CLOUDINARY_CLOUD_NAME')
@@ -27,6 +34,80 @@ class Config:
     # Other settings
     UPLOAD_FOLDER = 'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    STREAMING_YIELD_PER = 1000  # rows fetched per batch when streaming large lists
+
+    # ASGI mode (asgi.py): async search and image upload; the URI defaults to the asyncpg form of the one above
+    ASYNC_DATABASE_URI = os.environ.get('ASYNC_DATABASE_URI')
+    ASYNC_DB_POOL_SIZE = 10  # connections per ASGI worker process
+    ASYNC_DB_MAX_OVERFLOW = 10
+    ASGI_WSGI_THREADS = 8  # threads per ASGI worker serving the remaining (sync) routes
+
+    # HTTP caching: Cache-Control per API namespace
+    CACHE_CONTROL_POLICIES = {
+        'spaces': 'public, max-age=60, stale-while-revalidate=30',
+        'testimonials': 'public, max-age=300, stale-while-revalidate=60',
+        'auth': 'no-store',
+        'bookings': 'private, no-cache',
+        'admin': 'private, no-cache',
+        'owner': 'private, no-cache',
+    }
+
+    # Response compression (brotli is used when the package is installed)
+    COMPRESS_MIN_SIZE = 1024  # bytes; smaller bodies are sent as-is
+    COMPRESS_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 5
+    COMPRESS_CACHE_SIZE = 256  # precompressed bodies kept per process, keyed by ETag
+
+    # Pricing
+    PRICE_RULES_TTL = 300  # seconds compiled price rules are trusted before reloading
+    QUOTE_BATCH_LIMIT = 500  # max intervals per POST /quotes
+    QUOTE_MAX_DAYS = 366  # longest interval one quote may price
+
+    # Bookings
+    IDEMPOTENCY_KEY_TTL = 24 * 60 * 60  # seconds a stored Idempotency-Key result is replayed
+    AVAILABILITY_BATCH_LIMIT = 1000  # max space_ids per GET /spaces/availability
+    RECURRING_MAX_OCCURRENCES = 366  # cap on the expansion of one recurrence rule
+
+    # Caching (Flask-Caching); Redis is shared by all workers, SimpleCache is per process
+    REDIS_URL = os.environ.get('REDIS_URL')
+    CACHE_TYPE = 'RedisCache' if REDIS_URL else 'SimpleCache'
+    CACHE_REDIS_URL = REDIS_URL
+    CACHE_DEFAULT_TIMEOUT = 300
+    SEARCH_CACHE_TTL = 60  # seconds a search result page is served from cache
+    SEARCH_WINDOW_BUCKET_MINUTES = 15  # search windows are widened to this grid
+    OWNER_DASHBOARD_TTL = 300  # seconds; booking/space/testimonial writes invalidate sooner
+    SPACE_DETAIL_TTL = 300  # seconds a GET /spaces/<id> body stays in the shared cache
+    SPACE_DETAIL_LOCAL_TTL = 5  # seconds a worker keeps its own copy; bounds staleness after another worker's write
+    SPACE_DETAIL_LOCAL_SIZE = 1024  # space details kept per worker
+    CACHE_EARLY_EXPIRY_BETA = 1.0  # XFetch: > 1 refreshes hot entries earlier
+    CACHE_LOCK_TIMEOUT = 5  # seconds a cache fill lock is held at most
+    CACHE_NEGATIVE_TTL = 5  # seconds a missing key (None from the loader) stays cached
+
+    # Background jobs; only one instance runs each job at a time (PostgreSQL advisory locks)
+    SCHEDULER_ENABLED = os.environ.get('SCHEDULER_ENABLED', 'false').lower() == 'true'
+    SCHEDULER_AUTOSTART = os.environ.get('SCHEDULER_AUTOSTART', 'true').lower() == 'true'  # false: the server starts it
+    BOOKING_SWEEP_INTERVAL = 60  # seconds between lifecycle sweeps
+    BOOKING_SWEEP_BATCH_SIZE = 500  # bookings moved per UPDATE
+    PENDING_HOLD_TTL = 24 * 60 * 60  # seconds an unpaid pending booking holds its slot
+    BOOKING_ARCHIVE_INTERVAL = 60 * 60  # seconds between archive runs
+    BOOKING_ARCHIVE_AFTER_DAYS = 180  # completed/cancelled bookings older than this move to bookings_archive
+    BOOKING_ARCHIVE_BATCH_SIZE = 1000
+    USER_TOKEN_PURGE_INTERVAL = 60 * 60  # seconds between purges of expired verification/reset tokens
+    USER_TOKEN_PURGE_BATCH_SIZE = 1000
+    SOFT_DELETE_PURGE_INTERVAL = 24 * 60 * 60  # seconds between purges of old soft-deleted rows
+    SOFT_DELETE_RETENTION_DAYS = 30  # days before an unreferenced soft-deleted row is hard-deleted
+    SOFT_DELETE_PURGE_BATCH_SIZE = 500
+
+    # Featured spaces (GET /spaces/featured); rankings live in Redis sorted sets when REDIS_URL is set
+    FEATURED_REFRESH_INTERVAL = 15 * 60  # seconds between ranking jobs
+    FEATURED_WEIGHTS = {'rating': 0.6, 'bookings': 0.4}  # both signals are scaled to [0, 1]
+    FEATURED_RATING_PRIOR = 5  # pseudo-reviews at the site average, so a single 5-star review does not top the list
+    FEATURED_BOOKING_WINDOW_DAYS = 30  # bookings made in this window count towards popularity
+    FEATURED_SIZE = 100  # spaces kept per ranking (overall and per city)
+
+    # Moderation
+    MODERATION_BATCH_LIMIT = 500  # max testimonial ids per PATCH /admin/testimonials
+    USER_BATCH_LIMIT = 1000  # max user ids per PATCH /admin/users or POST /admin/users/export
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -0,0 +1,86 @@
+import math
+import os
+
+# Gunicorn settings: gunicorn -c gunicorn.conf.py run:app
+# Every value can be overridden with the environment variable named next to it.
+
+
+def cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def memory_limit_mb():
+    """The container's memory limit (cgroup v2 or v1), else physical memory"""
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < 1 << 60:
+            return int(value) // 2 ** 20
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // 2 ** 20
+    except (ValueError, OSError):
+        return None
+
+
+CPUS = cpu_count()
+MEMORY_MB = memory_limit_mb()
+WORKER_MEMORY_MB = int(os.environ.get('GUNICORN_WORKER_MEMORY_MB', 160))  # budget per worker incl. growth
+RESERVED_MEMORY_MB = int(os.environ.get('GUNICORN_RESERVED_MEMORY_MB', 128))  # master and the rest of the box
+
+
+def worker_count():
+    """2 x CPUs + 1, fewer when that many workers would not fit in memory"""
+    if os.environ.get('WEB_CONCURRENCY'):
+        return int(os.environ['WEB_CONCURRENCY'])
+    wanted = 2 * CPUS + 1
+    if MEMORY_MB is None:
+        return wanted
+    return max(1, min(wanted, (MEMORY_MB - RESERVED_MEMORY_MB) // WORKER_MEMORY_MB))
+
+
+workers = worker_count()
+# Threads make up for workers memory could not afford; requests mostly wait on Postgres/Redis/Cloudinary
+threads = int(os.environ.get('GUNICORN_THREADS') or max(2, math.ceil(4 * CPUS / workers)))
+worker_class = 'gthread'
+
+# Import the app once in the master so workers share its pages copy-on-write
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+# Jobs then run in the workers (the scheduled_jobs table lets one of them claim each interval), never in the master
+os.environ['SCHEDULER_AUTOSTART'] = 'false'
+
+# Recycle workers to cap memory creep; jitter keeps them from restarting together
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+
+def _dispose_engines(flask_app):
+    from app.models.base import db
+    db.get_engine(flask_app).dispose()
+
+
+def when_ready(server):
+    """Close the connections create_app opened in the master before any worker inherits them"""
+    from app.utils.scheduler import scheduler
+    if scheduler.app is not None:
+        _dispose_engines(scheduler.app)
+    server.log.info('%s workers x %s threads (%s CPUs, %s MB)', workers, threads, CPUS, MEMORY_MB)
+
+
+def post_worker_init(worker):
+    """Give the worker its own connection pool and start its scheduler thread"""
+    from app.utils.scheduler import scheduler
+    if scheduler.app is None:
+        return
+    _dispose_engines(scheduler.app)
+    if scheduler.app.config.get('SCHEDULER_ENABLED'):
+        scheduler.start()
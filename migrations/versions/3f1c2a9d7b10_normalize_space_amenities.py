@@ -0,0 +1,105 @@
+"""normalize space amenities
+
+Revision ID: 3f1c2a9d7b10
+Revises: 
+Create Date: 2026-10-19 16:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import json
+import re
+from datetime import datetime
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _slugify(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.strip().lower()).strip('-')
+
+
+def _parse(value):
+    if not value:
+        return []
+    try:
+        names = json.loads(value)
+    except ValueError:
+        names = value.split(',')
+    if isinstance(names, str):
+        names = [names]
+    return [str(name).strip() for name in names if _slugify(str(name))]
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = inspector.get_table_names()
+
+    # db.create_all() may already have created these tables on app start-up
+    if 'amenities' not in tables:
+        op.create_table(
+            'amenities',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('slug', sa.String(length=100), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('slug')
+        )
+    if 'space_amenities' not in tables:
+        op.create_table(
+            'space_amenities',
+            sa.Column('space_id', sa.Integer(), nullable=False),
+            sa.Column('amenity_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['space_id'], ['spaces.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['amenity_id'], ['amenities.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('space_id', 'amenity_id')
+        )
+        op.create_index('ix_space_amenities_amenity_id_space_id', 'space_amenities',
+                        ['amenity_id', 'space_id'])
+
+    # Backfill from the JSON text column
+    amenities = sa.table('amenities', sa.column('id', sa.Integer), sa.column('name', sa.String),
+                         sa.column('slug', sa.String), sa.column('created_at', sa.DateTime),
+                         sa.column('updated_at', sa.DateTime))
+    links = sa.table('space_amenities', sa.column('space_id', sa.Integer),
+                     sa.column('amenity_id', sa.Integer))
+
+    space_slugs = {}
+    names = {}
+    for space_id, value in bind.execute(sa.text('SELECT id, amenities FROM spaces WHERE amenities IS NOT NULL')):
+        slugs = set()
+        for name in _parse(value):
+            slug = _slugify(name)
+            names.setdefault(slug, name)
+            slugs.add(slug)
+        space_slugs[space_id] = slugs
+    if not names:
+        return
+
+    existing = {slug for (slug,) in bind.execute(sa.select(amenities.c.slug))}
+    now = datetime.utcnow()
+    new_rows = [{'name': names[slug], 'slug': slug, 'created_at': now, 'updated_at': now}
+                for slug in names if slug not in existing]
+    if new_rows:
+        op.bulk_insert(amenities, new_rows)
+
+    ids = {slug: amenity_id for amenity_id, slug in bind.execute(sa.select(amenities.c.id, amenities.c.slug))}
+    linked = set(bind.execute(sa.select(links.c.space_id, links.c.amenity_id)).fetchall())
+    link_rows = [{'space_id': space_id, 'amenity_id': ids[slug]}
+                 for space_id, slugs in space_slugs.items() for slug in slugs
+                 if (space_id, ids[slug]) not in linked]
+    if link_rows:
+        op.bulk_insert(links, link_rows)
+
+
+def downgrade():
+    op.drop_index('ix_space_amenities_amenity_id_space_id', table_name='space_amenities')
+    op.drop_table('space_amenities')
+    op.drop_table('amenities')
@@ -0,0 +1,26 @@
+"""add users token_version
+
+Revision ID: a1c3e5f7b902
+Revises: f8c0e2a4b671
+Create Date: 2026-10-20 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f7b902'
+down_revision = 'f8c0e2a4b671'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have created the column on a fresh database
+    if 'token_version' not in {column['name'] for column in sa.inspect(op.get_bind()).get_columns('users')}:
+        op.add_column('users', sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,34 @@
+"""add booking lifecycle indexes
+
+Revision ID: a3c5e7f9b214
+Revises: f6a1d3c8e920
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c5e7f9b214'
+down_revision = 'f6a1d3c8e920'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_bookings_status_end_time', 'bookings', ['status', 'end_time']),
+    ('ix_bookings_status_created_at', 'bookings', ['status', 'created_at']),
+)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        # db.create_all() may already have created the index on app start-up
+        if name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,31 @@
+"""add scheduled_jobs
+
+Revision ID: a9d1f3b5c782
+Revises: f7c9e1a3b568
+Create Date: 2026-10-21 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d1f3b5c782'
+down_revision = 'f7c9e1a3b568'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have created the table on app start-up
+    if 'scheduled_jobs' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            'scheduled_jobs',
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('last_run_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('name')
+        )
+
+
+def downgrade():
+    op.drop_table('scheduled_jobs')
@@ -0,0 +1,80 @@
+"""add user_tokens, replacing users.verification_token
+
+Revision ID: b2d4f6a8c013
+Revises: a1c3e5f7b902
+Create Date: 2026-10-20 15:00:00.000000
+
+"""
+from datetime import datetime, timedelta
+import hashlib
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2d4f6a8c013'
+down_revision = 'a1c3e5f7b902'
+branch_labels = None
+depends_on = None
+
+PURPOSE = sa.Enum('VERIFY_EMAIL', 'RESET_PASSWORD', name='tokenpurpose')
+INDEXES = (
+    ('ix_user_tokens_token_hash', ['token_hash'], True),
+    ('ix_user_tokens_user_id_purpose', ['user_id', 'purpose'], False),
+    ('ix_user_tokens_expires_at', ['expires_at'], False),
+)
+# Outstanding links carried over get the default lifetime of their purpose from now
+BACKFILL_TTLS = {'VERIFY_EMAIL': timedelta(hours=48), 'RESET_PASSWORD': timedelta(hours=1)}
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    # db.create_all() may already have created the table on app start-up
+    if 'user_tokens' not in inspector.get_table_names():
+        op.create_table(
+            'user_tokens',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('purpose', PURPOSE, nullable=False),
+            sa.Column('token_hash', sa.String(length=64), nullable=False),
+            sa.Column('expires_at', sa.DateTime(), nullable=False),
+            sa.Column('used_at', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id')
+        )
+    existing = {index['name'] for index in sa.inspect(bind).get_indexes('user_tokens')}
+    for name, columns, unique in INDEXES:
+        if name not in existing:
+            op.create_index(name, 'user_tokens', columns, unique=unique)
+
+    if 'verification_token' not in {column['name'] for column in inspector.get_columns('users')}:
+        return
+    # The old column held one token for both flows: unverified users were sent a verification link
+    now = datetime.utcnow()
+    tokens = sa.table('user_tokens', sa.column('user_id'), sa.column('purpose'), sa.column('token_hash'),
+                      sa.column('expires_at'), sa.column('created_at'), sa.column('updated_at'))
+    rows = []
+    for user_id, token, is_verified in bind.execute(sa.text(
+            'SELECT id, verification_token, is_verified FROM users WHERE verification_token IS NOT NULL')):
+        purpose = 'RESET_PASSWORD' if is_verified else 'VERIFY_EMAIL'
+        rows.append({'user_id': user_id, 'purpose': purpose,
+                     'token_hash': hashlib.sha256(token.encode('utf-8')).hexdigest(),
+                     'expires_at': now + BACKFILL_TTLS[purpose], 'created_at': now, 'updated_at': now})
+    if rows:
+        op.bulk_insert(tokens, rows)
+    if 'ix_users_verification_token' in {index['name'] for index in inspector.get_indexes('users')}:
+        op.drop_index('ix_users_verification_token', table_name='users')
+    op.drop_column('users', 'verification_token')
+
+
+def downgrade():
+    # Only hashes were kept, so outstanding links do not survive the downgrade
+    op.add_column('users', sa.Column('verification_token', sa.String(length=100), nullable=True))
+    op.create_index('ix_users_verification_token', 'users', ['verification_token'],
+                    postgresql_where=sa.text('verification_token IS NOT NULL'),
+                    sqlite_where=sa.text('verification_token IS NOT NULL'))
+    op.drop_table('user_tokens')
+    PURPOSE.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,48 @@
+"""add price rules
+
+Revision ID: b7e4d2c81a35
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-19 16:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e4d2c81a35'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have created the table on app start-up
+    if 'price_rules' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'price_rules',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('space_id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.Enum('TIME_OF_DAY', 'WEEKDAY', 'SEASON', 'LONG_STAY', name='priceruletype'), nullable=False),
+        sa.Column('multiplier', sa.Float(), nullable=False),
+        sa.Column('discount', sa.Float(), nullable=True),
+        sa.Column('start_hour', sa.Integer(), nullable=True),
+        sa.Column('end_hour', sa.Integer(), nullable=True),
+        sa.Column('weekdays', sa.String(length=20), nullable=True),
+        sa.Column('start_date', sa.String(length=5), nullable=True),
+        sa.Column('end_date', sa.String(length=5), nullable=True),
+        sa.Column('min_hours', sa.Float(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['space_id'], ['spaces.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_price_rules_space_id'), 'price_rules', ['space_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_price_rules_space_id'), table_name='price_rules')
+    op.drop_table('price_rules')
+    sa.Enum(name='priceruletype').drop(op.get_bind(), checkfirst=True)
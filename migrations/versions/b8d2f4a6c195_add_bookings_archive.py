@@ -0,0 +1,51 @@
+"""add bookings archive
+
+Revision ID: b8d2f4a6c195
+Revises: a3c5e7f9b214
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d2f4a6c195'
+down_revision = 'a3c5e7f9b214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have created the table on app start-up
+    if 'bookings_archive' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'bookings_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('space_id', sa.Integer(), nullable=False),
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=False),
+        # Reuses the bookings status type
+        sa.Column('status', postgresql.ENUM('PENDING', 'CONFIRMED', 'CANCELLED', 'COMPLETED',
+                                            name='bookingstatus', create_type=False), nullable=True),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('payment_status', sa.Boolean(), nullable=True),
+        sa.Column('payment_reference', sa.String(length=100), nullable=True),
+        sa.Column('special_requests', sa.Text(), nullable=True),
+        sa.Column('cancellation_reason', sa.Text(), nullable=True),
+        sa.Column('series_id', sa.String(length=36), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_bookings_archive_start_time', 'bookings_archive', ['start_time'])
+    op.create_index('ix_bookings_archive_space_id_start_time', 'bookings_archive', ['space_id', 'start_time'])
+    op.create_index('ix_bookings_archive_client_id_start_time', 'bookings_archive', ['client_id', 'start_time'])
+
+
+def downgrade():
+    op.drop_table('bookings_archive')
@@ -0,0 +1,44 @@
+"""add users is_active and deleted_at
+
+Revision ID: c3e5a7b9d124
+Revises: b2d4f6a8c013
+Create Date: 2026-10-20 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e5a7b9d124'
+down_revision = 'b2d4f6a8c013'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_users_active_role', ['role'], {'postgresql_where': sa.text('is_active'),
+                                        'sqlite_where': sa.text('is_active = 1')}),
+    ('ix_users_deleted_at', ['deleted_at'], {'postgresql_where': sa.text('deleted_at IS NOT NULL'),
+                                             'sqlite_where': sa.text('deleted_at IS NOT NULL')}),
+)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    # db.create_all() may already have created the columns and indexes on app start-up
+    existing = {column['name'] for column in inspector.get_columns('users')}
+    if 'is_active' not in existing:
+        op.add_column('users', sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.true()))
+    if 'deleted_at' not in existing:
+        op.add_column('users', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    indexes = {index['name'] for index in inspector.get_indexes('users')}
+    for name, columns, options in INDEXES:
+        if name not in indexes:
+            op.create_index(name, 'users', columns, **options)
+
+
+def downgrade():
+    for name, _, _ in INDEXES:
+        op.drop_index(name, table_name='users')
+    op.drop_column('users', 'deleted_at')
+    op.drop_column('users', 'is_active')
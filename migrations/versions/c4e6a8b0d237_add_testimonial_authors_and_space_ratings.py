@@ -0,0 +1,64 @@
+"""add testimonial author snapshot and space ratings
+
+Revision ID: c4e6a8b0d237
+Revises: b8d2f4a6c195
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e6a8b0d237'
+down_revision = 'b8d2f4a6c195'
+branch_labels = None
+depends_on = None
+
+AUTHOR_COLUMNS = (
+    ('author_first_name', 'first_name', 50),
+    ('author_last_name', 'last_name', 50),
+    ('author_profile_picture', 'profile_picture', 255),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    # db.create_all() may already have created the new columns, index and table on app start-up
+    existing = {column['name'] for column in inspector.get_columns('testimonials')}
+    for name, _, length in AUTHOR_COLUMNS:
+        if name not in existing:
+            op.add_column('testimonials', sa.Column(name, sa.String(length=length), nullable=True))
+    for name, source, _ in AUTHOR_COLUMNS:
+        op.execute(
+            f'UPDATE testimonials SET {name} = (SELECT users.{source} FROM users WHERE users.id = testimonials.user_id)'
+        )
+    if 'ix_testimonials_space_id_status_created_at' not in {i['name'] for i in inspector.get_indexes('testimonials')}:
+        op.create_index('ix_testimonials_space_id_status_created_at', 'testimonials',
+                        ['space_id', 'status', 'created_at'])
+
+    if 'space_ratings' not in inspector.get_table_names():
+        op.create_table(
+            'space_ratings',
+            sa.Column('space_id', sa.Integer(), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.Column('total', sa.Integer(), nullable=False),
+            *[sa.Column(f'stars_{stars}', sa.Integer(), nullable=False) for stars in range(1, 6)],
+            sa.ForeignKeyConstraint(['space_id'], ['spaces.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('space_id')
+        )
+    op.execute('DELETE FROM space_ratings')
+    histogram = ', '.join(f'SUM(CASE WHEN rating = {stars} THEN 1 ELSE 0 END)' for stars in range(1, 6))
+    op.execute(
+        'INSERT INTO space_ratings (space_id, count, total, stars_1, stars_2, stars_3, stars_4, stars_5) '
+        f'SELECT space_id, COUNT(*), SUM(rating), {histogram} FROM testimonials '
+        "WHERE status = 'approved' AND rating BETWEEN 1 AND 5 GROUP BY space_id"
+    )
+
+
+def downgrade():
+    op.drop_table('space_ratings')
+    op.drop_index('ix_testimonials_space_id_status_created_at', table_name='testimonials')
+    for name, _, _ in AUTHOR_COLUMNS:
+        op.drop_column('testimonials', name)
@@ -0,0 +1,40 @@
+"""add idempotency keys
+
+Revision ID: c91a5f3e2d48
+Revises: b7e4d2c81a35
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c91a5f3e2d48'
+down_revision = 'b7e4d2c81a35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have created the table on app start-up
+    if 'idempotency_keys' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('request_hash', sa.String(length=64), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=False),
+        sa.Column('response', sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'key', name='uq_idempotency_keys_user_id_key')
+    )
+
+
+def downgrade():
+    op.drop_table('idempotency_keys')
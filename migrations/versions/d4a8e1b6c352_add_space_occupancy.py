@@ -0,0 +1,84 @@
+"""add space occupancy calendar
+
+Revision ID: d4a8e1b6c352
+Revises: c91a5f3e2d48
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import datetime, timedelta, time as dt_time
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a8e1b6c352'
+down_revision = 'c91a5f3e2d48'
+branch_labels = None
+depends_on = None
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+
+def day_masks(start, end):
+    # Frozen copy of app.models.occupancy.day_masks
+    masks = {}
+    day = start.date()
+    while datetime.combine(day, dt_time.min) < end:
+        day_start = datetime.combine(day, dt_time.min)
+        first = 0
+        if start > day_start:
+            minutes = start.hour * 60 + start.minute + start.second / 60 + start.microsecond / 60_000_000
+            first = int(minutes // SLOT_MINUTES)
+        last = SLOTS_PER_DAY
+        if end < day_start + timedelta(days=1):
+            minutes = end.hour * 60 + end.minute + end.second / 60 + end.microsecond / 60_000_000
+            last = int(minutes // SLOT_MINUTES) + (1 if minutes % SLOT_MINUTES else 0)
+        if last > first:
+            masks[day] = ((1 << (last - first)) - 1) << first
+        day += timedelta(days=1)
+    return masks
+
+
+def upgrade():
+    bind = op.get_bind()
+    # db.create_all() may already have created the table on app start-up
+    if 'space_occupancy' not in sa.inspect(bind).get_table_names():
+        op.create_table(
+            'space_occupancy',
+            sa.Column('space_id', sa.Integer(), nullable=False),
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('slots', sa.LargeBinary(length=SLOTS_PER_DAY // 8), nullable=False),
+            sa.ForeignKeyConstraint(['space_id'], ['spaces.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('space_id', 'day')
+        )
+
+    occupancy = sa.table(
+        'space_occupancy',
+        sa.column('space_id', sa.Integer()),
+        sa.column('day', sa.Date()),
+        sa.column('slots', sa.LargeBinary())
+    )
+    rows = bind.execute(sa.text(
+        "SELECT space_id, start_time, end_time FROM bookings "
+        "WHERE status IN ('PENDING', 'CONFIRMED', 'COMPLETED')"
+    ))
+    masks = {}
+    for space_id, start_time, end_time in rows:
+        if isinstance(start_time, str):
+            start_time, end_time = datetime.fromisoformat(start_time), datetime.fromisoformat(end_time)
+        for day, mask in day_masks(start_time, end_time).items():
+            masks[(space_id, day)] = masks.get((space_id, day), 0) | mask
+
+    op.execute(occupancy.delete())
+    values = [{'space_id': space_id, 'day': day, 'slots': mask.to_bytes(SLOTS_PER_DAY // 8, 'little')}
+              for (space_id, day), mask in masks.items()]
+    for offset in range(0, len(values), 5000):
+        op.bulk_insert(occupancy, values[offset:offset + 5000])
+
+    # BOOKED is no longer maintained; availability is read from the calendar
+    op.execute("UPDATE spaces SET status = 'AVAILABLE' WHERE status = 'BOOKED'")
+
+
+def downgrade():
+    op.drop_table('space_occupancy')
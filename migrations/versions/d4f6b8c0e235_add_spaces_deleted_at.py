@@ -0,0 +1,52 @@
+"""add spaces deleted_at and keep tombstones out of the live space indexes
+
+Revision ID: d4f6b8c0e235
+Revises: c3e5a7b9d124
+Create Date: 2026-10-20 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f6b8c0e235'
+down_revision = 'c3e5a7b9d124'
+branch_labels = None
+depends_on = None
+
+LIVE_INDEXES = (
+    ('ix_spaces_active_city_type_capacity', ['city', 'type', 'capacity']),
+    ('ix_spaces_active_price_per_hour_id', ['price_per_hour', 'id']),
+)
+LIVE = {'postgresql_where': sa.text('is_active AND deleted_at IS NULL'),
+        'sqlite_where': sa.text('is_active = 1 AND deleted_at IS NULL')}
+ACTIVE = {'postgresql_where': sa.text('is_active'), 'sqlite_where': sa.text('is_active = 1')}
+DELETED = {'postgresql_where': sa.text('deleted_at IS NOT NULL'), 'sqlite_where': sa.text('deleted_at IS NOT NULL')}
+
+
+def _index_names(inspector):
+    return {index['name'] for index in inspector.get_indexes('spaces')}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    # db.create_all() may already have created the column on app start-up
+    if 'deleted_at' not in {column['name'] for column in inspector.get_columns('spaces')}:
+        op.add_column('spaces', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    existing = _index_names(inspector)
+    # Rebuild the listing indexes with the narrower predicate, whichever one they were created with
+    for name, columns in LIVE_INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name='spaces')
+        op.create_index(name, 'spaces', columns, **LIVE)
+    if 'ix_spaces_deleted_at' not in existing:
+        op.create_index('ix_spaces_deleted_at', 'spaces', ['deleted_at'], **DELETED)
+
+
+def downgrade():
+    op.drop_index('ix_spaces_deleted_at', table_name='spaces')
+    for name, columns in LIVE_INDEXES:
+        op.drop_index(name, table_name='spaces')
+        op.create_index(name, 'spaces', columns, **ACTIVE)
+    op.drop_column('spaces', 'deleted_at')
@@ -0,0 +1,26 @@
+"""add testimonial moderation queue index
+
+Revision ID: d5f7b9c1e348
+Revises: c4e6a8b0d237
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5f7b9c1e348'
+down_revision = 'c4e6a8b0d237'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have created the index on app start-up
+    if 'ix_testimonials_status_created_at_id' not in {i['name'] for i in sa.inspect(op.get_bind()).get_indexes('testimonials')}:
+        op.create_index('ix_testimonials_status_created_at_id', 'testimonials', ['status', 'created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_testimonials_status_created_at_id', table_name='testimonials')
@@ -0,0 +1,34 @@
+"""add availability search indexes
+
+Revision ID: e2f7c4a9b813
+Revises: d4a8e1b6c352
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2f7c4a9b813'
+down_revision = 'd4a8e1b6c352'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_bookings_space_id_start_time_end_time', 'bookings', ['space_id', 'start_time', 'end_time']),
+    ('ix_spaces_city_type_capacity', 'spaces', ['city', 'type', 'capacity']),
+)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        # db.create_all() may already have created the index on app start-up
+        if name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table)
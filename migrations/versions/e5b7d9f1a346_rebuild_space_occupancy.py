@@ -0,0 +1,75 @@
+"""rebuild space occupancy with sub-minute booking times handled
+
+Revision ID: e5b7d9f1a346
+Revises: d4f6b8c0e235
+Create Date: 2026-10-21 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import datetime, timedelta, time as dt_time
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b7d9f1a346'
+down_revision = 'd4f6b8c0e235'
+branch_labels = None
+depends_on = None
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+
+def _minutes(moment):
+    return moment.hour * 60 + moment.minute + moment.second / 60 + moment.microsecond / 60_000_000
+
+
+def day_masks(start, end):
+    # Frozen copy of app.models.occupancy.day_masks
+    masks = {}
+    day = start.date()
+    while datetime.combine(day, dt_time.min) < end:
+        day_start = datetime.combine(day, dt_time.min)
+        first = int(_minutes(start) // SLOT_MINUTES) if start > day_start else 0
+        last = SLOTS_PER_DAY
+        if end < day_start + timedelta(days=1):
+            minutes = _minutes(end)
+            last = int(minutes // SLOT_MINUTES) + (1 if minutes % SLOT_MINUTES else 0)
+        if last > first:
+            masks[day] = ((1 << (last - first)) - 1) << first
+        day += timedelta(days=1)
+    return masks
+
+
+def upgrade():
+    # d4a8e1b6c352 read microseconds as minutes, so bookings with sub-second times got the wrong slots
+    bind = op.get_bind()
+    occupancy = sa.table(
+        'space_occupancy',
+        sa.column('space_id', sa.Integer()),
+        sa.column('day', sa.Date()),
+        sa.column('slots', sa.LargeBinary())
+    )
+    # Archived completed bookings keep their slots (utilization still counts them), so read both tables
+    rows = bind.execute(sa.text(
+        "SELECT space_id, start_time, end_time FROM bookings "
+        "WHERE status IN ('PENDING', 'CONFIRMED', 'COMPLETED') "
+        "UNION ALL SELECT space_id, start_time, end_time FROM bookings_archive WHERE status = 'COMPLETED'"
+    ))
+    masks = {}
+    for space_id, start_time, end_time in rows:
+        if isinstance(start_time, str):
+            start_time, end_time = datetime.fromisoformat(start_time), datetime.fromisoformat(end_time)
+        for day, mask in day_masks(start_time, end_time).items():
+            masks[(space_id, day)] = masks.get((space_id, day), 0) | mask
+
+    op.execute(occupancy.delete())
+    values = [{'space_id': space_id, 'day': day, 'slots': mask.to_bytes(SLOTS_PER_DAY // 8, 'little')}
+              for (space_id, day), mask in masks.items()]
+    for offset in range(0, len(values), 5000):
+        op.bulk_insert(occupancy, values[offset:offset + 5000])
+
+
+def downgrade():
+    # The rebuilt calendar is also right for the previous revision
+    pass
@@ -0,0 +1,26 @@
+"""add spaces owner_id index
+
+Revision ID: e6a8c0d2f459
+Revises: d5f7b9c1e348
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6a8c0d2f459'
+down_revision = 'd5f7b9c1e348'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() may already have created the index on app start-up
+    if 'ix_spaces_owner_id' not in {i['name'] for i in sa.inspect(op.get_bind()).get_indexes('spaces')}:
+        op.create_index('ix_spaces_owner_id', 'spaces', ['owner_id'])
+
+
+def downgrade():
+    op.drop_index('ix_spaces_owner_id', table_name='spaces')
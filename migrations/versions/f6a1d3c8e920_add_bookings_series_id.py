@@ -0,0 +1,30 @@
+"""add bookings series_id
+
+Revision ID: f6a1d3c8e920
+Revises: e2f7c4a9b813
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6a1d3c8e920'
+down_revision = 'e2f7c4a9b813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    # db.create_all() may already have created the column on a fresh database
+    if 'series_id' not in {column['name'] for column in inspector.get_columns('bookings')}:
+        op.add_column('bookings', sa.Column('series_id', sa.String(length=36), nullable=True))
+    if 'ix_bookings_series_id' not in {index['name'] for index in inspector.get_indexes('bookings')}:
+        op.create_index('ix_bookings_series_id', 'bookings', ['series_id'])
+
+
+def downgrade():
+    op.drop_index('ix_bookings_series_id', table_name='bookings')
+    op.drop_column('bookings', 'series_id')
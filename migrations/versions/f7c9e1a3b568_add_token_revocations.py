@@ -0,0 +1,45 @@
+"""add token_revocations
+
+Revision ID: f7c9e1a3b568
+Revises: e5b7d9f1a346
+Create Date: 2026-10-21 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7c9e1a3b568'
+down_revision = 'e5b7d9f1a346'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_token_revocations_created_at', ['created_at']),
+    ('ix_token_revocations_entry', ['entry']),
+    ('ix_token_revocations_expires_at', ['expires_at']),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    # db.create_all() may already have created the table on app start-up
+    if 'token_revocations' not in sa.inspect(bind).get_table_names():
+        op.create_table(
+            'token_revocations',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('entry', sa.String(length=120), nullable=False),
+            sa.Column('expires_at', sa.DateTime(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+    existing = {index['name'] for index in sa.inspect(bind).get_indexes('token_revocations')}
+    for name, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, 'token_revocations', columns)
+
+
+def downgrade():
+    op.drop_table('token_revocations')
@@ -0,0 +1,51 @@
+"""add indexes for the remaining filter and sort paths
+
+Revision ID: f8c0e2a4b671
+Revises: e6a8c0d2f459
+Create Date: 2026-10-20 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8c0e2a4b671'
+down_revision = 'e6a8c0d2f459'
+branch_labels = None
+depends_on = None
+
+ACTIVE = {'postgresql_where': sa.text('is_active'), 'sqlite_where': sa.text('is_active = 1')}
+HAS_TOKEN = {'postgresql_where': sa.text('verification_token IS NOT NULL'),
+             'sqlite_where': sa.text('verification_token IS NOT NULL')}
+
+INDEXES = (
+    ('ix_spaces_active_city_type_capacity', 'spaces', ['city', 'type', 'capacity'], ACTIVE),
+    ('ix_spaces_active_price_per_hour_id', 'spaces', ['price_per_hour', 'id'], ACTIVE),
+    ('ix_spaces_status', 'spaces', ['status'], {}),
+    ('ix_space_images_space_id', 'space_images', ['space_id'], {}),
+    ('ix_bookings_client_id_start_time', 'bookings', ['client_id', 'start_time'], {}),
+    ('ix_testimonials_user_id', 'testimonials', ['user_id'], {}),
+    ('ix_users_verification_token', 'users', ['verification_token'], HAS_TOKEN),
+)
+
+
+def _index_names(inspector, table):
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns, options in INDEXES:
+        # db.create_all() may already have created the index on app start-up
+        if name not in _index_names(inspector, table):
+            op.create_index(name, table, columns, **options)
+    # Every caller filtering on city/type also filters on is_active; the partial index supersedes it
+    if 'ix_spaces_city_type_capacity' in _index_names(inspector, 'spaces'):
+        op.drop_index('ix_spaces_city_type_capacity', table_name='spaces')
+
+
+def downgrade():
+    op.create_index('ix_spaces_city_type_capacity', 'spaces', ['city', 'type', 'capacity'])
+    for name, table, _, _ in INDEXES:
+        op.drop_index(name, table_name=table)